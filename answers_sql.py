@@ -0,0 +1,41 @@
+"""
+Fragmen SQL bersama untuk membaca jawaban item dari tabel responses.
+
+Hanya membangun teks SQL (tanpa pandas/NumPy), jadi bisa dipakai write hook
+ringkasan (summary.py, dijalankan saat submit responden) maupun agregasi
+statistik dashboard admin (ipa_sql.py) tanpa memuat library analisis.
+"""
+from survey_items import DIM_CODES
+from typed_scores import likert_sql
+
+
+def answers_cte(where: str) -> str:
+    """
+    CTE `answers(id, platform, submitted_at, kind, item, num)`: satu baris per
+    jawaban item; num NULL bila nilainya bukan jawaban Likert yang valid (aturan yang
+    sama dengan perf_scores/imp_scores dan sumber "python", lihat typed_scores.py).
+    """
+    return f"""
+        filtered AS (
+            SELECT id, platform, COALESCE(submitted_at, created_at) AS submitted_at,
+                   performance, importance
+            FROM responses
+            {where}
+        ),
+        answers AS (
+            SELECT f.id, f.platform, f.submitted_at, 'Performance' AS kind, p.key AS item,
+                   ({likert_sql("p.value")})::float8 AS num
+            FROM filtered f, jsonb_each(f.performance) p
+            UNION ALL
+            SELECT f.id, f.platform, f.submitted_at, 'Importance' AS kind, i.key AS item,
+                   ({likert_sql("i.value")})::float8 AS num
+            FROM filtered f, jsonb_each(f.importance) i
+        )
+    """
+
+
+def dim_map_cte() -> str:
+    """CTE `dim_map(item, dim)` dari DIM_CODES."""
+    # kode item/dimensi berasal dari survey_items (konstanta), bukan input user
+    values = ", ".join(f"('{code}', '{abbr}')" for abbr, codes in DIM_CODES.items() for code in codes)
+    return f"dim_map(item, dim) AS (VALUES {values})"
@@ -1,22 +1,98 @@
+import logging
 import os
+import threading
 from datetime import datetime, timezone
 import uuid
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 import streamlit.components.v1 as components
 
-from sqlalchemy import create_engine, text, bindparam
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import text
+
+from db import DataVersion, create_db_engine, pool_stats, read_transaction
+from drafts import DraftPurger, DraftWriter, PostgresDraftStore, SQLiteDraftStore
+from hero_image import STATIC_DIR, ensure_variants, picture_html
+from schema import ensure_schema
+from submissions import SubmissionSpool, SubmissionWriter, insert_submissions, with_retries
+import summary
+from survey_items import DIM_NAME_BY_ABBR, DIMS, ITEM_CODES, ITEM_TEXT, LOCAL_TZ
+
+# pandas / NumPy / Matplotlib dan modul analisis (dashboard, charts, ipa_stats, ipa_sql,
+# response_frame, figure_cache) sengaja diimpor di dalam fungsi dashboard admin saja:
+# halaman utama & kuesioner responden tidak memuatnya (lihat benchmarks/bench_import_time.py).
 
 # =========================
 # CONFIG
 # =========================
 st.set_page_config(page_title="TATTFQ Web Survey", layout="wide")
 
-DB_URL = st.secrets.get("SUPABASE_DB_URL", os.getenv("SUPABASE_DB_URL", ""))
+
+def _config(name: str, default=None):
+    """Ambil konfigurasi dari Streamlit Secrets, fallback ke env var."""
+    return st.secrets.get(name, os.getenv(name, default))
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _app_path(path) -> str:
+    """Path file lokal; path relatif di-resolve terhadap folder app."""
+    return os.path.join(APP_DIR, os.path.expanduser(str(path)))
+
+
+DB_URL = _config("SUPABASE_DB_URL", "")
+
+# --- Pool koneksi DB (bisa di-override via Secrets / env var) ---
+DB_POOL_SIZE = int(_config("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(_config("DB_MAX_OVERFLOW", 5))
+DB_POOL_TIMEOUT = float(_config("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(_config("DB_POOL_RECYCLE", 1800))
+DB_STATEMENT_TIMEOUT_MS = int(_config("DB_STATEMENT_TIMEOUT_MS", 15000))
+
+# --- Engine baca (dashboard admin): pool terpisah dari tulisan responden, opsional ke replica ---
+DB_READ_URL = _config("DB_READ_URL", "")
+DB_READ_POOL_SIZE = int(_config("DB_READ_POOL_SIZE", 3))
+DB_READ_MAX_OVERFLOW = int(_config("DB_READ_MAX_OVERFLOW", 2))
+DB_READ_STATEMENT_TIMEOUT_MS = int(_config("DB_READ_STATEMENT_TIMEOUT_MS", 60000))
+# setelah tulisan di proses ini, dashboard membaca dari primary selama jeda ini (lag replica)
+DB_READ_AFTER_WRITE_SEC = float(_config("DB_READ_AFTER_WRITE_SEC", 30))
+
+# --- Cache hasil load_all_responses (detik) ---
+RESPONSES_CACHE_TTL = int(_config("RESPONSES_CACHE_TTL", 300))
+# --- Jumlah baris per halaman saat membaca tabel responses ---
+RESPONSES_PAGE_SIZE = int(_config("RESPONSES_PAGE_SIZE", 2000))
+
+# --- Sumber statistik IPA: "sql" (agregasi di Postgres), "summary" (tabel ringkasan harian)
+#     atau "python" (pandas) ---
+IPA_STATS_SOURCE = str(_config("IPA_STATS_SOURCE", "sql")).strip().lower()
+# --- Jumlah gambar plot IPA (PNG) yang disimpan di cache LRU per proses; 0 = tanpa cache ---
+IPA_FIGURE_CACHE_SIZE = int(_config("IPA_FIGURE_CACHE_SIZE", 32))
+# --- Backend plot IPA: "matplotlib" (PNG dari server) atau "vega-lite" (spec JSON, dirender di browser) ---
+IPA_CHART_BACKEND = str(_config("IPA_CHART_BACKEND", "matplotlib")).strip().lower()
+
+# --- Penulisan submission: "async" (spool lokal + worker latar belakang) atau "sync" ---
+SUBMIT_MODE = str(_config("SUBMIT_MODE", "async")).strip().lower()
+SUBMISSION_SPOOL_PATH = _app_path(_config("SUBMISSION_SPOOL_PATH", ".spool/submissions.sqlite3"))
+SUBMIT_MAX_ATTEMPTS = int(_config("SUBMIT_MAX_ATTEMPTS", 5))
+SUBMIT_RETRY_BASE_SEC = float(_config("SUBMIT_RETRY_BASE_SEC", 1))
+SUBMIT_RETRY_MAX_SEC = float(_config("SUBMIT_RETRY_MAX_SEC", 60))
+# --- Percobaan tulis langsung (mode sync / fallback) saat koneksi DB putus sesaat ---
+SUBMIT_SYNC_ATTEMPTS = int(_config("SUBMIT_SYNC_ATTEMPTS", 3))
+# --- Submission yang datang dalam jendela ini digabung jadi satu INSERT multi-baris ---
+SUBMIT_BATCH_WINDOW_MS = float(_config("SUBMIT_BATCH_WINDOW_MS", 20))
+SUBMIT_BATCH_SIZE = int(_config("SUBMIT_BATCH_SIZE", 100))
+
+# --- Draft responden: autosave progres + lanjutkan dengan kode responden ---
+DRAFT_AUTOSAVE = str(_config("DRAFT_AUTOSAVE", "true")).strip().lower() in ("1", "true", "yes")
+# --- Perubahan draft digabung: paling banyak satu tulis per interval (pindah tahap = tulis segera) ---
+DRAFT_SAVE_INTERVAL_SEC = float(_config("DRAFT_SAVE_INTERVAL_SEC", 5))
+DRAFT_TTL_DAYS = float(_config("DRAFT_TTL_DAYS", 30))
+# --- State responden: "session" (st.session_state per proses, draft di atas) atau state bersama
+#     "postgres" / "sqlite" (ditulis langsung per perubahan; replica mana pun bisa melanjutkan sesi) ---
+RESPONDENT_STATE_BACKEND = str(_config("RESPONDENT_STATE_BACKEND", "session")).strip().lower()
+RESPONDENT_STATE_PATH = _app_path(_config("RESPONDENT_STATE_PATH", ".spool/respondent_state.sqlite3"))
+RESPONDENT_STATE_SHARED = RESPONDENT_STATE_BACKEND in ("postgres", "sqlite")
+DRAFTS_ENABLED = DRAFT_AUTOSAVE or RESPONDENT_STATE_SHARED
 
 # --- Admin users (role-based access) ---
 # admin_general: bisa lihat semua data
@@ -32,13 +108,151 @@ if not DB_URL:
     st.error("DB belum dikonfigurasi. Set SUPABASE_DB_URL di Streamlit Secrets / env var.")
     st.stop()
 
-engine = create_engine(
-    DB_URL,
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    pool_size=5,
-    max_overflow=5,
-)
+
+
+@st.cache_resource
+def get_engine():
+    # Satu engine (dan satu pool) per proses: dipakai ulang oleh semua rerun & sesi.
+    # Engine ini untuk tulisan (submission responden, hapus data, migrasi skema).
+    return create_db_engine(
+        DB_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+    )
+
+
+@st.cache_resource
+def get_read_engines():
+    # Query dashboard memakai pool sendiri supaya scan besar tidak menghabiskan koneksi
+    # tulisan responden. (replica, primary): replica None bila DB_READ_URL tidak diset;
+    # primary di sini = pool baca terpisah ke DB utama, juga dipakai sebagai fallback.
+    def _read_engine(url):
+        return create_db_engine(
+            url,
+            pool_size=DB_READ_POOL_SIZE,
+            max_overflow=DB_READ_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            statement_timeout_ms=DB_READ_STATEMENT_TIMEOUT_MS,
+        )
+
+    replica = _read_engine(DB_READ_URL) if DB_READ_URL else None
+    return replica, _read_engine(DB_URL)
+
+
+engine = get_engine()
+
+
+def read_conn():
+    """
+    Transaksi baca untuk dashboard (replica bila ada, fallback ke primary).
+    Sesaat setelah tulisan lokal (insert / hapus) dibaca dari primary: hasilnya di-cache
+    dengan versi data yang baru, jadi hasil replica yang tertinggal tidak boleh masuk cache.
+    """
+    replica, primary = get_read_engines()
+    primary_only = get_data_version().changed_within(DB_READ_AFTER_WRITE_SEC)
+    return read_transaction(replica, primary, primary_only=primary_only)
+
+
+@st.cache_resource
+def get_data_version():
+    # Dibagi semua sesi di proses ini; dinaikkan oleh setiap operasi tulis.
+    return DataVersion()
+
+
+@st.cache_resource
+def get_figure_cache():
+    # Dibagi semua sesi admin di proses ini (key = isi plot, bukan sesi).
+    from figure_cache import FigureCache
+
+    return FigureCache(IPA_FIGURE_CACHE_SIZE)
+
+
+@st.cache_resource
+def get_hero_variants(src: str, src_mtime: float):
+    # Varian 1x/2x hero (WebP/PNG) dibuat sekali per proses dan per versi gambar (key = mtime).
+    try:
+        return ensure_variants(src)
+    except Exception:
+        # mis. folder app read-only: halaman utama tetap jalan dengan gambar asli
+        logging.getLogger(__name__).warning("Varian gambar hero tidak dapat dibuat", exc_info=True)
+        return None
+
+
+@st.cache_resource
+def ensure_schema_once():
+    # Dijalankan sekali per proses, saat pertama kali DB dipakai (bukan saat import),
+    # supaya DB yang sedang down tidak memblokir halaman utama/responden.
+    ensure_schema(engine)
+    return True
+
+
+def apply_pending_summary():
+    """
+    Lipat respons yang baru tersimpan ke ringkasan harian (transaksi pendek, di luar
+    transaksi submit). Gagal tidak apa-apa: antrian tetap di DB dan dilipat panggilan berikutnya.
+    Boleh dipanggil dari thread worker (tidak memakai fungsi ber-cache Streamlit).
+    """
+    try:
+        with engine.begin() as conn:
+            summary.apply_pending(conn)
+    except Exception:
+        logging.getLogger(__name__).warning("Antrian ringkasan harian belum bisa dilipat", exc_info=True)
+
+
+@st.cache_resource
+def get_submission_writer():
+    # Satu spool + satu worker per proses; sisa antrian dari proses sebelumnya ikut dikuras.
+    # Worker tidak memanggil fungsi ber-cache Streamlit (tidak ada ScriptRunContext di thread itu).
+    data_version = get_data_version()
+    schema_ready = threading.Event()
+
+    def write(submissions):
+        if not schema_ready.is_set():
+            ensure_schema(engine)
+            schema_ready.set()
+        with engine.begin() as conn:
+            written = insert_submissions(conn, submissions)
+        if written:
+            apply_pending_summary()
+            data_version.bump()
+
+    return SubmissionWriter(
+        SubmissionSpool(SUBMISSION_SPOOL_PATH),
+        write,
+        max_attempts=SUBMIT_MAX_ATTEMPTS,
+        retry_base_sec=SUBMIT_RETRY_BASE_SEC,
+        retry_max_sec=SUBMIT_RETRY_MAX_SEC,
+        batch_size=SUBMIT_BATCH_SIZE,
+        batch_window_sec=SUBMIT_BATCH_WINDOW_MS / 1000,
+    ).start()
+
+
+@st.cache_resource
+def get_draft_store():
+    if RESPONDENT_STATE_BACKEND == "sqlite":
+        return SQLiteDraftStore(RESPONDENT_STATE_PATH)
+    # ensure_schema (bukan ensure_schema_once): store juga dipakai dari thread draft-writer
+    return PostgresDraftStore(engine, prepare=ensure_schema)
+
+
+@st.cache_resource
+def get_draft_writer():
+    # Satu writer per proses (draft semua sesi ditulis dalam satu transaksi per interval).
+    # Sama seperti worker submission: tidak memanggil fungsi ber-cache Streamlit.
+    return DraftWriter(
+        get_draft_store(), interval_sec=DRAFT_SAVE_INTERVAL_SEC, ttl_sec=DRAFT_TTL_DAYS * 86400
+    ).start()
+
+
+@st.cache_resource
+def get_draft_purger():
+    # mode state bersama tidak lewat DraftWriter: draft kedaluwarsa dibersihkan dari jalur tulis store
+    return DraftPurger(get_draft_store(), ttl_sec=DRAFT_TTL_DAYS * 86400)
+
 
 LIKERT_PERF = {
     1: "Sangat Tidak Setuju",
@@ -57,131 +271,6 @@ LIKERT_IMP = {
     6: "Sangat Penting",
 }
 
-# =========================
-# ITEMS (kode + pernyataan)
-# =========================
-ITEMS = [
-    # Data & Services Integration
-    ("Data & Services Integration", "DSI1",
-     "Aplikasi telemedicine memungkinkan informasi terkait telekonsultasi klinis (hasil anamnesis, diagnosis, pemeriksaan fisik, penelaahan hasil pemeriksaan penunjang, anjuran, edukasi, pengobatan, dan/atau rujukan yang diberikan) dapat tercatat secara tepat dalam rekam medis pasien sesuai dengan ketentuan peraturan perundang-undangan"),
-    ("Data & Services Integration", "DSI2",
-     "Aplikasi telemedicine dapat terhubung dengan sistem informasi atau platform lain, untuk mengirim dan/atau menerima rekam medis pasien"),
-    ("Data & Services Integration", "DSI3",
-     "Aplikasi telemedicine terhubung dengan fasilitas pelayanan kefarmasian dan/atau fasilitas pelayanan kesehatan sehingga dapat memfasilitasi layanan yang terintegrasi"),
-    ("Data & Services Integration", "DSI4",
-     "Aplikasi telemedicine dapat terhubung dengan alat medis untuk mengirimkan data tanda vital pasien secara real-time"),
-    ("Data & Services Integration", "DSI5",
-     "Aplikasi telemedicine menyediakan data penting yang saya perlukan dalam memberikan layanan kesehatan jarak jauh"),
-
-    # Clinical Decision Support
-    ("Clinical Decision Support", "CDS1",
-     "Aplikasi telemedicine dapat secara otomatis memberikan rekomendasi diagnosis, anjuran, edukasi, dan/atau penatalaksanaan pasien (termasuk pengobatan) kepada dokter berdasarkan data dan hasil pemeriksaan pasien"),
-    ("Clinical Decision Support", "CDS2",
-     "Aplikasi telemedicine dapat secara otomatis mencegah penulisan resep untuk obat-obat yang dikecualikan dalam peraturan pemerintah; memiliki potensi interaksi dengan obat lainnya; dan/atau tidak sesuai dengan kondisi khusus pasien, seperti alergi, hamil, menyusui, atau kondisi lainnya, sehingga hanya obat yang aman dan sesuai yang dapat diresepkan"),
-
-    # Clinical Communication
-    ("Clinical Communication", "CCM1",
-     "Aplikasi telemedicine dapat memfasilitasi pertukaran informasi antar dokter, seperti informasi mengenai kondisi kesehatan dan/atau hasil pemeriksaan pasien yang dirujuk"),
-    ("Clinical Communication", "CCM2",
-     "Aplikasi telemedicine dapat memfasilitasi komunikasi antar dokter, misalnya untuk mendiskusikan kondisi, diagnosis, dan/atau rencana pengobatan pasien"),
-    ("Clinical Communication", "CCM3",
-     "Aplikasi telemedicine memungkinkan saya untuk bertukar informasi dengan pasien, seperti bertukar informasi mengenai kondisi kesehatan dan/atau hasil pemeriksaan pasien"),
-    ("Clinical Communication", "CCM4",
-     "Aplikasi telemedicine memungkinkan saya untuk berkomunikasi secara langsung dengan pasien melalui pesan teks, panggilan audio, dan/atau panggilan video"),
-    ("Clinical Communication", "CCM5",
-     "Aplikasi telemedicine memungkinkan pasien untuk memberikan penilaian terhadap layanan dan/atau persetujuan/penolakan terhadap rekomendasi medis yang saya berikan"),
-
-    # Clinical Task Support
-    ("Clinical Task Support", "CTS1",
-     "Aplikasi telemedicine memungkinkan saya, sebagai dokter yang berwenang, untuk mengakses, meninjau, dan/atau memperbarui data rekam medis pasien"),
-    ("Clinical Task Support", "CTS2",
-     "Aplikasi telemedicine memungkinkan saya untuk melakukan anamnesis"),
-    ("Clinical Task Support", "CTS3",
-     "Aplikasi telemedicine memungkinkan saya untuk melakukan pemeriksaan secara memadai melalui media audio dan/atau visual"),
-    ("Clinical Task Support", "CTS4",
-     "Aplikasi telemedicine memungkinkan saya untuk melakukan penelaahan hasil pemeriksaan penunjang"),
-    ("Clinical Task Support", "CTS5",
-     "Aplikasi telemedicine memungkinkan saya untuk memberikan anjuran dan/atau edukasi kepada pasien"),
-    ("Clinical Task Support", "CTS6",
-     "Aplikasi telemedicine memungkinkan saya untuk melakukan penegakan diagnosis kerja"),
-    ("Clinical Task Support", "CTS7",
-     "Aplikasi telemedicine memungkinkan saya untuk melakukan penatalaksanaan pasien, termasuk pemberian pengobatan"),
-    ("Clinical Task Support", "CTS8",
-     "Aplikasi telemedicine memungkinkan saya memberikan rujukan kepada pasien untuk melakukan pemeriksaan kesehatan lanjutan ke fasilitas pelayanan kesehatan"),
-    ("Clinical Task Support", "CTS9",
-     "Aplikasi telemedicine memungkinkan saya untuk memantau perkembangan kondisi pasien setelah pengobatan diberikan"),
-
-    # Scheduling & Notification
-    ("Scheduling & Notification", "SCN1",
-     "Aplikasi telemedicine memungkinkan saya untuk mengatur jadwal konsultasi dan/atau follow-up dengan pasien"),
-    ("Scheduling & Notification", "SCN2",
-     "Aplikasi telemedicine menyediakan notifikasi yang saya butuhkan dalam memberikan layanan kesehatan jarak jauh kepada pasien"),
-
-    # System Reliability
-    ("System Reliability", "SRB1",
-     "Aplikasi telemedicine yang saya gunakan dapat diandalkan untuk selalu aktif dan/atau tersedia saat saya membutuhkannya"),
-    ("System Reliability", "SRB2",
-     "Aplikasi telemedicine yang saya gunakan tidak sering mengalami masalah dan/atau kerusakan sistem yang tidak terduga yang dapat mengganggu saya dalam memberikan layanan kesehatan jarak jauh kepada pasien"),
-    ("System Reliability", "SRB3",
-     "Jika aplikasi telemedicine sedang mengalami kerusakan dan/atau perawatan sistem, terdapat jaminan bahwa aplikasi dapat digunakan kembali dalam waktu tertentu (misalnya 24 jam)"),
-
-    # Ease of Use & Support
-    ("Ease of Use & Support", "EUS1",
-     "Aplikasi telemedicine mudah untuk dipelajari dan/atau digunakan"),
-    ("Ease of Use & Support", "EUS2",
-     "Aplikasi telemedicine menyediakan bantuan bagi pengguna yang mengalami kesulitan dalam dalam menggunakan aplikasi"),
-
-    # Privacy & Security
-    ("Privacy & Security", "PSC1",
-     "Aplikasi telemedicine menyediakan mekanisme verifikasi dan/atau validasi keabsahan pengguna untuk memastikan bahwa hanya individu yang berwenang yang dapat mengakses data"),
-    ("Privacy & Security", "PSC2",
-     "Aplikasi telemedicine memiliki fitur keamanan yang baik untuk melindungi data dari akses yang tidak sah dan/atau kebocoran data"),
-
-    # Data Quality & Accessibility
-    ("Data Quality & Accessibility", "DQA1",
-     "Aplikasi telemedicine menyediakan data yang berkualitas (akurat, mutakhir, dan/atau memiliki tingkat detail yang sesuai) untuk tugas saya memberikan layanan kesehatan jarak jauh kepada pasien"),
-    ("Data Quality & Accessibility", "DQA2",
-     "Aplikasi telemedicine menyediakan error handling untuk menjaga keakuratan input data"),
-    ("Data Quality & Accessibility", "DQA3",
-     "Aplikasi telemedicine memungkinkan saya untuk mengakses data yang saya butuhkan dengan mudah"),
-    ("Data Quality & Accessibility", "DQA4",
-     "Aplikasi telemedicine memungkinkan saya untuk menemukan data tertentu dengan mudah"),
-    ("Data Quality & Accessibility", "DQA5",
-     "Aplikasi telemedicine menyajikan data dengan makna yang jelas dan/atau mudah untuk diketahui"),
-    ("Data Quality & Accessibility", "DQA6",
-     "Aplikasi telemedicine menampilkan data yang saya perlukan dalam bentuk yang mudah dibaca dan/atau dimengerti"),
-]
-
-ITEM_CODES = [code for _, code, _ in ITEMS]
-ITEM_TEXT = {code: text_ for _, code, text_ in ITEMS}
-
-
-def group_by_dim(items):
-    grouped = {}
-    for dim, code, text_ in items:
-        grouped.setdefault(dim, []).append((code, text_))
-    return grouped
-
-
-DIMS = group_by_dim(ITEMS)
-
-# =========================
-# DIMENSION MAPPING (9 dimensi)
-# =========================
-DIM_ABBR = {
-    "Data & Services Integration": "DSI",
-    "Clinical Decision Support": "CDS",
-    "Clinical Communication": "CCM",
-    "Clinical Task Support": "CTS",
-    "Scheduling & Notification": "SCN",
-    "System Reliability": "SRB",
-    "Ease of Use & Support": "EUS",
-    "Privacy & Security": "PSC",
-    "Data Quality & Accessibility": "DQA",
-}
-DIM_CODES = {DIM_ABBR[dim]: [code for code, _ in items] for dim, items in DIMS.items()}
-DIM_NAME_BY_ABBR = {abbr: full for full, abbr in DIM_ABBR.items()}
-
 # =========================
 # PROFIL OPTIONS (dropdown)
 # =========================
@@ -313,11 +402,129 @@ def _hydrate_widget_state_from_answers(prefix: str, answers: dict, force: bool =
 def _enter_step(step: int):
     st.session_state.step = step
     st.session_state._enter_step = True
+    _autosave_draft(flush=True)
 
 
 def _go_home():
     st.session_state.view = "home"
+    st.query_params.pop("draft", None)
+    _request_scroll_to_top()
+
+
+def _draft_state() -> dict:
+    started = st.session_state.get("respondent_started_at")
+    return {
+        "step": int(st.session_state.get("step", 0)),
+        "profile": dict(st.session_state.get("profile", {}) or {}),
+        "perf": dict(st.session_state.get("perf", {}) or {}),
+        "imp": dict(st.session_state.get("imp", {}) or {}),
+        "respondent_started_at": started.isoformat() if isinstance(started, datetime) else "",
+    }
+
+
+def _autosave_draft(flush: bool = False):
+    """
+    Simpan draft sesi ini bila berubah sejak simpanan terakhir: lewat DraftWriter (digabung),
+    atau langsung ke store bila state responden dibagi antar replica.
+    """
+    if not DRAFTS_ENABLED:
+        return
+    state = _draft_state()
+    if state == st.session_state.get("_draft_saved"):
+        return
+    if state["step"] == 0 and not any(state["profile"].values()):
+        return  # belum ada isian: jangan buat draft untuk setiap klik "Mulai"
+    try:
+        if RESPONDENT_STATE_SHARED:
+            # rerun berikutnya bisa dilayani replica lain: tulis sebelum lanjut
+            get_draft_store().write({st.session_state.draft_token: state}, [])
+        else:
+            get_draft_writer().save(st.session_state.draft_token, state, flush=flush)
+    except Exception:
+        # autosave best-effort: jangan ganggu responden yang sedang mengisi
+        logging.getLogger(__name__).warning("Draft tidak dapat disimpan", exc_info=True)
+        return
+    st.session_state._draft_saved = state
+    if RESPONDENT_STATE_SHARED:
+        try:
+            get_draft_purger().maybe_purge()  # paling banyak sekali per jam per proses
+        except Exception:
+            logging.getLogger(__name__).warning("Draft kedaluwarsa tidak dapat dihapus", exc_info=True)
+
+
+def _discard_draft(token: str):
+    if not DRAFTS_ENABLED or not token:
+        return
+    try:
+        if RESPONDENT_STATE_SHARED:
+            get_draft_store().write({}, [token])
+        else:
+            get_draft_writer().discard(token)
+    except Exception:
+        logging.getLogger(__name__).warning("Draft %s tidak dapat dihapus", token, exc_info=True)
+
+
+def _load_draft(token: str):
+    if RESPONDENT_STATE_SHARED:
+        return get_draft_store().load(token, DRAFT_TTL_DAYS * 86400)
+    return get_draft_writer().load(token)
+
+
+def _new_respondent_code() -> str:
+    return f"TATTFQ-{uuid.uuid4().hex[:10].upper()}"
+
+
+def _new_draft_token() -> str:
+    # kunci lanjutkan (URL ?draft=... / input manual); terpisah dari respondent_code
+    return f"DRAFT-{uuid.uuid4().hex[:16].upper()}"
+
+
+def _resume_draft(token: str) -> bool:
+    """
+    Pulihkan sesi responden dari draft. Return False bila draft tidak ada / kedaluwarsa.
+
+    Link / token bisa dibagikan, jadi sesi yang melanjutkan selalu mendapat respondent_code
+    dan token baru, dan draft lama dipindahkan ke token baru itu: link lama tidak bisa dipakai
+    lagi, dan dua orang yang membuka link yang sama tidak pernah berbagi satu respondent_code.
+    """
+    token = (token or "").strip().upper()
+    if not token:
+        return False
+    try:
+        state = _load_draft(token)
+    except Exception as e:
+        st.error("Gagal memuat draft kuesioner. Detail error:")
+        st.exception(e)
+        return False
+    if not state:
+        return False
+
+    try:
+        started = datetime.fromisoformat(state.get("respondent_started_at") or "")
+    except ValueError:
+        started = datetime.now(timezone.utc)
+    perf = {code_: int(v) for code_, v in (state.get("perf") or {}).items()}
+    imp = {code_: int(v) for code_, v in (state.get("imp") or {}).items()}
+
+    st.session_state.view = "respondent"
+    st.session_state.respondent_code = _new_respondent_code()
+    st.session_state.draft_token = _new_draft_token()
+    st.session_state.respondent_started_at = started
+    st.session_state.step = int(state.get("step", 0))
+    st.session_state.profile = dict(state.get("profile") or {})
+    st.session_state.perf = perf
+    st.session_state.imp = imp
+    st.session_state.confirm_submit = False
+    st.session_state.pending_meta = {}
+    st.session_state._enter_step = True
+    _hydrate_widget_state_from_answers("perf", perf, force=True)
+    _hydrate_widget_state_from_answers("imp", imp, force=True)
+    st.session_state._draft_saved = None
+    _autosave_draft(flush=True)  # draft pindah ke token baru
+    _discard_draft(token)
+    st.query_params["draft"] = st.session_state.draft_token
     _request_scroll_to_top()
+    return True
 
 
 def _new_respondent_session():
@@ -327,7 +534,8 @@ def _new_respondent_session():
     st.session_state.confirm_submit = False
     st.session_state.pending_meta = {}
     st.session_state._enter_step = True
-    st.session_state.respondent_code = f"TATTFQ-{uuid.uuid4().hex[:10].upper()}"
+    st.session_state.respondent_code = _new_respondent_code()
+    st.session_state.draft_token = _new_draft_token()
     st.session_state.respondent_started_at = datetime.now(timezone.utc)
     st.session_state.profile = {
         "gender": "",
@@ -362,7 +570,8 @@ def _reset_survey_state(go_home: bool = False):
         "telemedicine_frequency": "",
         "telemedicine_last_use": "",
     }
-    st.session_state.respondent_code = f"TATTFQ-{uuid.uuid4().hex[:10].upper()}"
+    st.session_state.respondent_code = _new_respondent_code()
+    st.session_state.draft_token = _new_draft_token()
     st.session_state.respondent_started_at = datetime.now(timezone.utc)
     _request_scroll_to_top()
     if go_home:
@@ -382,35 +591,46 @@ def _cancel_submit_confirmation():
 # =========================
 # DB helpers
 # =========================
-def insert_response(respondent_code, meta, perf_dict, imp_dict):
-    try:
-        stmt = text(
-            """
-            INSERT INTO responses (respondent_code, meta, performance, importance)
-            VALUES (:respondent_code, :meta, :performance, :importance)
-        """
-        ).bindparams(
-            bindparam("meta", type_=JSONB),
-            bindparam("performance", type_=JSONB),
-            bindparam("importance", type_=JSONB),
-        )
+def insert_response(respondent_code, meta, perf_dict, imp_dict) -> bool:
+    """Tulis langsung ke DB (dengan retry). Return False bila respondent_code sudah tersimpan."""
+    submission = {"respondent_code": respondent_code, "meta": meta, "perf": perf_dict, "imp": imp_dict}
 
+    def write():
+        ensure_schema_once()
         with engine.begin() as conn:
-            conn.execute(
-                stmt,
-                {
-                    "respondent_code": respondent_code,
-                    "meta": meta or {},
-                    "performance": perf_dict or {},
-                    "importance": imp_dict or {},
-                },
-            )
+            return bool(insert_submissions(conn, [submission]))
+
+    try:
+        created = with_retries(write, attempts=SUBMIT_SYNC_ATTEMPTS)
+        if created:
+            apply_pending_summary()
+            get_data_version().bump()
+        return created
     except Exception as e:
         st.error("Gagal menyimpan ke database. Detail error:")
         st.exception(e)
         st.stop()
 
 
+def submit_response(respondent_code, meta, perf_dict, imp_dict) -> bool:
+    """
+    Mode async: simpan ke spool lokal lalu kembali (worker yang menulis ke DB).
+    Bila spool tidak bisa dipakai (atau SUBMIT_MODE = "sync"), tulis langsung ke DB.
+    Return False hanya bila sudah pasti respondent_code ini tersimpan sebelumnya.
+    Mode async belum bisa memastikannya (duplikat baru terlihat saat worker menulis dan
+    dilewati di sana), jadi selalu True kecuali jatuh ke tulis langsung.
+    """
+    if SUBMIT_MODE == "async":
+        try:
+            get_submission_writer().submit(
+                {"respondent_code": respondent_code, "meta": meta, "perf": perf_dict, "imp": imp_dict}
+            )
+            return True
+        except Exception:
+            logging.getLogger(__name__).exception("Spool submission tidak tersedia, tulis langsung ke DB")
+    return insert_response(respondent_code, meta, perf_dict, imp_dict)
+
+
 def _confirm_and_submit():
     st.session_state.imp = _sync_dict_from_widget("imp")
 
@@ -438,86 +658,176 @@ def _confirm_and_submit():
         "duration_sec": duration_sec,
     }
 
-    insert_response(
-        respondent_code=st.session_state.get("respondent_code", "").strip(),
+    respondent_code = st.session_state.get("respondent_code", "").strip()
+    created = submit_response(
+        respondent_code=respondent_code,
         meta=meta,
         perf_dict=st.session_state.get("perf", {}),
         imp_dict=st.session_state.get("imp", {}),
     )
+    _discard_draft(st.session_state.get("draft_token", ""))
 
-    st.session_state["flash_success"] = "Terima kasih! Jawaban Anda telah tersimpan."
+    if created:
+        st.session_state["flash_success"] = "Terima kasih! Jawaban Anda telah tersimpan."
+    else:
+        # klik ganda / sesi dilanjutkan setelah submit: jawaban pertama yang dipakai
+        logging.getLogger(__name__).info("Submission %s sudah tersimpan sebelumnya, dilewati", respondent_code)
+        st.session_state["flash_info"] = (
+            "Jawaban untuk kode responden ini sudah tersimpan sebelumnya; kiriman ulang tidak disimpan."
+        )
     _reset_survey_state(go_home=True)
 
 
-def load_all_responses(limit=5000):
+def _response_filters(platform=None, date_range=None):
+    """Klausa WHERE + parameter untuk filter platform & periode (keduanya ter-index)."""
+    conds = []
+    params = {}
+    if platform:
+        # kolom platform = TRIM(COALESCE(meta->>'platform',''))
+        conds.append("platform = :platform")
+        params["platform"] = platform
+    if date_range:
+        from response_frame import local_date_range
+
+        # submitted_at = meta.submitted_at_utc, fallback created_at
+        start_ts, end_ts = local_date_range(*date_range)
+        conds.append("submitted_at >= :start_ts AND submitted_at < :end_ts")
+        params["start_ts"] = start_ts
+        params["end_ts"] = end_ts
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+    return where, params
+
+
+@st.cache_data(ttl=RESPONSES_CACHE_TTL, max_entries=16, show_spinner=False)
+def _load_submitted_date_bounds(data_version: int, platform):
+    where, params = _response_filters(platform)
+    with read_conn() as conn:
+        row = conn.execute(
+            text(
+                f"""
+                SELECT
+                    (MIN(submitted_at) AT TIME ZONE '{LOCAL_TZ}')::date AS first_date,
+                    (MAX(submitted_at) AT TIME ZONE '{LOCAL_TZ}')::date AS last_date
+                FROM responses
+                {where}
+                """
+            ),
+            params,
+        ).one()
+    return row.first_date, row.last_date
+
+
+@st.cache_data(ttl=RESPONSES_CACHE_TTL, max_entries=16, show_spinner=False)
+def _count_responses(data_version: int, platform, date_range):
+    where, params = _response_filters(platform, date_range)
+    with read_conn() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM responses {where}"), params).scalar_one()
+
+
+def count_responses(platform=None, date_range=None) -> int:
+    """Jumlah respons (filter platform & periode di SQL), tanpa memuat barisnya."""
     try:
-        with engine.begin() as conn:
-            rows = conn.execute(
-                text(
-                    """
-                    SELECT id, created_at, respondent_code, meta, performance, importance
-                    FROM responses
-                    ORDER BY created_at DESC
-                    LIMIT :limit
-                    """
-                ),
-                {"limit": limit},
-            ).fetchall()
+        ensure_schema_once()
+        plat = (platform or "").strip() or None
+        return _count_responses(get_data_version().current(), plat, date_range)
     except Exception as e:
         st.error("Gagal load data dari database. Detail error:")
         st.exception(e)
         st.stop()
 
-    records = []
-    for r in rows:
-        meta = r.meta or {}
-        perf = r.performance or {}
-        imp = r.importance or {}
-
-        created_at_utc = pd.to_datetime(r.created_at, utc=True, errors="coerce")
-        created_at_local = created_at_utc.tz_convert("Asia/Jakarta") if pd.notna(created_at_utc) else pd.NaT
-
-        started_at_utc = pd.to_datetime(meta.get("started_at_utc", ""), utc=True, errors="coerce")
-        submitted_at_utc = pd.to_datetime(meta.get("submitted_at_utc", ""), utc=True, errors="coerce")
-
-        started_at_local = started_at_utc.tz_convert("Asia/Jakarta") if pd.notna(started_at_utc) else pd.NaT
-        submitted_at_local = submitted_at_utc.tz_convert("Asia/Jakarta") if pd.notna(submitted_at_utc) else pd.NaT
-
-        effective_time_local = submitted_at_local if pd.notna(submitted_at_local) else created_at_local
-
-        rec = {
-            "id": r.id,
-            "created_at": created_at_utc,
-            "respondent_code": r.respondent_code,
-            "created_at_utc": created_at_utc,
-            "created_at_local": created_at_local,
-            "meta_started_at_utc_dt": started_at_utc,
-            "meta_submitted_at_utc_dt": submitted_at_utc,
-            "meta_started_at_local": started_at_local,
-            "meta_submitted_at_local": submitted_at_local,
-            "effective_time_local": effective_time_local,
-        }
 
-        for k, v in meta.items():
-            rec[f"meta_{k}"] = v
+def load_submitted_date_bounds(platform=None):
+    """Tanggal lokal submit paling awal & paling akhir (untuk default filter periode)."""
+    try:
+        ensure_schema_once()
+        plat = (platform or "").strip() or None
+        return _load_submitted_date_bounds(get_data_version().current(), plat)
+    except Exception as e:
+        st.error("Gagal load data dari database. Detail error:")
+        st.exception(e)
+        st.stop()
+
+
+# JSONB jawaban hanya dikirim untuk baris yang skor bertipenya belum di-backfill
+_RESPONSE_COLUMNS = """
+    id, created_at, respondent_code, meta, perf_scores, imp_scores,
+    CASE WHEN perf_scores IS NULL THEN performance END AS performance,
+    CASE WHEN imp_scores IS NULL THEN importance END AS importance
+"""
+
+
+def _iter_response_pages(conn, where: str, params: dict, page_size: int):
+    """
+    Keyset pagination (created_at DESC, id DESC): setiap halaman melanjutkan dari
+    baris terakhir halaman sebelumnya, jadi tidak ada OFFSET dan tidak ada fetchall
+    seluruh tabel. Urutan sama dengan query lama (ORDER BY created_at DESC).
+    """
+    keyset = "(created_at, id) < (:after_created_at, :after_id)"
+    after = f" AND {keyset}" if where else f"WHERE {keyset}"
+
+    first_stmt = text(
+        f"""
+        SELECT {_RESPONSE_COLUMNS}
+        FROM responses
+        {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :page_size
+        """
+    )
+    next_stmt = text(
+        f"""
+        SELECT {_RESPONSE_COLUMNS}
+        FROM responses
+        {where}{after}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :page_size
+        """
+    )
+
+    page_params = dict(params, page_size=page_size)
+    rows = conn.execute(first_stmt, page_params).fetchall()
+    while rows:
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+        page_params.update(after_created_at=last.created_at, after_id=last.id)
+        rows = conn.execute(next_stmt, page_params).fetchall()
 
-        for code in ITEM_CODES:
-            rec[f"{code}_Performance"] = perf.get(code, np.nan)
-            rec[f"{code}_Importance"] = imp.get(code, np.nan)
 
-        records.append(rec)
+@st.cache_data(ttl=RESPONSES_CACHE_TTL, max_entries=16, show_spinner=False)
+def _load_responses_frame(data_version: int, limit, platform, date_range):
+    """
+    Query + flatten respons, di-cache lintas sesi. `data_version` hanya dipakai
+    sebagai key cache: setiap operasi tulis menaikkannya, jadi hasil lama tidak
+    terpakai lagi; TTL membatasi umur cache untuk perubahan dari luar proses ini.
 
-    base_cols = ["id", "created_at", "respondent_code"]
-    df = pd.DataFrame.from_records(records)
+    Data dibaca per halaman dan langsung di-flatten, jadi yang tertahan di memori
+    hanya satu halaman baris JSON + frame ringkas hasil flatten.
+    """
+    from dashboard import responses_frame
 
-    if df.empty and len(df.columns) == 0:
-        df = pd.DataFrame(columns=base_cols)
+    where, params = _response_filters(platform, date_range)
+    with read_conn() as conn:
+        return responses_frame(_iter_response_pages(conn, where, params, RESPONSES_PAGE_SIZE), limit)
 
-    for col in base_cols:
-        if col not in df.columns:
-            df[col] = pd.Series(dtype="object")
 
-    return df
+def load_all_responses(limit=None, platform=None, date_range=None):
+    """
+    Semua respons (limit=None) atau `limit` respons terbaru.
+    platform=None -> semua platform; selain itu hanya respons platform tersebut.
+    date_range=(start_date, end_date) -> hanya respons yang disubmit pada rentang
+    tanggal lokal itu (inklusif). Kedua filter dilakukan di SQL.
+    """
+    try:
+        ensure_schema_once()
+        plat = (platform or "").strip() or None
+        return _load_responses_frame(get_data_version().current(), limit, plat, date_range)
+    except Exception as e:
+        st.error("Gagal load data dari database. Detail error:")
+        st.exception(e)
+        st.stop()
+
 
 def delete_responses_by_platform(platform_name: str):
     """
@@ -529,16 +839,19 @@ def delete_responses_by_platform(platform_name: str):
         if not plat:
             return
 
+        ensure_schema_once()
         with engine.begin() as conn:
             conn.execute(
                 text(
                     """
                     DELETE FROM responses
-                    WHERE TRIM(COALESCE(meta->>'platform','')) = :platform
+                    WHERE platform = :platform
                     """
                 ),
                 {"platform": plat},
             )
+            summary.apply_platform_deleted(conn, plat)
+        get_data_version().bump()
     except Exception as e:
         st.error("Gagal menghapus data platform. Detail error:")
         st.exception(e)
@@ -546,8 +859,11 @@ def delete_responses_by_platform(platform_name: str):
 
 def delete_all_responses():
     try:
+        ensure_schema_once()
         with engine.begin() as conn:
             conn.execute(text("TRUNCATE TABLE responses RESTART IDENTITY"))
+            summary.apply_all_deleted(conn)
+        get_data_version().bump()
     except Exception as e:
         st.error("Gagal menghapus data. Detail error:")
         st.exception(e)
@@ -581,431 +897,74 @@ def _confirm_delete_all():
 # =========================
 # STATS + IPA
 # =========================
-def compute_stats_and_ipa(df_flat: pd.DataFrame):
-    def _series(col: str) -> pd.Series:
-        return pd.to_numeric(df_flat.get(col, pd.Series(dtype="float")), errors="coerce")
-
-    rows = []
-    for code in ITEM_CODES:
-        p = _series(f"{code}_Performance")
-        i = _series(f"{code}_Importance")
-        rows.append(
-            {
-                "Item": code,
-                "Performance_min": p.min(skipna=True),
-                "Performance_max": p.max(skipna=True),
-                "Performance_mean": p.mean(skipna=True),
-                "Importance_min": i.min(skipna=True),
-                "Importance_max": i.max(skipna=True),
-                "Importance_mean": i.mean(skipna=True),
-            }
-        )
-
-    stats = pd.DataFrame(rows)
-    stats["Gap_mean(P-I)"] = stats["Performance_mean"] - stats["Importance_mean"]
-
-    # cut-off data-centered
-    x_cut = float(stats["Performance_mean"].mean(skipna=True))
-    y_cut = float(stats["Importance_mean"].mean(skipna=True))
-
-    quad_order = [
-        "I - Concentrate Here",
-        "II - Keep Up the Good Work",
-        "III - Low Priority",
-        "IV - Possible Overkill",
-    ]
-
-    # --- Versi 1 (tanpa diagonal): klasik 4 kuadran (x_cut, y_cut) ---
-    def quadrant_v1(x: float, y: float) -> str:
-        if pd.isna(x) or pd.isna(y):
-            return "NA"
-        if y >= y_cut and x < x_cut:
-            return "I - Concentrate Here"
-        if y >= y_cut and x >= x_cut:
-            return "II - Keep Up the Good Work"
-        if y < y_cut and x < x_cut:
-            return "III - Low Priority"
-        return "IV - Possible Overkill"
-
-    # --- Versi 2 (dengan diagonal): aturan sesuai definisi user ---
-    # Q1: semua titik DI ATAS diagonal
-    # Q2: DI BAWAH diagonal & DI ATAS garis horizontal (y_cut)
-    # Q3: DI BAWAH diagonal & DI KIRI garis vertikal (x_cut)
-    # Q4: DI BAWAH diagonal & DI BAWAH horizontal (y_cut) & DI KANAN vertikal (x_cut)
-    b = y_cut - x_cut
-
-    def quadrant_v2(x: float, y: float) -> str:
-        if pd.isna(x) or pd.isna(y):
-            return "NA"
-
-        y_diag = x + b
-
-        if y >= y_diag:
-            return "I - Concentrate Here"
-        if y >= y_cut:
-            return "II - Keep Up the Good Work"
-        if x < x_cut:
-            return "III - Low Priority"
-        return "IV - Possible Overkill"
-
-    stats["Quadrant_v1"] = [quadrant_v1(x, y) for x, y in zip(stats["Performance_mean"], stats["Importance_mean"])]
-    stats["Quadrant_v2"] = [quadrant_v2(x, y) for x, y in zip(stats["Performance_mean"], stats["Importance_mean"])]
-
-    quad_lists_v1 = {q: stats.loc[stats["Quadrant_v1"] == q, "Item"].tolist() for q in quad_order}
-    quad_lists_v2 = {q: stats.loc[stats["Quadrant_v2"] == q, "Item"].tolist() for q in quad_order}
-
-    return stats, x_cut, y_cut, quad_lists_v1, quad_lists_v2
-
-
-def compute_dimension_stats_and_ipa(df_flat: pd.DataFrame):
-    quad_order = [
-        "I - Concentrate Here",
-        "II - Keep Up the Good Work",
-        "III - Low Priority",
-        "IV - Possible Overkill",
-    ]
-
-    if df_flat is None or df_flat.empty:
-        cols = [
-            "Dimension", "Dimension_name", "n_items",
-            "Performance_min", "Performance_max", "Performance_mean",
-            "Importance_min", "Importance_max", "Importance_mean",
-            "Gap_mean(P-I)", "Quadrant_v1", "Quadrant_v2",
-        ]
-        empty_stats = pd.DataFrame(columns=cols)
-        return empty_stats, np.nan, np.nan, {q: [] for q in quad_order}, {q: [] for q in quad_order}
-
-    rows = []
-    for dim_full, abbr in DIM_ABBR.items():
-        codes = DIM_CODES.get(abbr, [])
-        perf_cols = [f"{c}_Performance" for c in codes]
-        imp_cols = [f"{c}_Importance" for c in codes]
-
-        perf_dim = (
-            df_flat.reindex(columns=perf_cols)
-            .apply(pd.to_numeric, errors="coerce")
-            .mean(axis=1, skipna=True)
-        )
-        imp_dim = (
-            df_flat.reindex(columns=imp_cols)
-            .apply(pd.to_numeric, errors="coerce")
-            .mean(axis=1, skipna=True)
-        )
-
-        rows.append(
-            {
-                "Dimension": abbr,
-                "Dimension_name": dim_full,
-                "n_items": len(codes),
-                "Performance_min": perf_dim.min(skipna=True),
-                "Performance_max": perf_dim.max(skipna=True),
-                "Performance_mean": perf_dim.mean(skipna=True),
-                "Importance_min": imp_dim.min(skipna=True),
-                "Importance_max": imp_dim.max(skipna=True),
-                "Importance_mean": imp_dim.mean(skipna=True),
-            }
-        )
-
-    dim_stats = pd.DataFrame(rows)
-    dim_stats["Gap_mean(P-I)"] = dim_stats["Performance_mean"] - dim_stats["Importance_mean"]
-
-    # cut-off data-centered (untuk dimensi)
-    x_cut = float(dim_stats["Performance_mean"].mean(skipna=True))
-    y_cut = float(dim_stats["Importance_mean"].mean(skipna=True))
-
-    # --- Versi 1: klasik ---
-    def quadrant_v1(x: float, y: float) -> str:
-        if pd.isna(x) or pd.isna(y):
-            return "NA"
-        if y >= y_cut and x < x_cut:
-            return "I - Concentrate Here"
-        if y >= y_cut and x >= x_cut:
-            return "II - Keep Up the Good Work"
-        if y < y_cut and x < x_cut:
-            return "III - Low Priority"
-        return "IV - Possible Overkill"
-
-    # --- Versi 2: diagonal (y = x + b, lewat (x_cut, y_cut)) ---
-    b = y_cut - x_cut
-
-    def quadrant_v2(x: float, y: float) -> str:
-        if pd.isna(x) or pd.isna(y):
-            return "NA"
-
-        y_diag = x + b
-
-        # Q1: di atas diagonal
-        if y >= y_diag:
-            return "I - Concentrate Here"
-
-        # di bawah diagonal:
-        if y >= y_cut:
-            return "II - Keep Up the Good Work"
-
-        if x < x_cut:
-            return "III - Low Priority"
-
-        return "IV - Possible Overkill"
-
-    dim_stats["Quadrant_v1"] = [
-        quadrant_v1(x, y)
-        for x, y in zip(dim_stats["Performance_mean"], dim_stats["Importance_mean"])
-    ]
-    dim_stats["Quadrant_v2"] = [
-        quadrant_v2(x, y)
-        for x, y in zip(dim_stats["Performance_mean"], dim_stats["Importance_mean"])
-    ]
-
-    quad_lists_v1 = {q: dim_stats.loc[dim_stats["Quadrant_v1"] == q, "Dimension"].tolist() for q in quad_order}
-    quad_lists_v2 = {q: dim_stats.loc[dim_stats["Quadrant_v2"] == q, "Dimension"].tolist() for q in quad_order}
-
-    return dim_stats, x_cut, y_cut, quad_lists_v1, quad_lists_v2
-
-
-def _plot_iso_diagonal(ax, x_cut, y_cut, xlim, ylim, with_endpoints=False):
+@st.cache_data(ttl=RESPONSES_CACHE_TTL, max_entries=32, show_spinner=False)
+def _load_ipa_stats(data_version: int, source: str, level: str, platform, date_range):
+    from ipa_sql import dimension_stats_sql, item_stats_sql
+
+    if source == "summary":
+        # submit dari proses lain yang belum sempat dilipat
+        apply_pending_summary()
+    with read_conn() as conn:
+        if source == "summary":
+            # dari ringkasan harian: O(hari x item) baris, bukan seluruh respons
+            if level == "items":
+                return summary.item_stats_summary(conn, platform, date_range)
+            return summary.dimension_stats_summary(conn, platform, date_range)
+
+        where, params = _response_filters(platform, date_range)
+        if level == "items":
+            return item_stats_sql(conn, where, params)
+        return dimension_stats_sql(conn, where, params)
+
+
+@st.cache_data(ttl=RESPONSES_CACHE_TTL, max_entries=32, show_spinner=False)
+def _compute_ipa_results(data_version: int, source: str, platform, date_range, n_rows: int, _df_flat):
     """
-    Garis diagonal 45°: y = x + b, melewati titik (x_cut, y_cut) -> b = y_cut - x_cut
+    Hasil IPA item + dimensi, di-cache lintas tab, rerun, dan sesi admin dengan scope sama.
+    Key = (data_version, sumber, platform, periode, jumlah baris); `_df_flat` tidak di-hash
+    (awalan _) karena isinya sudah ditentukan oleh key tersebut.
     """
-    b = y_cut - x_cut
-    x0, x1 = xlim
-    y0 = x0 + b
-    y1 = x1 + b
-
-    ymin, ymax = ylim
-
-    pts = []
-    if ymin <= y0 <= ymax:
-        pts.append((x0, y0))
-    if ymin <= y1 <= ymax:
-        pts.append((x1, y1))
-
-    xx = ymin - b
-    if x0 <= xx <= x1:
-        pts.append((xx, ymin))
-
-    xx = ymax - b
-    if x0 <= xx <= x1:
-        pts.append((xx, ymax))
-
-    pts = list(dict.fromkeys(pts))
-    if len(pts) >= 2:
-        pts_sorted = sorted(pts, key=lambda t: t[0])
-        pA, pB = pts_sorted[0], pts_sorted[-1]
-        # ✅ tanpa marker ujung
-        ax.plot([pA[0], pB[0]], [pA[1], pB[1]], linestyle="-", linewidth=2.2)
-    else:
-        ax.plot([x0, x1], [y0, y1], linestyle="-", linewidth=2.2)
+    from dashboard import compute_ipa_from_frame
+    from ipa_stats import classify_ipa
+
+    if source in ("sql", "summary"):
+        # min/max/mean dihitung di Postgres (filter platform & periode yang sama),
+        # jadi yang dikirim ke Python hanya ~35 (item) / 9 (dimensi) baris
+        return (
+            classify_ipa(_load_ipa_stats(data_version, source, "items", platform, date_range), "Item"),
+            classify_ipa(_load_ipa_stats(data_version, source, "dimensions", platform, date_range), "Dimension"),
+        )
+    return compute_ipa_from_frame(_df_flat)
 
 
-def _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=False):
+def compute_ipa_results(n_rows: int, platform=None, date_range=None):
     """
-    - Default (Versi 1): axvline & axhline full.
-    - Trimmed (Versi 2): hanya gambar:
-        * garis vertikal x=x_cut dari bawah sampai y_cut
-        * garis horizontal y=y_cut dari x_cut sampai kanan
-      ✅ tanpa marker lingkaran di ujung garis
+    Hasil IPA item + dimensi sesuai IPA_STATS_SOURCE: "sql" (agregasi dari tabel responses),
+    "summary" (dari responses_daily_summary) atau "python" (dari frame respons).
+    Frame seluruh respons hanya dimuat untuk sumber "python".
     """
-    x0, x1 = ax.get_xlim()
-    y0, y1 = ax.get_ylim()
-
-    if not trimmed_like_example:
-        ax.axvline(x_cut, linewidth=1.5)
-        ax.axhline(y_cut, linewidth=1.5)
-        return
-
-    # ✅ vertikal: dari bawah -> y_cut (tanpa marker)
-    ax.plot([x_cut, x_cut], [y0, y_cut], linewidth=2.2)
-    # ✅ horizontal: dari x_cut -> kanan (tanpa marker)
-    ax.plot([x_cut, x1], [y_cut, y_cut], linewidth=2.2)
-
-
-# =========================
-# QUADRANT LABELS (UPDATED - FONT AUTO SMALLER + NEVER CUT OFF)
-# =========================
-def _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=False):
-    """
-    - Mode biasa: label ditaruh pakai koordinat axes (4 kotak standar).
-    - Mode trimmed_like_example=True: label diposisikan berdasar koordinat DATA,
-      agar jatuh di region poligon yang benar ketika ada diagonal + garis kuadran trimmed.
-
-    Perubahan (sesuai permintaan user):
-    - Ukuran font label kuadran dibuat lebih kecil dari label item/dimensi.
-    - Ukuran font otomatis menyesuaikan "besar kuadran" (berdasarkan ukuran axes),
-      supaya tidak terpotong/keluar batas.
-    """
-
-    # --- AUTO FONT SIZE (lebih kecil dari item/dim labels) ---
-    # Item labels: 8, Dimension labels: 9 -> Quadrant harus < 8
-    # Kita pakai skala dari ukuran axes (dalam points), lalu clamp ke 5..7.
+    df_flat = load_all_responses(platform=platform, date_range=date_range) if IPA_STATS_SOURCE == "python" else None
     try:
-        fig = ax.figure
-        bbox_in = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())  # inches
-        w_pt = bbox_in.width * 72.0
-        h_pt = bbox_in.height * 72.0
-        min_pt = min(w_pt, h_pt)
-        q_font = int(max(2, min(4, round(0.03 * min_pt))))  # adaptif, tapi tetap kecil
-    except Exception:
-        q_font = 3  # fallback aman
-
-    # bbox diperkecil biar tidak melebar keluar kuadran
-    q_bbox = dict(boxstyle="round,pad=0.08", alpha=0.06, edgecolor="none")
-
-    def put_axes(xa, ya, text):
-        ax.text(
-            xa, ya, text,
-            transform=ax.transAxes,
-            ha="center", va="center",
-            fontsize=q_font, fontweight="normal",
-            alpha=0.75, clip_on=True,
-            bbox=q_bbox,
+        if IPA_STATS_SOURCE in ("sql", "summary"):
+            ensure_schema_once()
+        plat = (platform or "").strip() or None
+        return _compute_ipa_results(
+            get_data_version().current(), IPA_STATS_SOURCE, plat, date_range, n_rows, df_flat
         )
+    except Exception as e:
+        st.error("Gagal menghitung statistik IPA. Detail error:")
+        st.exception(e)
+        st.stop()
 
-    def put_data(x, y, text):
-        ax.text(
-            x, y, text,
-            ha="center", va="center",
-            fontsize=q_font, fontweight="normal",
-            alpha=0.75, clip_on=True,
-            bbox=q_bbox,
-        )
-
-    # --- Mode tanpa diagonal/trim (layout kotak biasa) ---
-    if not trimmed_like_example:
-        # Posisi dibuat sedikit lebih "ke tengah" agar aman dari tepi
-        put_axes(0.25, 0.78, "Q1\nConcentrate Here")
-        put_axes(0.75, 0.78, "Q2\nKeep Up the Good Work")
-        put_axes(0.25, 0.22, "Q3\nLow Priority")
-        put_axes(0.75, 0.22, "Q4\nPossible Overkill")
-        return
-
-    # --- Mode diagonal + trimmed ---
-    x0, x1 = ax.get_xlim()
-    y0, y1 = ax.get_ylim()
-
-    # diagonal: y = x + b melewati (x_cut, y_cut)
-    b = y_cut - x_cut
-
-    def y_diag(x):
-        return x + b
-
-    def clamp(v, lo, hi):
-        return max(lo, min(hi, v))
-
-    # Margin kecil supaya label tidak menempel garis & tidak keluar plot
-    mx = 0.03 * (x1 - x0)
-    my = 0.03 * (y1 - y0)
-
-    # Q1: kiri-atas, pastikan di atas diagonal
-    x_q1 = x0 + 0.30 * (x_cut - x0)
-    y_q1 = y_cut + 0.55 * (y1 - y_cut)
-    y_q1 = max(y_q1, y_diag(x_q1) + my)
-    x_q1 = clamp(x_q1, x0 + mx, x1 - mx)
-    y_q1 = clamp(y_q1, y0 + my, y1 - my)
 
-    # Q2: kanan, di atas y_cut tapi DI BAWAH diagonal
-    x_q2 = x_cut + 0.62 * (x1 - x_cut)
-    y_top_q2 = y_diag(x_q2) - my
-    if y_top_q2 <= y_cut + my:
-        y_q2 = y_cut + 0.12 * (y1 - y_cut)
-    else:
-        y_q2 = y_cut + 0.45 * (y_top_q2 - y_cut)
-    x_q2 = clamp(x_q2, x0 + mx, x1 - mx)
-    y_q2 = clamp(y_q2, y_cut + my, min(y_top_q2, y1 - my))
-
-    # Q3: kiri, di kiri x_cut dan DI BAWAH diagonal
-    x_q3 = x0 + 0.40 * (x_cut - x0)
-    y_top_q3 = y_diag(x_q3) - my
-    y_q3_cap = min(y_top_q3, y_cut - my) if (y_cut - my) > y0 else y_top_q3
-    y_q3 = y0 + 0.30 * (y_q3_cap - y0)
-    x_q3 = clamp(x_q3, x0 + mx, x1 - mx)
-    y_q3 = clamp(y_q3, y0 + my, y_top_q3)
-
-    # Q4: kanan-bawah, pastikan di bawah diagonal (dan biasanya di bawah y_cut)
-    x_q4 = x_cut + 0.65 * (x1 - x_cut)
-    y_q4 = y0 + 0.30 * (y_cut - y0)
-    y_q4 = min(y_q4, y_diag(x_q4) - my)
-    x_q4 = clamp(x_q4, x0 + mx, x1 - mx)
-    y_q4 = clamp(y_q4, y0 + my, y1 - my)
-
-    put_data(x_q1, y_q1, "Q1\nConcentrate Here")
-    put_data(x_q2, y_q2, "Q2\nKeep Up the Good Work")
-    put_data(x_q3, y_q3, "Q3\nLow Priority")
-    put_data(x_q4, y_q4, "Q4\nPossible Overkill")
+def show_ipa_plot(kind: str, stats, x_cut, y_cut, **options):
+    """Tampilkan plot IPA ("items" / "dimensions") dengan backend IPA_CHART_BACKEND."""
+    from dashboard import ipa_plot_png, ipa_vega_spec
 
-
-# =========================
-# IPA PLOTS
-# =========================
-def plot_ipa_items(stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
-    fig, ax = plt.subplots(figsize=(6.8, 4.8))
-    ax.scatter(stats["Performance_mean"], stats["Importance_mean"])
-    for _, r in stats.iterrows():
-        if pd.isna(r["Performance_mean"]) or pd.isna(r["Importance_mean"]):
-            continue
-        ax.text(r["Performance_mean"], r["Importance_mean"], r["Item"], fontsize=8)
-
-    x_vals = stats["Performance_mean"].dropna()
-    y_vals = stats["Importance_mean"].dropna()
-    if len(x_vals) and len(y_vals):
-        pad = 0.2
-        ax.set_xlim(float(x_vals.min()) - pad, float(x_vals.max()) + pad)
-        ax.set_ylim(float(y_vals.min()) - pad, float(y_vals.max()) + pad)
-
-    # garis pembagi kuadran (full vs trimmed)
-    _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
-
-    # diagonal
-    if show_iso_diagonal:
-        _plot_iso_diagonal(ax, x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), with_endpoints=False)
-
-    # ✅ tambah label kuadran
-    _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
-
-    ax.set_title(f"IPA Matrix (Data-centered) — Items{title_suffix}")
-    ax.set_xlabel("Performance (Mean)")
-    ax.set_ylabel("Importance (Mean)")
-    ax.set_aspect("equal", adjustable="box")
-    return fig
-
-
-def plot_ipa_dimensions(dim_stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
-    fig, ax = plt.subplots(figsize=(6.8, 4.8))
-    ax.scatter(dim_stats["Performance_mean"], dim_stats["Importance_mean"])
-    for _, r in dim_stats.iterrows():
-        if pd.isna(r["Performance_mean"]) or pd.isna(r["Importance_mean"]):
-            continue
-        ax.text(r["Performance_mean"], r["Importance_mean"], r["Dimension"], fontsize=9)
-
-    x_vals = dim_stats["Performance_mean"].dropna()
-    y_vals = dim_stats["Importance_mean"].dropna()
-    if len(x_vals) and len(y_vals):
-        pad = 0.2
-        ax.set_xlim(float(x_vals.min()) - pad, float(x_vals.max()) + pad)
-        ax.set_ylim(float(y_vals.min()) - pad, float(y_vals.max()) + pad)
-
-    # garis pembagi kuadran (full vs trimmed)
-    _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
-
-    # diagonal
-    if show_iso_diagonal:
-        _plot_iso_diagonal(ax, x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), with_endpoints=True)
-
-    # ✅ tambah label kuadran
-    _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
-
-    ax.set_title(f"IPA Matrix (Data-centered) — Dimensions{title_suffix}")
-    ax.set_xlabel("Performance (Mean)")
-    ax.set_ylabel("Importance (Mean)")
-    ax.set_aspect("equal", adjustable="box")
-    return fig
-
-
-def _round_df_numeric(df_in: pd.DataFrame, decimals: int = 2) -> pd.DataFrame:
-    df_out = df_in.copy()
-    num_cols = df_out.select_dtypes(include=["number"]).columns
-    if len(num_cols) > 0:
-        df_out[num_cols] = df_out[num_cols].round(decimals)
-    return df_out
+    if IPA_CHART_BACKEND == "vega-lite":
+        st.vega_lite_chart(ipa_vega_spec(kind, stats, x_cut, y_cut, **options))
+        return
+    st.image(ipa_plot_png(get_figure_cache(), kind, stats, x_cut, y_cut, **options), use_container_width=True)
 
 
 # =========================
@@ -1026,6 +985,16 @@ if "admin_username" not in st.session_state:
 if "admin_platform_scope" not in st.session_state:
     st.session_state.admin_platform_scope = None
 
+# link berisi ?draft=... (tab dimuat ulang / koneksi putus / sesi pindah replica):
+# lanjutkan dari draft, sekali per sesi (kode responden tidak pernah ada di URL)
+if DRAFTS_ENABLED and not st.session_state.get("_resume_checked", False):
+    st.session_state._resume_checked = True
+    st.query_params.pop("kode", None)  # link lama berisi kode responden: diabaikan
+    _resume_token = st.query_params.get("draft")
+    if _resume_token and _resume_token != st.session_state.get("draft_token"):
+        if not _resume_draft(_resume_token):
+            st.query_params.pop("draft", None)
+
 _run_scroll_to_top_if_requested()
 _ensure_default_radio_state()
 
@@ -1101,6 +1070,9 @@ def render_home():
     if st.session_state.get("flash_success"):
         st.success(st.session_state["flash_success"])
         del st.session_state["flash_success"]
+    if st.session_state.get("flash_info"):
+        st.info(st.session_state["flash_info"])
+        del st.session_state["flash_info"]
 
     st.write("")
 
@@ -1111,7 +1083,14 @@ def render_home():
         hero_path = os.path.join(os.path.dirname(__file__), HERO_IMG_FILE)
 
         if os.path.exists(hero_path):
-            st.image(hero_path, width=650)
+            variants = get_hero_variants(hero_path, os.path.getmtime(hero_path))
+            if variants and st.get_option("server.enableStaticServing"):
+                # browser memilih WebP/PNG 1x/2x sendiri, langsung dari app/static (tanpa lewat websocket)
+                st.markdown(picture_html(variants, alt="TATTFQ"), unsafe_allow_html=True)
+            elif variants:
+                st.image(os.path.join(STATIC_DIR, variants[(2, "webp")]), width=650)
+            else:
+                st.image(hero_path, width=650)
         else:
             st.warning(
                 f"Gambar hero tidak ditemukan: {HERO_IMG_FILE}. "
@@ -1132,9 +1111,19 @@ def render_home():
         if st.button("Mulai Mengisi Kuesioner", type="primary"):
             st.session_state.view = "respondent"
             _new_respondent_session()
+            if DRAFTS_ENABLED:
+                st.query_params["draft"] = st.session_state.draft_token
             _request_scroll_to_top()
             st.rerun()
 
+        if DRAFTS_ENABLED:
+            with st.expander("Lanjutkan kuesioner yang belum selesai"):
+                resume_token = st.text_input("Kode lanjutkan", placeholder="DRAFT-XXXXXXXXXXXXXXXX")
+                if st.button("Lanjutkan"):
+                    if _resume_draft(resume_token):
+                        st.rerun()
+                    st.warning("Draft dengan kode tersebut tidak ditemukan atau sudah kedaluwarsa.")
+
         st.write("")
 
         st.markdown(
@@ -1180,6 +1169,12 @@ def render_respondent():
     with c3:
         st.markdown("✅ **Importance**" if step == 2 else "⏳ **Importance**")
 
+    if DRAFTS_ENABLED:
+        st.caption(
+            f"Kode lanjutkan: **{st.session_state.draft_token}** — progres tersimpan otomatis setiap pindah tahap. "
+            "Simpan kode ini (jangan dibagikan) untuk melanjutkan dari halaman utama bila koneksi terputus."
+        )
+
     st.divider()
 
     if step == 0:
@@ -1245,6 +1240,7 @@ def render_respondent():
             "telemedicine_frequency": tele_freq,
             "telemedicine_last_use": tele_last,
         }
+        _autosave_draft()
 
         missing = []
         if not gender:
@@ -1281,35 +1277,40 @@ def render_respondent():
         st.header("Tahap 2 — Performance (Tingkat Persetujuan)")
         st.info("Pada bagian ini, Anda diminta untuk memberikan penilaian berupa tingkat kesetujuan terhadap setiap pernyataan (item kuesioner). Penilaian tingkat kesetujuan mencerminkan sejauh mana pernyataan dalam kuesioner sesuai dengan kondisi nyata yang Anda alami.")
 
-        for dim, items in DIMS.items():
-            st.subheader(dim)
-            for code, text_ in items:
-                with st.container(border=True):
-                    st.markdown(f"**{code}.** {text_}")
-                    val = st.radio(
-                        f"{code} — Performance",
-                        options=list(LIKERT_PERF.keys()),
-                        format_func=lambda x: f"{x} — {LIKERT_PERF[x]}",
-                        horizontal=True,
-                        key=f"perf_{code}",
-                    )
-                    st.session_state.perf[code] = int(val)
-            st.divider()
-
-        left, right = st.columns(2)
-        with left:
-            if st.button("⬅ Kembali ke Profil"):
-                st.session_state.perf = _sync_dict_from_widget("perf")
-                _enter_step(0)
-                _request_scroll_to_top()
-                st.rerun()
-        with right:
-            if st.button("Lanjut ke Tahap 3 (Importance) ➜", type="primary"):
-                st.session_state.perf = _sync_dict_from_widget("perf")
-                _hydrate_widget_state_from_answers("imp", st.session_state.get("imp", {}), force=True)
-                _enter_step(2)
-                _request_scroll_to_top()
-                st.rerun()
+        # 35 radio dalam satu form: klik jawaban tidak memicu rerun,
+        # semua jawaban dikirim sekali lewat tombol di bawah
+        with st.form("perf_form", border=False):
+            for dim, items in DIMS.items():
+                st.subheader(dim)
+                for code, text_ in items:
+                    with st.container(border=True):
+                        st.markdown(f"**{code}.** {text_}")
+                        st.radio(
+                            f"{code} — Performance",
+                            options=list(LIKERT_PERF.keys()),
+                            format_func=lambda x: f"{x} — {LIKERT_PERF[x]}",
+                            horizontal=True,
+                            key=f"perf_{code}",
+                        )
+                st.divider()
+
+            left, right = st.columns(2)
+            with left:
+                back = st.form_submit_button("⬅ Kembali ke Profil")
+            with right:
+                forward = st.form_submit_button("Lanjut ke Tahap 3 (Importance) ➜", type="primary")
+
+        if back:
+            st.session_state.perf = _sync_dict_from_widget("perf")
+            _enter_step(0)
+            _request_scroll_to_top()
+            st.rerun()
+        if forward:
+            st.session_state.perf = _sync_dict_from_widget("perf")
+            _hydrate_widget_state_from_answers("imp", st.session_state.get("imp", {}), force=True)
+            _enter_step(2)
+            _request_scroll_to_top()
+            st.rerun()
 
     else:
         if st.session_state.get("_enter_step", False):
@@ -1320,37 +1321,41 @@ def render_respondent():
         st.header("Tahap 3 — Importance (Tingkat Kepentingan)")
         st.info("Pada bagian ini, Anda diminta untuk menilai seberapa penting pernyataan (item kuesioner) ini untuk mendukung tugas Anda dalam layanan kesehatan jarak jauh.")
 
-        for dim, items in DIMS.items():
-            st.subheader(dim)
-            for code, text_ in items:
-                with st.container(border=True):
-                    st.markdown(f"**{code}.** {text_}")
-                    val = st.radio(
-                        f"{code} — Importance",
-                        options=list(LIKERT_IMP.keys()),
-                        format_func=lambda x: f"{x} — {LIKERT_IMP[x]}",
-                        horizontal=True,
-                        key=f"imp_{code}",
-                    )
-                    st.session_state.imp[code] = int(val)
-            st.divider()
-
-        left, right = st.columns(2)
-        with left:
-            if st.button("⬅ Kembali ke Performance"):
-                st.session_state.imp = _sync_dict_from_widget("imp")
-                _hydrate_widget_state_from_answers("perf", st.session_state.get("perf", {}), force=True)
-                _enter_step(1)
-                _request_scroll_to_top()
-                st.rerun()
-
-        with right:
-            submit_disabled = st.session_state.get("confirm_submit", False)
-            if st.button("✅ Submit", type="primary", disabled=submit_disabled):
-                st.session_state.imp = _sync_dict_from_widget("imp")
-                _request_submit_confirmation(meta={})
-                _request_scroll_to_top()
-                st.rerun()
+        # selama dialog konfirmasi tampil, jawaban dikunci: yang disubmit = yang terakhir dikirim form
+        confirming = st.session_state.get("confirm_submit", False)
+        with st.form("imp_form", border=False):
+            for dim, items in DIMS.items():
+                st.subheader(dim)
+                for code, text_ in items:
+                    with st.container(border=True):
+                        st.markdown(f"**{code}.** {text_}")
+                        st.radio(
+                            f"{code} — Importance",
+                            options=list(LIKERT_IMP.keys()),
+                            format_func=lambda x: f"{x} — {LIKERT_IMP[x]}",
+                            horizontal=True,
+                            key=f"imp_{code}",
+                            disabled=confirming,
+                        )
+                st.divider()
+
+            left, right = st.columns(2)
+            with left:
+                back = st.form_submit_button("⬅ Kembali ke Performance", disabled=confirming)
+            with right:
+                submit = st.form_submit_button("✅ Submit", type="primary", disabled=confirming)
+
+        if back:
+            st.session_state.imp = _sync_dict_from_widget("imp")
+            _hydrate_widget_state_from_answers("perf", st.session_state.get("perf", {}), force=True)
+            _enter_step(1)
+            _request_scroll_to_top()
+            st.rerun()
+        if submit:
+            st.session_state.imp = _sync_dict_from_widget("imp")
+            _request_submit_confirmation(meta={})
+            _request_scroll_to_top()
+            st.rerun()
 
         if st.session_state.get("confirm_submit", False):
             st.warning(
@@ -1404,6 +1409,10 @@ def render_admin_login():
 
 
 def render_admin_dashboard():
+    from charts import figure_png, profile_barh
+    from dashboard import duration_seconds, round_df_numeric, side_by_side_table, value_counts_frame
+    from ipa_stats import COUNT_COLS, QUAD_ORDER
+
     st.title("Admin Dashboard — TATTFQ")
 
     scope_platform = st.session_state.get("admin_platform_scope", None)
@@ -1528,20 +1537,55 @@ def render_admin_dashboard():
         st.divider()
 
     # =========================
-    # LOAD + FILTER PLATFORM + FILTER PERIODE
+    # STATUS POOL KONEKSI DB (hanya admin_general)
     # =========================
-    df_all = load_all_responses()
-    df = df_all.copy()
+    if can_delete_all:
+        with st.expander("Status koneksi database"):
+            read_replica, read_primary = get_read_engines()
+            pools = [("Tulis", engine), ("Baca", read_primary)]
+            if read_replica is not None:
+                pools.append(("Baca (replica)", read_replica))
+            for pool_label, pool_engine in pools:
+                ps = pool_stats(pool_engine)
+                st.markdown(f"**Pool {pool_label}**")
+                p1, p2, p3, p4 = st.columns(4)
+                with p1:
+                    st.metric("Koneksi dipakai", f"{ps['checked_out']} / {ps['pool_size']}")
+                with p2:
+                    st.metric("Overflow (puncak)", f"{ps['overflow']} ({ps.get('peak_overflow', 0)})")
+                with p3:
+                    st.metric("Tunggu checkout rata-rata", f"{ps.get('avg_wait_ms', 0.0):.1f} ms")
+                with p4:
+                    st.metric("Tunggu checkout maks", f"{ps.get('max_wait_ms', 0.0):.1f} ms")
+                st.caption(
+                    f"Checkout: {ps.get('checkouts', 0)} — koneksi overflow dibuka: {ps.get('overflow_connects', 0)}"
+                    f" — timeout: {ps.get('timeouts', 0)}"
+                )
 
-    # Filter platform sesuai role admin
-    if scope_platform:
-        if "meta_platform" in df.columns:
-            df = df[df["meta_platform"].fillna("").astype(str).str.strip() == scope_platform].copy()
-        else:
-            df = df.iloc[0:0].copy()
+            if SUBMIT_MODE == "async":
+                qs = get_submission_writer().stats()
+                q1, q2, q3 = st.columns([1, 1, 2])
+                with q1:
+                    st.metric("Antrian submit", qs["pending"])
+                with q2:
+                    st.metric("Submit gagal", qs["failed"])
+                with q3:
+                    if qs["failed"] and st.button("Coba kirim ulang yang gagal"):
+                        get_submission_writer().retry_failed()
+                        st.rerun()
+                if not qs["alive"]:
+                    st.error("Worker submit tidak berjalan; restart aplikasi.")
+                if qs["last_error"]:
+                    st.caption(f"Error terakhir: {qs['last_error']}")
+
+            fc = get_figure_cache().stats()
+            st.caption(
+                f"Cache plot IPA: {fc['entries']} gambar ({fc['bytes'] / 1024:.0f} KB)"
+                f" — hit: {fc['hits']} — render: {fc['misses']}"
+            )
 
     # =========================
-    # FILTER PERIODE
+    # FILTER PERIODE + LOAD (platform & periode difilter di SQL)
     # =========================
     st.subheader("Filter Periode Ringkasan")
     st.caption("Filter ini mempengaruhi semua tab (Ringkasan & IPA, Raw Data, Kuadran, Profil & Durasi).")
@@ -1553,14 +1597,7 @@ def render_admin_dashboard():
     if "admin_filter_end" not in st.session_state:
         st.session_state.admin_filter_end = None
 
-    effective = pd.to_datetime(df.get("effective_time_local", pd.Series(dtype="object")), errors="coerce")
-    effective_nonnull = effective.dropna()
-
-    default_start = None
-    default_end = None
-    if len(effective_nonnull) > 0:
-        default_start = effective_nonnull.min().date()
-        default_end = effective_nonnull.max().date()
+    default_start, default_end = load_submitted_date_bounds(platform=scope_platform)
 
     cF1, cF2, cF3 = st.columns([1.2, 1, 1])
     with cF1:
@@ -1574,6 +1611,7 @@ def render_admin_dashboard():
 
     start_date = None
     end_date = None
+    date_range = None
 
     if mode == "Filter periode":
         with cF2:
@@ -1592,302 +1630,277 @@ def render_admin_dashboard():
 
         if start_date and end_date and start_date > end_date:
             st.error("Rentang tanggal tidak valid: 'Dari tanggal' tidak boleh > 'Sampai tanggal'.")
-        else:
-            if start_date and end_date:
-                eff = pd.to_datetime(df.get("effective_time_local", pd.Series(dtype="object")), errors="coerce")
-                df = df.copy()
-                df["_eff_date"] = eff.dt.date
-                df = df[(df["_eff_date"] >= start_date) & (df["_eff_date"] <= end_date)].copy()
-                df.drop(columns=["_eff_date"], inplace=True, errors="ignore")
+        elif start_date and end_date:
+            date_range = (start_date, end_date)
     else:
         st.session_state.admin_filter_start = None
         st.session_state.admin_filter_end = None
 
+    # Filter platform (sesuai role admin) & periode dilakukan di SQL
+    n_rows = count_responses(platform=scope_platform, date_range=date_range)
+
     if mode == "Filter periode" and start_date and end_date and (start_date <= end_date):
-        st.success(f"Total respon (setelah filter): {len(df)}  — Periode: {start_date} s/d {end_date}")
+        st.success(f"Total respon (setelah filter): {n_rows}  — Periode: {start_date} s/d {end_date}")
     else:
-        st.success(f"Total respon tersimpan: {len(df)}")
+        st.success(f"Total respon tersimpan: {n_rows}")
 
-    tab1, tab2, tab3, tab4 = st.tabs(["Ringkasan & IPA", "Raw Data", "Kuadran", "Profil & Durasi"])
+    # Hanya tab yang terbuka yang dirender (pindah tab = rerun). Frame seluruh respons
+    # hanya dimuat oleh tab yang butuh baris mentah (Raw Data, Profil & Durasi) atau
+    # IPA_STATS_SOURCE = "python"; Ringkasan & Kuadran cukup agregasi di Postgres.
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["Ringkasan & IPA", "Raw Data", "Kuadran", "Profil & Durasi"], key="admin_tab", on_change="rerun"
+    )
 
     with tab1:
-        if len(df) == 0:
-            st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
-        else:
-            stats, x_cut, y_cut, quad_v1_items, quad_v2_items = compute_stats_and_ipa(df)
-            dim_stats, dx_cut, dy_cut, quad_v1_dims, quad_v2_dims = compute_dimension_stats_and_ipa(df)
+        if tab1.open:
+            if n_rows == 0:
+                st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
+            else:
+                item_res, dim_res = compute_ipa_results(n_rows, scope_platform, date_range)
+                stats, x_cut, y_cut, quad_v1_items, quad_v2_items = item_res
+                dim_stats, dx_cut, dy_cut, quad_v1_dims, quad_v2_dims = dim_res
+
+                st.subheader("Cut-off (Data-centered) — Items")
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.metric("Performance cut-off (mean global)", f"{x_cut:.3f}")
+                with c2:
+                    st.metric("Importance cut-off (mean global)", f"{y_cut:.3f}")
+
+                st.subheader("Statistik per item (min/max/mean) + GAP(P-I) + Kuadran (Versi 1 & 2)")
+                stats_show = round_df_numeric(stats.drop(columns=list(COUNT_COLS), errors="ignore"), 2)
+
+                ordered_cols = [
+                    "Item",
+                    "Performance_min", "Performance_max", "Performance_mean",
+                    "Importance_min", "Importance_max", "Importance_mean",
+                    "Gap_mean(P-I)",
+                    "Quadrant_v1", "Quadrant_v2",
+                ]
+                ordered_cols = [c for c in ordered_cols if c in stats_show.columns]
+                stats_show = stats_show.reindex(
+                    columns=ordered_cols + [c for c in stats_show.columns if c not in ordered_cols]
+                )
 
-            st.subheader("Cut-off (Data-centered) — Items")
-            c1, c2 = st.columns(2)
-            with c1:
-                st.metric("Performance cut-off (mean global)", f"{x_cut:.3f}")
-            with c2:
-                st.metric("Importance cut-off (mean global)", f"{y_cut:.3f}")
-
-            st.subheader("Statistik per item (min/max/mean) + GAP(P-I) + Kuadran (Versi 1 & 2)")
-            stats_show = _round_df_numeric(stats, 2)
-
-            ordered_cols = [
-                "Item",
-                "Performance_min", "Performance_max", "Performance_mean",
-                "Importance_min", "Importance_max", "Importance_mean",
-                "Gap_mean(P-I)",
-                "Quadrant_v1", "Quadrant_v2",
-            ]
-            ordered_cols = [c for c in ordered_cols if c in stats_show.columns]
-            stats_show = stats_show.reindex(
-                columns=ordered_cols + [c for c in stats_show.columns if c not in ordered_cols]
-            )
+                st.dataframe(
+                    stats_show.sort_values("Gap_mean(P-I)", ascending=True),
+                    use_container_width=True
+                )
 
-            st.dataframe(
-                stats_show.sort_values("Gap_mean(P-I)", ascending=True),
-                use_container_width=True
-            )
+                st.divider()
 
-            st.divider()
+                st.subheader("Plot IPA (Data-centered) — Items (Versi 1: Tanpa diagonal)")
+                show_ipa_plot(
+                    "items", stats, x_cut, y_cut,
+                    show_iso_diagonal=False,
+                    trimmed_quadrant_lines=False,
+                    title_suffix=" (Tanpa diagonal)"
+                )
 
-            st.subheader("Plot IPA (Data-centered) — Items (Versi 1: Tanpa diagonal)")
-            fig1 = plot_ipa_items(
-                stats, x_cut, y_cut,
-                show_iso_diagonal=False,
-                trimmed_quadrant_lines=False,
-                title_suffix=" (Tanpa diagonal)"
-            )
-            st.pyplot(fig1, use_container_width=True)
-
-            st.subheader("Plot IPA (Data-centered) — Items (Versi 2: Dengan diagonal 45°)")
-            fig2 = plot_ipa_items(
-                stats, x_cut, y_cut,
-                show_iso_diagonal=True,
-                trimmed_quadrant_lines=True,
-                title_suffix=" (Dengan diagonal)"
-            )
-            st.pyplot(fig2, use_container_width=True)
+                st.subheader("Plot IPA (Data-centered) — Items (Versi 2: Dengan diagonal 45°)")
+                show_ipa_plot(
+                    "items", stats, x_cut, y_cut,
+                    show_iso_diagonal=True,
+                    trimmed_quadrant_lines=True,
+                    title_suffix=" (Dengan diagonal)"
+                )
 
-            st.divider()
+                st.divider()
+
+                st.subheader("Cut-off (Data-centered) — Dimensions")
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.metric("Performance cut-off (mean dim)", f"{dx_cut:.3f}")
+                with c2:
+                    st.metric("Importance cut-off (mean dim)", f"{dy_cut:.3f}")
+
+                st.subheader("Statistik per dimensi (min/max/mean) + GAP(P-I) + Kuadran (Versi 1 & 2)")
+                dim_show = round_df_numeric(dim_stats.drop(columns=list(COUNT_COLS), errors="ignore"), 2)
+                ordered_cols = [
+                    "Dimension", "Dimension_name",
+                    "Performance_min", "Performance_max", "Performance_mean",
+                    "Importance_min", "Importance_max", "Importance_mean",
+                    "Gap_mean(P-I)",
+                    "Quadrant_v1", "Quadrant_v2",
+                ]
+                if "n_items" in dim_show.columns:
+                    ordered_cols.insert(2, "n_items")
+
+                ordered_cols = [c for c in ordered_cols if c in dim_show.columns]
+                dim_show = dim_show.reindex(columns=ordered_cols + [c for c in dim_show.columns if c not in ordered_cols])
+
+                st.dataframe(dim_show.sort_values("Gap_mean(P-I)", ascending=True), use_container_width=True)
+
+                st.subheader("Plot IPA (Data-centered) — Dimensions (Versi 1: Tanpa diagonal)")
+                show_ipa_plot(
+                    "dimensions", dim_stats, dx_cut, dy_cut,
+                    show_iso_diagonal=False,
+                    trimmed_quadrant_lines=False,
+                    title_suffix=" (Tanpa diagonal)"
+                )
 
-            st.subheader("Cut-off (Data-centered) — Dimensions")
-            c1, c2 = st.columns(2)
-            with c1:
-                st.metric("Performance cut-off (mean dim)", f"{dx_cut:.3f}")
-            with c2:
-                st.metric("Importance cut-off (mean dim)", f"{dy_cut:.3f}")
-
-            st.subheader("Statistik per dimensi (min/max/mean) + GAP(P-I) + Kuadran (Versi 1 & 2)")
-            dim_show = _round_df_numeric(dim_stats, 2)
-            ordered_cols = [
-                "Dimension", "Dimension_name",
-                "Performance_min", "Performance_max", "Performance_mean",
-                "Importance_min", "Importance_max", "Importance_mean",
-                "Gap_mean(P-I)",
-                "Quadrant_v1", "Quadrant_v2",
-            ]
-            if "n_items" in dim_show.columns:
-                ordered_cols.insert(2, "n_items")
-
-            ordered_cols = [c for c in ordered_cols if c in dim_show.columns]
-            dim_show = dim_show.reindex(columns=ordered_cols + [c for c in dim_show.columns if c not in ordered_cols])
-
-            st.dataframe(dim_show.sort_values("Gap_mean(P-I)", ascending=True), use_container_width=True)
-
-            st.subheader("Plot IPA (Data-centered) — Dimensions (Versi 1: Tanpa diagonal)")
-            figd1 = plot_ipa_dimensions(
-                dim_stats, dx_cut, dy_cut,
-                show_iso_diagonal=False,
-                trimmed_quadrant_lines=False,
-                title_suffix=" (Tanpa diagonal)"
-            )
-            st.pyplot(figd1, use_container_width=True)
-
-            st.subheader("Plot IPA (Data-centered) — Dimensions (Versi 2: Dengan diagonal 45°)")
-            figd2 = plot_ipa_dimensions(
-                dim_stats, dx_cut, dy_cut,
-                show_iso_diagonal=True,
-                trimmed_quadrant_lines=True,
-                title_suffix=" (Dengan diagonal)"
-            )
-            st.pyplot(figd2, use_container_width=True)
+                st.subheader("Plot IPA (Data-centered) — Dimensions (Versi 2: Dengan diagonal 45°)")
+                show_ipa_plot(
+                    "dimensions", dim_stats, dx_cut, dy_cut,
+                    show_iso_diagonal=True,
+                    trimmed_quadrant_lines=True,
+                    title_suffix=" (Dengan diagonal)"
+                )
 
     with tab2:
-        st.subheader("Raw responses")
-        if len(df) == 0:
-            st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
-            st.dataframe(df, use_container_width=True)
-        else:
-            show = df.copy()
-
-            helper_time_cols = [
-                "created_at_utc",
-                "created_at_local",
-                "meta_started_at_utc_dt",
-                "meta_submitted_at_utc_dt",
-                "meta_started_at_local",
-                "meta_submitted_at_local",
-                "effective_time_local",
-            ]
-            show = show.drop(columns=[c for c in helper_time_cols if c in show.columns], errors="ignore")
-
-            rename_map = {}
-            for c in show.columns:
-                if c.startswith("meta_"):
-                    rename_map[c] = c.replace("meta_", "", 1)
-            show = show.rename(columns=rename_map)
-
-            show = show.rename(
-                columns={
-                    "started_at_utc": "started",
-                    "submitted_at_utc": "submitted",
-                    "duration_sec": "duration",
-                }
-            )
+        if tab2.open:
+            st.subheader("Raw responses")
+            df = load_all_responses(platform=scope_platform, date_range=date_range)
+            if len(df) == 0:
+                st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
+                st.dataframe(df, use_container_width=True)
+            else:
+                show = df.copy()
+
+                helper_time_cols = [
+                    "created_at_utc",
+                    "created_at_local",
+                    "meta_started_at_utc_dt",
+                    "meta_submitted_at_utc_dt",
+                    "meta_started_at_local",
+                    "meta_submitted_at_local",
+                    "effective_time_local",
+                ]
+                show = show.drop(columns=[c for c in helper_time_cols if c in show.columns], errors="ignore")
+
+                rename_map = {}
+                for c in show.columns:
+                    if c.startswith("meta_"):
+                        rename_map[c] = c.replace("meta_", "", 1)
+                show = show.rename(columns=rename_map)
+
+                show = show.rename(
+                    columns={
+                        "started_at_utc": "started",
+                        "submitted_at_utc": "submitted",
+                        "duration_sec": "duration",
+                    }
+                )
 
-            preferred_front = ["respondent_code", "started", "submitted", "duration"]
-            preferred_profile = [
-                "age",
-                "gender",
-                "platform",
-                "specialty",
-                "telemedicine_duration",
-                "telemedicine_frequency",
-                "telemedicine_last_use",
-            ]
+                preferred_front = ["respondent_code", "started", "submitted", "duration"]
+                preferred_profile = [
+                    "age",
+                    "gender",
+                    "platform",
+                    "specialty",
+                    "telemedicine_duration",
+                    "telemedicine_frequency",
+                    "telemedicine_last_use",
+                ]
 
-            front = [c for c in preferred_front if c in show.columns]
-            prof = [c for c in preferred_profile if c in show.columns]
-            rest = [c for c in show.columns if c not in (front + prof)]
+                front = [c for c in preferred_front if c in show.columns]
+                prof = [c for c in preferred_profile if c in show.columns]
+                rest = [c for c in show.columns if c not in (front + prof)]
 
-            show = show[front + prof + rest]
+                show = show[front + prof + rest]
 
-            sort_col = "submitted" if "submitted" in show.columns else ("created_at" if "created_at" in show.columns else None)
-            if sort_col:
-                show = show.sort_values(sort_col, ascending=False)
+                sort_col = "submitted" if "submitted" in show.columns else ("created_at" if "created_at" in show.columns else None)
+                if sort_col:
+                    show = show.sort_values(sort_col, ascending=False)
 
-            st.dataframe(show, use_container_width=True)
+                st.dataframe(show, use_container_width=True)
 
     with tab3:
-        if len(df) == 0:
-            st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
-        else:
-            stats, _, _, quad_v1_items, quad_v2_items = compute_stats_and_ipa(df)
-            dim_stats, _, _, quad_v1_dims, quad_v2_dims = compute_dimension_stats_and_ipa(df)
-
-            quad_order = [
-                "I - Concentrate Here",
-                "II - Keep Up the Good Work",
-                "III - Low Priority",
-                "IV - Possible Overkill",
-            ]
-
-            def _side_by_side_table(left_list, right_list, left_fmt, right_fmt):
-                L = [left_fmt(x) for x in (left_list or [])]
-                R = [right_fmt(x) for x in (right_list or [])]
-                n = max(len(L), len(R), 1)
-                if len(L) < n:
-                    L += [""] * (n - len(L))
-                if len(R) < n:
-                    R += [""] * (n - len(R))
-                return pd.DataFrame({"Versi 1": L, "Versi 2": R})
-
-            st.subheader("Daftar item per kuadran (Versi 1 vs Versi 2)")
-            for q in quad_order:
-                st.markdown(f"### {q}")
-                left_items = quad_v1_items.get(q, [])
-                right_items = quad_v2_items.get(q, [])
-
-                df_cmp = _side_by_side_table(
-                    left_items,
-                    right_items,
-                    left_fmt=lambda code: f"{code}: {ITEM_TEXT.get(code, '')}",
-                    right_fmt=lambda code: f"{code}: {ITEM_TEXT.get(code, '')}",
-                )
-                st.dataframe(df_cmp, use_container_width=True, hide_index=True)
-
-            st.divider()
-
-            st.subheader("Daftar dimensi per kuadran (Versi 1 vs Versi 2)")
-            for q in quad_order:
-                st.markdown(f"### {q}")
-                left_dims = quad_v1_dims.get(q, [])
-                right_dims = quad_v2_dims.get(q, [])
+        if tab3.open:
+            if n_rows == 0:
+                st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
+            else:
+                item_res, dim_res = compute_ipa_results(n_rows, scope_platform, date_range)
+                stats, _, _, quad_v1_items, quad_v2_items = item_res
+                dim_stats, _, _, quad_v1_dims, quad_v2_dims = dim_res
+
+                st.subheader("Daftar item per kuadran (Versi 1 vs Versi 2)")
+                for q in QUAD_ORDER:
+                    st.markdown(f"### {q}")
+                    left_items = quad_v1_items.get(q, [])
+                    right_items = quad_v2_items.get(q, [])
+
+                    df_cmp = side_by_side_table(
+                        left_items,
+                        right_items,
+                        left_fmt=lambda code: f"{code}: {ITEM_TEXT.get(code, '')}",
+                        right_fmt=lambda code: f"{code}: {ITEM_TEXT.get(code, '')}",
+                    )
+                    st.dataframe(df_cmp, use_container_width=True, hide_index=True)
 
-                df_cmp = _side_by_side_table(
-                    left_dims,
-                    right_dims,
-                    left_fmt=lambda abbr: f"{abbr}: {DIM_NAME_BY_ABBR.get(abbr, '')}",
-                    right_fmt=lambda abbr: f"{abbr}: {DIM_NAME_BY_ABBR.get(abbr, '')}",
-                )
-                st.dataframe(df_cmp, use_container_width=True, hide_index=True)
+                st.divider()
 
-    with tab4:
-        if len(df) == 0:
-            st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
-        else:
-            st.subheader("Ringkasan Durasi Pengisian (detik)")
-            dur = pd.to_numeric(df.get("meta_duration_sec", pd.Series(dtype="float")), errors="coerce")
+                st.subheader("Daftar dimensi per kuadran (Versi 1 vs Versi 2)")
+                for q in QUAD_ORDER:
+                    st.markdown(f"### {q}")
+                    left_dims = quad_v1_dims.get(q, [])
+                    right_dims = quad_v2_dims.get(q, [])
 
-            c1, c2, c3 = st.columns(3)
-            with c1:
-                st.metric("Min", f"{dur.min(skipna=True):.2f}" if dur.notna().any() else "-")
-            with c2:
-                st.metric("Max", f"{dur.max(skipna=True):.2f}" if dur.notna().any() else "-")
-            with c3:
-                st.metric("Rata-rata", f"{dur.mean(skipna=True):.2f}" if dur.notna().any() else "-")
-
-            st.divider()
-            st.subheader("Ringkasan Profil Responden")
-
-            def _value_counts_df(colname: str) -> pd.DataFrame:
-                s = df.get(colname, pd.Series(dtype="object")).fillna("").astype(str)
-                s = s[s.str.strip() != ""]
-                if s.empty:
-                    return pd.DataFrame(columns=["Value", "Count"])
-                out = s.value_counts().reset_index()
-                out.columns = ["Value", "Count"]
-                return out
-
-            def _profile_barh(title: str, colname: str, key_prefix: str):
-                counts = _value_counts_df(colname)
-                st.markdown(f"**{title}**")
-
-                if counts.empty:
-                    st.caption("Tidak ada data.")
-                    return
-
-                left, right = st.columns([4.2, 1.2], vertical_alignment="center")
-
-                with left:
-                    fig, ax = plt.subplots(figsize=(6.5, 3.2))
-                    counts_plot = counts.sort_values("Count", ascending=True)
-                    ax.barh(counts_plot["Value"], counts_plot["Count"])
-                    ax.set_xlabel("Count")
-                    ax.set_ylabel("")
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-
-                with right:
-                    csv_bytes = counts.to_csv(index=False).encode("utf-8")
-                    st.download_button(
-                        label="⬇️ Download",
-                        data=csv_bytes,
-                        file_name=f"{key_prefix}_counts.csv",
-                        mime="text/csv",
-                        use_container_width=True,
+                    df_cmp = side_by_side_table(
+                        left_dims,
+                        right_dims,
+                        left_fmt=lambda abbr: f"{abbr}: {DIM_NAME_BY_ABBR.get(abbr, '')}",
+                        right_fmt=lambda abbr: f"{abbr}: {DIM_NAME_BY_ABBR.get(abbr, '')}",
                     )
+                    st.dataframe(df_cmp, use_container_width=True, hide_index=True)
 
-            cols = [
-                ("Jenis kelamin", "meta_gender", "gender"),
-                ("Usia", "meta_age", "age"),
-                ("Bidang spesialisasi", "meta_specialty", "specialty"),
-                ("Platform yang dinilai", "meta_platform", "platform"),
-                ("Lama menggunakan telemedicine", "meta_telemedicine_duration", "tele_dur"),
-                ("Frekuensi telemedicine", "meta_telemedicine_frequency", "tele_freq"),
-                ("Terakhir menggunakan telemedicine", "meta_telemedicine_last_use", "tele_last"),
-            ]
-
-            grid = st.columns(2)
-            for idx, (title, colname, keyp) in enumerate(cols):
-                with grid[idx % 2]:
-                    _profile_barh(title, colname, keyp)
+    with tab4:
+        if tab4.open:
+            df = load_all_responses(platform=scope_platform, date_range=date_range)
+            if len(df) == 0:
+                st.info("Belum ada data (atau tidak ada data pada periode terpilih).")
+            else:
+                st.subheader("Ringkasan Durasi Pengisian (detik)")
+                dur = duration_seconds(df)
+
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    st.metric("Min", f"{dur.min(skipna=True):.2f}" if dur.notna().any() else "-")
+                with c2:
+                    st.metric("Max", f"{dur.max(skipna=True):.2f}" if dur.notna().any() else "-")
+                with c3:
+                    st.metric("Rata-rata", f"{dur.mean(skipna=True):.2f}" if dur.notna().any() else "-")
+
+                st.divider()
+                st.subheader("Ringkasan Profil Responden")
+
+                def _profile_barh(title: str, colname: str, key_prefix: str):
+                    counts = value_counts_frame(df, colname)
+                    st.markdown(f"**{title}**")
+
+                    if counts.empty:
+                        st.caption("Tidak ada data.")
+                        return
+
+                    left, right = st.columns([4.2, 1.2], vertical_alignment="center")
+
+                    with left:
+                        st.image(figure_png(profile_barh(counts)), use_container_width=True)
+
+                    with right:
+                        csv_bytes = counts.to_csv(index=False).encode("utf-8")
+                        st.download_button(
+                            label="⬇️ Download",
+                            data=csv_bytes,
+                            file_name=f"{key_prefix}_counts.csv",
+                            mime="text/csv",
+                            use_container_width=True,
+                        )
+
+                cols = [
+                    ("Jenis kelamin", "meta_gender", "gender"),
+                    ("Usia", "meta_age", "age"),
+                    ("Bidang spesialisasi", "meta_specialty", "specialty"),
+                    ("Platform yang dinilai", "meta_platform", "platform"),
+                    ("Lama menggunakan telemedicine", "meta_telemedicine_duration", "tele_dur"),
+                    ("Frekuensi telemedicine", "meta_telemedicine_frequency", "tele_freq"),
+                    ("Terakhir menggunakan telemedicine", "meta_telemedicine_last_use", "tele_last"),
+                ]
+
+                grid = st.columns(2)
+                for idx, (title, colname, keyp) in enumerate(cols):
+                    with grid[idx % 2]:
+                        _profile_barh(title, colname, keyp)
 
 
 # =========================
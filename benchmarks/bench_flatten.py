@@ -0,0 +1,134 @@
+"""
+Benchmark: flatten per-baris (versi lama load_all_responses) vs flatten_responses (kolumnar),
+dari JSONB maupun dari kolom skor bertipe perf_scores/imp_scores.
+
+    python benchmarks/bench_flatten.py [n_rows ...]     # default: 5000 50000
+
+Data sintetis dibuat mirip isi tabel responses (termasuk item yang kosong dan
+submitted_at_utc yang kosong). Sebelum mengukur waktu, output kedua versi dicek sama.
+"""
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from response_frame import flatten_responses  # noqa: E402
+from survey_items import ITEM_CODES  # noqa: E402
+from typed_scores import scores_array  # noqa: E402
+
+Row = namedtuple("Row", "id created_at respondent_code meta performance importance")
+TypedRow = namedtuple("TypedRow", "id created_at respondent_code meta perf_scores imp_scores performance importance")
+
+
+def make_rows(n: int, seed: int = 42):
+    rnd = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        submitted = base + timedelta(seconds=rnd.randint(0, 90 * 86400), microseconds=rnd.choice([0, 123456]))
+        started = submitted - timedelta(seconds=rnd.randint(60, 1800))
+        meta = {
+            "gender": rnd.choice(["Perempuan", "Laki-laki"]),
+            "age": "26-30 tahun",
+            "specialty": "Dokter umum",
+            "platform": rnd.choice(["Alodokter", "Good Doctor", "Halodoc"]),
+            "telemedicine_duration": "1-2 tahun",
+            "telemedicine_frequency": "Setiap hari",
+            "telemedicine_last_use": "Hari ini",
+            "started_at_utc": started.isoformat(),
+            "submitted_at_utc": submitted.isoformat() if rnd.random() > 0.02 else "",
+            "duration_sec": (submitted - started).total_seconds(),
+        }
+        perf = {c: rnd.randint(1, 6) for c in ITEM_CODES if rnd.random() > 0.01}
+        imp = {c: rnd.randint(1, 6) for c in ITEM_CODES if rnd.random() > 0.01}
+        rows.append(Row(n - i, submitted + timedelta(seconds=1), f"TATTFQ-{i:010d}", meta, perf, imp))
+    return rows
+
+
+def typed_rows(rows):
+    """Baris seperti hasil SELECT loader setelah backfill (JSONB tidak dikirim)."""
+    return [
+        TypedRow(r.id, r.created_at, r.respondent_code, r.meta,
+                 scores_array(r.performance), scores_array(r.importance), None, None)
+        for r in rows
+    ]
+
+
+def flatten_per_row(rows):
+    """Salinan loop lama dari load_all_responses (referensi)."""
+    records = []
+    for r in rows:
+        meta = r.meta or {}
+        perf = r.performance or {}
+        imp = r.importance or {}
+
+        created_at_utc = pd.to_datetime(r.created_at, utc=True, errors="coerce")
+        created_at_local = created_at_utc.tz_convert("Asia/Jakarta") if pd.notna(created_at_utc) else pd.NaT
+
+        started_at_utc = pd.to_datetime(meta.get("started_at_utc", ""), utc=True, errors="coerce")
+        submitted_at_utc = pd.to_datetime(meta.get("submitted_at_utc", ""), utc=True, errors="coerce")
+
+        started_at_local = started_at_utc.tz_convert("Asia/Jakarta") if pd.notna(started_at_utc) else pd.NaT
+        submitted_at_local = submitted_at_utc.tz_convert("Asia/Jakarta") if pd.notna(submitted_at_utc) else pd.NaT
+
+        effective_time_local = submitted_at_local if pd.notna(submitted_at_local) else created_at_local
+
+        rec = {
+            "id": r.id,
+            "created_at": created_at_utc,
+            "respondent_code": r.respondent_code,
+            "created_at_utc": created_at_utc,
+            "created_at_local": created_at_local,
+            "meta_started_at_utc_dt": started_at_utc,
+            "meta_submitted_at_utc_dt": submitted_at_utc,
+            "meta_started_at_local": started_at_local,
+            "meta_submitted_at_local": submitted_at_local,
+            "effective_time_local": effective_time_local,
+        }
+        for k, v in meta.items():
+            rec[f"meta_{k}"] = v
+        for code in ITEM_CODES:
+            rec[f"{code}_Performance"] = perf.get(code, np.nan)
+            rec[f"{code}_Importance"] = imp.get(code, np.nan)
+        records.append(rec)
+    return pd.DataFrame.from_records(records)
+
+
+def _best_of(fn, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"pandas {pd.__version__}, numpy {np.__version__}")
+    print(f"{'rows':>8} {'per-row (s)':>12} {'kolumnar (s)':>13} {'speedup':>8} {'array (s)':>10} {'speedup':>8}")
+    for n in sizes:
+        rows = make_rows(n)
+        typed = typed_rows(rows)
+        old = flatten_per_row(rows)
+        pd.testing.assert_frame_equal(flatten_responses(rows), old)
+        pd.testing.assert_frame_equal(flatten_responses(typed), old)
+
+        repeat = 3 if n <= 10000 else 1
+        t_old = _best_of(flatten_per_row, rows, repeat)
+        t_new = _best_of(flatten_responses, rows, repeat)
+        t_typed = _best_of(flatten_responses, typed, repeat)
+        print(
+            f"{n:>8} {t_old:>12.3f} {t_new:>13.3f} {t_old / t_new:>7.1f}x"
+            f" {t_typed:>10.3f} {t_old / t_typed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [5000, 50000])
@@ -0,0 +1,113 @@
+"""
+Benchmark: waktu import (python -X importtime) untuk jalur responden.
+
+Import level-modul app.py (yang dijalankan setiap proses sebelum halaman utama /
+kuesioner responden bisa dirender) diambil dari AST app.py, lalu dijalankan di
+interpreter baru dengan -X importtime. Import di dalam fungsi (mis. modul analisis
+yang hanya dipakai dashboard admin) tidak ikut, persis seperti saat responden membuka app.
+
+    python benchmarks/bench_import_time.py [--app app.py] [--repeat 5] [--top 12]
+
+Untuk perbandingan sebelum/sesudah, jalankan skrip yang sama pada checkout lama
+(mis. `git worktree add /tmp/old <commit>` lalu `--app /tmp/old/app.py`); modul
+lokal di-resolve dari folder app tersebut.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DEFAULT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app.py")
+
+HEAVY = ("pandas", "numpy", "matplotlib", "PIL", "pyarrow", "altair")
+
+# baris stderr pemisah: import startup interpreter (site, encodings, ...) tidak dihitung
+_MARKER = "-- app imports --"
+
+_CHILD = """
+import json, resource, sys, time
+sys.stderr.write("{marker}\\n")
+t0 = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "wall_ms": elapsed * 1000,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def top_level_imports(app_path: str) -> str:
+    """Semua statement import di level modul app.py (urutan asli)."""
+    with open(app_path) as f:
+        tree = ast.parse(f.read(), filename=app_path)
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr: str) -> dict:
+    """{modul top-level: cumulative us} dari output -X importtime (baris tanpa indentasi)."""
+    out = {}
+    lines = stderr.splitlines()
+    for line in lines[lines.index(_MARKER) + 1:]:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # format: "| <indentasi per level>nama"; hanya import langsung dari app.py (level teratas)
+        if name[1:].startswith(" "):
+            continue
+        out[name.strip()] = int(cumulative_us)
+    return out
+
+
+def run_once(app_path: str, imports: str) -> tuple:
+    code = _CHILD.format(imports=imports, heavy=HEAVY, marker=_MARKER)
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    env = dict(os.environ, PYTHONPATH=app_dir, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=app_dir, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP_DEFAULT)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="jumlah import top-level terberat yang ditampilkan")
+    args = parser.parse_args(argv)
+
+    imports = top_level_imports(args.app)
+    run_once(args.app, imports)  # pemanasan: bytecode / page cache
+
+    runs = [run_once(args.app, imports) for _ in range(args.repeat)]
+    info = runs[-1][0]
+    totals = [sum(cumulative.values()) / 1000 for _, cumulative in runs]
+    walls = [r["wall_ms"] for r, _ in runs]
+    rss = [r["maxrss_mb"] for r, _ in runs]
+
+    print(f"app: {os.path.abspath(args.app)}")
+    print(f"import-time total (median {args.repeat}x): {statistics.median(totals):8.0f} ms  (-X importtime, cumulative)")
+    print(f"wall import app.py     (median):    {statistics.median(walls):8.0f} ms")
+    print(f"RSS maks setelah import (median):    {statistics.median(rss):8.1f} MB")
+    print(f"modul di sys.modules:                {info['modules']:8d}")
+    print(f"library berat termuat: {', '.join(info['heavy']) or '-'}")
+
+    per_module = {}
+    for _, cumulative in runs:
+        for name, us in cumulative.items():
+            per_module.setdefault(name, []).append(us / 1000)
+    heaviest = sorted(per_module.items(), key=lambda kv: -statistics.median(kv[1]))[: args.top]
+    print(f"\n{'import top-level':<34} {'ms (median)':>11}")
+    for name, values in heaviest:
+        print(f"{name:<34} {statistics.median(values):>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Benchmark: INSERT per submission (satu transaksi per baris) vs INSERT multi-baris
+(insert_submissions dengan batch), plus SubmissionWriter end-to-end (spool + worker).
+
+    python benchmarks/bench_insert_batching.py --db-url postgresql+psycopg2://... [--rows 2000] [--threads 8]
+
+Semua tabel dibuat di schema sementara `bench_insert_batching` (dihapus di akhir),
+jadi aman dijalankan terhadap database lokal yang juga dipakai aplikasi.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_flatten import make_rows  # noqa: E402
+from db import create_db_engine  # noqa: E402
+import summary  # noqa: E402
+from schema import ensure_schema  # noqa: E402
+from submissions import SubmissionSpool, SubmissionWriter, insert_submissions  # noqa: E402
+
+BENCH_SCHEMA = "bench_insert_batching"
+
+
+def make_submissions(n: int) -> list:
+    run = uuid.uuid4().hex[:6]
+    return [
+        {"respondent_code": f"BENCH-{run}-{i:07d}", "meta": r.meta, "perf": r.performance, "imp": r.importance}
+        for i, r in enumerate(make_rows(n))
+    ]
+
+
+def reset(engine):
+    # antrian ringkasan ikut dikosongkan: sisa id dari putaran sebelumnya tidak ikut terukur
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE responses, {summary.SUMMARY_TABLE}, {summary.PENDING_TABLE}"))
+
+
+def count(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM responses")).scalar_one()
+
+
+def run_per_row(engine, subs, threads):
+    def one(s):
+        with engine.begin() as conn:
+            insert_submissions(conn, [s])
+
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(one, subs))
+
+
+def run_batched(engine, subs, batch_size):
+    for i in range(0, len(subs), batch_size):
+        with engine.begin() as conn:
+            insert_submissions(conn, subs[i : i + batch_size])
+
+
+def run_writer(engine, subs, threads, spool_dir, window_ms):
+    def write(batch):
+        # sama dengan writer di app.py: insert, lalu lipat antrian ringkasan di transaksi terpisah
+        with engine.begin() as conn:
+            insert_submissions(conn, batch)
+        with engine.begin() as conn:
+            summary.apply_pending(conn)
+
+    spool = SubmissionSpool(os.path.join(spool_dir, f"spool-{uuid.uuid4().hex}.sqlite3"))
+    writer = SubmissionWriter(spool, write, batch_window_sec=window_ms / 1000).start()
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(writer.submit, subs))
+    while writer.stats()["pending"]:
+        time.sleep(0.005)
+
+
+def timed(engine, subs, fn, *args):
+    reset(engine)
+    t0 = time.perf_counter()
+    fn(engine, subs, *args)
+    elapsed = time.perf_counter() - t0
+    assert count(engine) == len(subs)
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", default=os.getenv("SUPABASE_DB_URL", ""))
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--window-ms", type=float, default=20)
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        parser.error("Set SUPABASE_DB_URL atau gunakan --db-url.")
+
+    admin = create_db_engine(args.db_url, pool_size=1, max_overflow=0)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {BENCH_SCHEMA}"))
+    engine = create_db_engine(args.db_url, pool_size=args.threads, max_overflow=0)
+
+    @event.listens_for(engine, "connect")
+    def _search_path(dbapi_conn, _record):
+        # di luar transaksi, supaya tidak ikut ter-rollback saat koneksi kembali ke pool
+        dbapi_conn.autocommit = True
+        with dbapi_conn.cursor() as cur:
+            cur.execute(f"SET search_path TO {BENCH_SCHEMA}")
+        dbapi_conn.autocommit = False
+
+    try:
+        ensure_schema(engine)
+        subs = make_submissions(args.rows)
+
+        print(f"{args.rows} submission, {args.threads} thread")
+        print(f"{'mode':<34} {'detik':>8} {'baris/detik':>12}")
+
+        def report(label, seconds):
+            print(f"{label:<34} {seconds:>8.3f} {args.rows / seconds:>12.0f}")
+
+        report("per baris (1 transaksi/baris)", timed(engine, subs, run_per_row, args.threads))
+        for b in args.batch_sizes:
+            report(f"multi-baris, batch {b}", timed(engine, subs, run_batched, b))
+        with tempfile.TemporaryDirectory() as spool_dir:
+            report(
+                f"SubmissionWriter (jendela {args.window_ms:g} ms)",
+                timed(engine, subs, run_writer, args.threads, spool_dir, args.window_ms),
+            )
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Benchmark: statistik IPA item + dimensi versi loop pandas (lama: per item, lalu per dimensi)
+vs ipa_stats (NumPy: satu array, dimensi lewat perkalian matriks keanggotaan).
+
+    python benchmarks/bench_ipa_stats.py [n_rows ...]     # default: 1000 10000 100000
+
+Sebelum mengukur waktu, stats / cut-off / daftar kuadran kedua versi dicek identik,
+untuk frame numerik (hasil flatten_responses) maupun frame dengan kolom teks.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_flatten import make_rows  # noqa: E402
+from ipa_stats import QUAD_ORDER, classify_ipa, dimension_stats, item_stats, score_array  # noqa: E402
+from response_frame import flatten_responses  # noqa: E402
+from survey_items import DIM_ABBR, DIM_CODES, ITEM_CODES  # noqa: E402
+
+
+def classify_ipa_loop(stats: pd.DataFrame, label_col: str):
+    """Salinan classify_ipa lama (kuadran lewat list comprehension), sebagai referensi."""
+    stats = stats.copy()
+    stats["Gap_mean(P-I)"] = stats["Performance_mean"] - stats["Importance_mean"]
+
+    # cut-off data-centered
+    x_cut = float(stats["Performance_mean"].mean(skipna=True))
+    y_cut = float(stats["Importance_mean"].mean(skipna=True))
+
+    # --- Versi 1 (tanpa diagonal): klasik 4 kuadran (x_cut, y_cut) ---
+    def quadrant_v1(x: float, y: float) -> str:
+        if pd.isna(x) or pd.isna(y):
+            return "NA"
+        if y >= y_cut and x < x_cut:
+            return "I - Concentrate Here"
+        if y >= y_cut and x >= x_cut:
+            return "II - Keep Up the Good Work"
+        if y < y_cut and x < x_cut:
+            return "III - Low Priority"
+        return "IV - Possible Overkill"
+
+    # --- Versi 2 (dengan diagonal): aturan sesuai definisi user ---
+    # Q1: semua titik DI ATAS diagonal (y = x + b, lewat (x_cut, y_cut))
+    # Q2: DI BAWAH diagonal & DI ATAS garis horizontal (y_cut)
+    # Q3: DI BAWAH diagonal & DI KIRI garis vertikal (x_cut)
+    # Q4: DI BAWAH diagonal & DI BAWAH horizontal (y_cut) & DI KANAN vertikal (x_cut)
+    b = y_cut - x_cut
+
+    def quadrant_v2(x: float, y: float) -> str:
+        if pd.isna(x) or pd.isna(y):
+            return "NA"
+
+        y_diag = x + b
+
+        if y >= y_diag:
+            return "I - Concentrate Here"
+        if y >= y_cut:
+            return "II - Keep Up the Good Work"
+        if x < x_cut:
+            return "III - Low Priority"
+        return "IV - Possible Overkill"
+
+    stats["Quadrant_v1"] = [quadrant_v1(x, y) for x, y in zip(stats["Performance_mean"], stats["Importance_mean"])]
+    stats["Quadrant_v2"] = [quadrant_v2(x, y) for x, y in zip(stats["Performance_mean"], stats["Importance_mean"])]
+
+    quad_lists_v1 = {q: stats.loc[stats["Quadrant_v1"] == q, label_col].tolist() for q in QUAD_ORDER}
+    quad_lists_v2 = {q: stats.loc[stats["Quadrant_v2"] == q, label_col].tolist() for q in QUAD_ORDER}
+
+    return stats, x_cut, y_cut, quad_lists_v1, quad_lists_v2
+
+
+def compute_stats_and_ipa_loop(df_flat: pd.DataFrame):
+    """Salinan compute_stats_and_ipa lama (pd.to_numeric per item), sebagai referensi."""
+    def _series(col: str) -> pd.Series:
+        return pd.to_numeric(df_flat.get(col, pd.Series(dtype="float")), errors="coerce")
+
+    rows = []
+    for code in ITEM_CODES:
+        p = _series(f"{code}_Performance")
+        i = _series(f"{code}_Importance")
+        rows.append(
+            {
+                "Item": code,
+                "Performance_min": p.min(skipna=True),
+                "Performance_max": p.max(skipna=True),
+                "Performance_mean": p.mean(skipna=True),
+                "Importance_min": i.min(skipna=True),
+                "Importance_max": i.max(skipna=True),
+                "Importance_mean": i.mean(skipna=True),
+                "Performance_n": int(p.count()),
+                "Importance_n": int(i.count()),
+            }
+        )
+
+    return classify_ipa_loop(pd.DataFrame(rows), "Item")
+
+
+def compute_dimension_stats_and_ipa_loop(df_flat: pd.DataFrame):
+    """Salinan compute_dimension_stats_and_ipa lama (reindex + row mean per dimensi), sebagai referensi."""
+    if df_flat is None or df_flat.empty:
+        cols = [
+            "Dimension", "Dimension_name", "n_items",
+            "Performance_min", "Performance_max", "Performance_mean",
+            "Importance_min", "Importance_max", "Importance_mean",
+            "Performance_n", "Importance_n",
+            "Gap_mean(P-I)", "Quadrant_v1", "Quadrant_v2",
+        ]
+        empty_stats = pd.DataFrame(columns=cols)
+        return empty_stats, np.nan, np.nan, {q: [] for q in QUAD_ORDER}, {q: [] for q in QUAD_ORDER}
+
+    rows = []
+    for dim_full, abbr in DIM_ABBR.items():
+        codes = DIM_CODES.get(abbr, [])
+        perf_cols = [f"{c}_Performance" for c in codes]
+        imp_cols = [f"{c}_Importance" for c in codes]
+
+        perf_dim = (
+            df_flat.reindex(columns=perf_cols)
+            .apply(pd.to_numeric, errors="coerce")
+            .mean(axis=1, skipna=True)
+        )
+        imp_dim = (
+            df_flat.reindex(columns=imp_cols)
+            .apply(pd.to_numeric, errors="coerce")
+            .mean(axis=1, skipna=True)
+        )
+
+        rows.append(
+            {
+                "Dimension": abbr,
+                "Dimension_name": dim_full,
+                "n_items": len(codes),
+                "Performance_min": perf_dim.min(skipna=True),
+                "Performance_max": perf_dim.max(skipna=True),
+                "Performance_mean": perf_dim.mean(skipna=True),
+                "Importance_min": imp_dim.min(skipna=True),
+                "Importance_max": imp_dim.max(skipna=True),
+                "Importance_mean": imp_dim.mean(skipna=True),
+                "Performance_n": int(perf_dim.count()),
+                "Importance_n": int(imp_dim.count()),
+            }
+        )
+
+    return classify_ipa_loop(pd.DataFrame(rows), "Dimension")
+
+
+def ipa_loop(df_flat: pd.DataFrame):
+    return compute_stats_and_ipa_loop(df_flat), compute_dimension_stats_and_ipa_loop(df_flat)
+
+
+def ipa_numpy(df_flat: pd.DataFrame):
+    values = score_array(df_flat)
+    return classify_ipa(item_stats(values), "Item"), classify_ipa(dimension_stats(values), "Dimension")
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    # make_rows menghasilkan data baru per panggilan; ulangi blok 5000 baris untuk n besar
+    block = flatten_responses(make_rows(min(n, 5000)))
+    reps = -(-n // len(block))
+    return pd.concat([block] * reps, ignore_index=True).iloc[:n]
+
+
+def with_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Sebagian kolom jadi object berisi teks/angka campur (mis. data lama di JSONB)."""
+    df = df.copy()
+    for code in ITEM_CODES[:5]:
+        col = df[f"{code}_Performance"].astype(object)
+        col.iloc[::7] = "x"
+        col.iloc[1::11] = "4"
+        df[f"{code}_Performance"] = col
+    return df.drop(columns=[f"{ITEM_CODES[-1]}_Importance"])
+
+
+def assert_same(old, new):
+    pd.testing.assert_frame_equal(new[0], old[0], check_exact=True)
+    assert (old[1], old[2]) == (new[1], new[2]) or np.isnan([old[1], new[1]]).all()
+    assert old[3] == new[3] and old[4] == new[4]
+
+
+def _best_of(fn, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"pandas {pd.__version__}, numpy {np.__version__}")
+    empty = pd.DataFrame(columns=["id"])
+    assert_same(compute_stats_and_ipa_loop(empty), ipa_numpy(empty)[0])
+    print(f"{'rows':>8} {'loop (ms)':>10} {'numpy (ms)':>11} {'speedup':>8}   (item + dimensi)")
+    for n in sizes:
+        df = make_frame(n)
+        for variant in (df, with_text_columns(df)):
+            for old, new in zip(ipa_loop(variant), ipa_numpy(variant)):
+                assert_same(old, new)
+
+        repeat = 5 if n <= 10000 else 2
+        t_old = _best_of(ipa_loop, df, repeat)
+        t_new = _best_of(ipa_numpy, df, repeat)
+        print(f"{n:>8} {t_old * 1000:>10.1f} {t_new * 1000:>11.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,95 @@
+"""
+Benchmark: jumlah rerun script + CPU server untuk satu kuesioner responden lengkap
+(profil -> 35 item Performance -> 35 item Importance -> konfirmasi submit), disimulasikan
+dengan streamlit.testing AppTest seperti klik di browser:
+
+- radio di luar st.form: setiap klik = satu rerun (perilaku browser);
+- radio di dalam st.form: klik tidak memicu rerun, nilai dikirim sekali oleh tombol form.
+
+    python benchmarks/bench_respondent_reruns.py [--app app.py] [--repeat 3]
+
+Untuk perbandingan sebelum/sesudah, jalankan skrip yang sama pada checkout lama
+(mis. `git worktree add /tmp/old <commit>` lalu `--app /tmp/old/app.py`).
+Berhenti di dialog konfirmasi (tidak menulis ke database); --db-url / SUPABASE_DB_URL
+boleh URL apa pun karena engine tidak tersambung sebelum submit.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP_DEFAULT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app.py")
+
+PROFILE = ["Perempuan", "26-30 tahun", "Dokter umum", "Halodoc", "1-2 tahun", "Setiap hari", "Hari ini"]
+
+
+class Session:
+    """AppTest + penghitung rerun / waktu CPU (proses) / waktu dinding."""
+
+    def __init__(self, app_path: str, db_url: str):
+        self.at = AppTest.from_file(app_path, default_timeout=120)
+        self.at.secrets["SUPABASE_DB_URL"] = db_url
+        self.reruns = 0
+        self.cpu = 0.0
+        self.wall = 0.0
+
+    def run(self, element=None):
+        c0, w0 = time.process_time(), time.perf_counter()
+        (element.run() if element is not None else self.at.run())
+        self.cpu += time.process_time() - c0
+        self.wall += time.perf_counter() - w0
+        self.reruns += 1
+        assert not self.at.exception, self.at.exception
+
+    def click(self, label_part: str):
+        self.run([b for b in self.at.button if label_part in b.label][0].click())
+
+    def answer(self, prefix: str, rnd: random.Random):
+        for i in range(len(self.at.radio)):
+            radio = self.at.radio[i]
+            if not (radio.key or "").startswith(prefix):
+                continue
+            value = rnd.choice([v for v in (1, 2, 3, 4, 5, 6) if v != radio.value])
+            radio.set_value(value)
+            if not radio.form_id:
+                self.run()
+
+
+def one_questionnaire(app_path: str, db_url: str, seed: int) -> Session:
+    rnd = random.Random(seed)
+    s = Session(app_path, db_url)
+    s.run()
+    s.click("Mulai")
+    for i, value in enumerate(PROFILE):
+        s.at.selectbox[i].set_value(value)
+        s.run()
+    s.click("Tahap 2")
+    s.answer("perf_", rnd)
+    s.click("Tahap 3")
+    s.answer("imp_", rnd)
+    s.click("Submit")
+    assert s.at.session_state.confirm_submit
+    return s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP_DEFAULT)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db-url", default=os.getenv("SUPABASE_DB_URL") or "postgresql+psycopg2://bench@localhost/bench")
+    args = parser.parse_args(argv)
+
+    one_questionnaire(args.app, args.db_url, seed=0)  # pemanasan: import modul, cache Streamlit
+    print(f"app: {os.path.abspath(args.app)}")
+    print(f"{'#':>3} {'rerun':>6} {'CPU (s)':>8} {'dinding (s)':>12} {'CPU/rerun (ms)':>15}")
+    for i in range(1, args.repeat + 1):
+        s = one_questionnaire(args.app, args.db_url, seed=i)
+        print(f"{i:>3} {s.reruns:>6} {s.cpu:>8.2f} {s.wall:>12.2f} {s.cpu * 1000 / s.reruns:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
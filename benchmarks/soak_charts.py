@@ -0,0 +1,109 @@
+"""
+Soak test: render plot dashboard (IPA item + dimensi versi 1 & 2, bar profil) ratusan
+kali dan pantau memori proses. Dengan charts.py (Figure OO + figure_png) memori harus
+datar; mode --pyplot menjalankan pola lama (plt.subplots tanpa close) sebagai pembanding.
+
+    python benchmarks/soak_charts.py [--renders 500] [--every 50] [--pyplot]
+
+Cache figur (figure_cache) sengaja tidak dipakai: setiap iterasi benar-benar memanggil Matplotlib.
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_flatten import make_rows  # noqa: E402
+import charts  # noqa: E402
+from ipa_stats import classify_ipa, dimension_stats, item_stats, score_array  # noqa: E402
+from response_frame import flatten_responses  # noqa: E402
+
+
+def rss_mb() -> float:
+    """RSS saat ini (Linux: /proc/self/statm), fallback ke puncak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_inputs(n_rows: int):
+    df = flatten_responses(make_rows(n_rows))
+    values = score_array(df)
+    items = classify_ipa(item_stats(values), "Item")
+    dims = classify_ipa(dimension_stats(values), "Dimension")
+    counts = df["meta_platform"].value_counts().rename_axis("Value").reset_index(name="Count")
+    return items, dims, counts
+
+
+def render_once(items, dims, counts):
+    stats, x_cut, y_cut, _, _ = items
+    dim_stats, dx_cut, dy_cut, _, _ = dims
+    total = 0
+    for diag in (False, True):
+        opts = dict(show_iso_diagonal=diag, trimmed_quadrant_lines=diag)
+        total += len(charts.figure_png(charts.plot_ipa_items(stats, x_cut, y_cut, **opts)))
+        total += len(charts.figure_png(charts.plot_ipa_dimensions(dim_stats, dx_cut, dy_cut, **opts)))
+    total += len(charts.figure_png(charts.profile_barh(counts)))
+    return total
+
+
+def render_once_pyplot(items, dims, counts):
+    """Pola lama: figur pyplot dibuat tiap rerun dan tidak pernah di-close."""
+    import io
+
+    import matplotlib.pyplot as plt
+
+    stats, x_cut, y_cut, _, _ = items
+    total = 0
+    for _ in range(5):
+        fig, ax = plt.subplots(figsize=(6.8, 4.8))
+        ax.scatter(stats["Performance_mean"], stats["Importance_mean"])
+        for _, r in stats.iterrows():
+            ax.text(r["Performance_mean"], r["Importance_mean"], r["Item"], fontsize=8)
+        ax.axvline(x_cut)
+        ax.axhline(y_cut)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight", dpi=200)
+        total += len(buf.getvalue())
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=500, help="jumlah tampilan dashboard (5 plot per tampilan)")
+    parser.add_argument("--every", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--pyplot", action="store_true", help="pola lama plt.subplots tanpa close")
+    args = parser.parse_args(argv)
+
+    inputs = make_inputs(args.rows)
+    render = render_once_pyplot if args.pyplot else render_once
+    render(*inputs)  # pemanasan: font cache, import backend
+    gc.collect()
+    base = rss_mb()
+
+    print(f"mode: {'pyplot tanpa close' if args.pyplot else 'charts.py (Figure OO)'}")
+    print(f"{'render':>7} {'RSS (MB)':>9} {'delta (MB)':>11} {'ms/render':>10}")
+    t0 = time.perf_counter()
+    for i in range(1, args.renders + 1):
+        render(*inputs)
+        if i % args.every == 0:
+            gc.collect()
+            now = rss_mb()
+            ms = (time.perf_counter() - t0) * 1000 / i
+            print(f"{i:>7} {now:>9.1f} {now - base:>+11.1f} {ms:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
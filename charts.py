@@ -0,0 +1,448 @@
+"""
+Plot dashboard admin (IPA matrix item/dimensi + bar profil responden).
+
+Semua figur dibuat lewat API objek Matplotlib (matplotlib.figure.Figure), bukan
+pyplot: figur tidak didaftarkan ke registry global pyplot dan tidak ada state
+"current figure" yang dibagi antar sesi/thread Streamlit. Figur dilepas secara
+eksplisit oleh figure_png() setelah di-render ke PNG, jadi memori proses tidak
+bertambah seiring jumlah tampilan dashboard (lihat benchmarks/soak_charts.py).
+"""
+import io
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from survey_items import DIM_NAME_BY_ABBR, ITEM_TEXT
+
+
+def figure_png(fig: Figure) -> bytes:
+    """Render figur ke PNG (opsi sama dengan default st.pyplot: tight, 200 dpi), lalu kosongkan figurnya."""
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format="png", bbox_inches="tight", dpi=200)
+    finally:
+        # lepas semua artist sekarang juga, tanpa menunggu garbage collector
+        fig.clear()
+    return buf.getvalue()
+
+
+# =========================
+# GEOMETRI IPA (dipakai bersama backend Matplotlib & Vega-Lite)
+# =========================
+QUADRANT_LABELS = [
+    "Q1\nConcentrate Here",
+    "Q2\nKeep Up the Good Work",
+    "Q3\nLow Priority",
+    "Q4\nPossible Overkill",
+]
+
+
+def axis_limits(stats, pad=0.2):
+    """(xlim, ylim) = rentang mean Performance / Importance +- pad; None bila tidak ada titik."""
+    x_vals = stats["Performance_mean"].dropna()
+    y_vals = stats["Importance_mean"].dropna()
+    if not (len(x_vals) and len(y_vals)):
+        return None
+    return (
+        (float(x_vals.min()) - pad, float(x_vals.max()) + pad),
+        (float(y_vals.min()) - pad, float(y_vals.max()) + pad),
+    )
+
+
+def iso_diagonal_segment(x_cut, y_cut, xlim, ylim):
+    """
+    Garis diagonal 45°: y = x + b, melewati titik (x_cut, y_cut) -> b = y_cut - x_cut.
+    Return ((xA, yA), (xB, yB)): potongan diagonal di dalam kotak xlim x ylim.
+    """
+    b = y_cut - x_cut
+    x0, x1 = xlim
+    y0 = x0 + b
+    y1 = x1 + b
+
+    ymin, ymax = ylim
+
+    pts = []
+    if ymin <= y0 <= ymax:
+        pts.append((x0, y0))
+    if ymin <= y1 <= ymax:
+        pts.append((x1, y1))
+
+    xx = ymin - b
+    if x0 <= xx <= x1:
+        pts.append((xx, ymin))
+
+    xx = ymax - b
+    if x0 <= xx <= x1:
+        pts.append((xx, ymax))
+
+    pts = list(dict.fromkeys(pts))
+    if len(pts) >= 2:
+        pts_sorted = sorted(pts, key=lambda t: t[0])
+        return pts_sorted[0], pts_sorted[-1]
+    return (x0, y0), (x1, y1)
+
+
+def quadrant_line_segments(x_cut, y_cut, xlim, ylim, trimmed_like_example=False):
+    """
+    - Default (Versi 1): garis vertikal & horizontal penuh.
+    - Trimmed (Versi 2): hanya
+        * garis vertikal x=x_cut dari bawah sampai y_cut
+        * garis horizontal y=y_cut dari x_cut sampai kanan
+    Return [((x, y), (x2, y2)), ...].
+    """
+    x0, x1 = xlim
+    y0, y1 = ylim
+    if not trimmed_like_example:
+        return [((x_cut, y0), (x_cut, y1)), ((x0, y_cut), (x1, y_cut))]
+    return [((x_cut, y0), (x_cut, y_cut)), ((x_cut, y_cut), (x1, y_cut))]
+
+
+def quadrant_label_positions(x_cut, y_cut, xlim, ylim, trimmed_like_example=False):
+    """
+    Posisi label Q1..Q4: [(x, y, teks), ...] dalam koordinat DATA.
+    - Mode biasa: 4 kotak standar (posisi tetap relatif terhadap axes).
+    - Mode trimmed_like_example=True: label diposisikan agar jatuh di region poligon
+      yang benar ketika ada diagonal + garis kuadran trimmed.
+    """
+    x0, x1 = xlim
+    y0, y1 = ylim
+
+    # --- Mode tanpa diagonal/trim (layout kotak biasa) ---
+    if not trimmed_like_example:
+        # Posisi dibuat sedikit lebih "ke tengah" agar aman dari tepi
+        frac = [(0.25, 0.78), (0.75, 0.78), (0.25, 0.22), (0.75, 0.22)]
+        return [
+            (x0 + xa * (x1 - x0), y0 + ya * (y1 - y0), label)
+            for (xa, ya), label in zip(frac, QUADRANT_LABELS)
+        ]
+
+    # --- Mode diagonal + trimmed ---
+    # diagonal: y = x + b melewati (x_cut, y_cut)
+    b = y_cut - x_cut
+
+    def y_diag(x):
+        return x + b
+
+    def clamp(v, lo, hi):
+        return max(lo, min(hi, v))
+
+    # Margin kecil supaya label tidak menempel garis & tidak keluar plot
+    mx = 0.03 * (x1 - x0)
+    my = 0.03 * (y1 - y0)
+
+    # Q1: kiri-atas, pastikan di atas diagonal
+    x_q1 = x0 + 0.30 * (x_cut - x0)
+    y_q1 = y_cut + 0.55 * (y1 - y_cut)
+    y_q1 = max(y_q1, y_diag(x_q1) + my)
+    x_q1 = clamp(x_q1, x0 + mx, x1 - mx)
+    y_q1 = clamp(y_q1, y0 + my, y1 - my)
+
+    # Q2: kanan, di atas y_cut tapi DI BAWAH diagonal
+    x_q2 = x_cut + 0.62 * (x1 - x_cut)
+    y_top_q2 = y_diag(x_q2) - my
+    if y_top_q2 <= y_cut + my:
+        y_q2 = y_cut + 0.12 * (y1 - y_cut)
+    else:
+        y_q2 = y_cut + 0.45 * (y_top_q2 - y_cut)
+    x_q2 = clamp(x_q2, x0 + mx, x1 - mx)
+    y_q2 = clamp(y_q2, y_cut + my, min(y_top_q2, y1 - my))
+
+    # Q3: kiri, di kiri x_cut dan DI BAWAH diagonal
+    x_q3 = x0 + 0.40 * (x_cut - x0)
+    y_top_q3 = y_diag(x_q3) - my
+    y_q3_cap = min(y_top_q3, y_cut - my) if (y_cut - my) > y0 else y_top_q3
+    y_q3 = y0 + 0.30 * (y_q3_cap - y0)
+    x_q3 = clamp(x_q3, x0 + mx, x1 - mx)
+    y_q3 = clamp(y_q3, y0 + my, y_top_q3)
+
+    # Q4: kanan-bawah, pastikan di bawah diagonal (dan biasanya di bawah y_cut)
+    x_q4 = x_cut + 0.65 * (x1 - x_cut)
+    y_q4 = y0 + 0.30 * (y_cut - y0)
+    y_q4 = min(y_q4, y_diag(x_q4) - my)
+    x_q4 = clamp(x_q4, x0 + mx, x1 - mx)
+    y_q4 = clamp(y_q4, y0 + my, y1 - my)
+
+    points = [(x_q1, y_q1), (x_q2, y_q2), (x_q3, y_q3), (x_q4, y_q4)]
+    return [(x, y, label) for (x, y), label in zip(points, QUADRANT_LABELS)]
+
+
+# =========================
+# IPA PLOT HELPERS (Matplotlib)
+# =========================
+def _plot_iso_diagonal(ax, x_cut, y_cut, xlim, ylim, with_endpoints=False):
+    (xa, ya), (xb, yb) = iso_diagonal_segment(x_cut, y_cut, xlim, ylim)
+    # ✅ tanpa marker ujung
+    ax.plot([xa, xb], [ya, yb], linestyle="-", linewidth=2.2)
+
+
+def _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=False):
+    """✅ tanpa marker lingkaran di ujung garis; lihat quadrant_line_segments."""
+    if not trimmed_like_example:
+        ax.axvline(x_cut, linewidth=1.5)
+        ax.axhline(y_cut, linewidth=1.5)
+        return
+
+    for (xa, ya), (xb, yb) in quadrant_line_segments(x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), True):
+        ax.plot([xa, xb], [ya, yb], linewidth=2.2)
+
+
+# =========================
+# QUADRANT LABELS (UPDATED - FONT AUTO SMALLER + NEVER CUT OFF)
+# =========================
+def _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=False):
+    """
+    Label Q1..Q4 pada posisi quadrant_label_positions.
+
+    Perubahan (sesuai permintaan user):
+    - Ukuran font label kuadran dibuat lebih kecil dari label item/dimensi.
+    - Ukuran font otomatis menyesuaikan "besar kuadran" (berdasarkan ukuran axes),
+      supaya tidak terpotong/keluar batas.
+    """
+
+    # --- AUTO FONT SIZE (lebih kecil dari item/dim labels) ---
+    # Item labels: 8, Dimension labels: 9 -> Quadrant harus < 8
+    # Kita pakai skala dari ukuran axes (dalam points), lalu clamp ke 5..7.
+    try:
+        fig = ax.figure
+        bbox_in = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())  # inches
+        w_pt = bbox_in.width * 72.0
+        h_pt = bbox_in.height * 72.0
+        min_pt = min(w_pt, h_pt)
+        q_font = int(max(2, min(4, round(0.03 * min_pt))))  # adaptif, tapi tetap kecil
+    except Exception:
+        q_font = 3  # fallback aman
+
+    # bbox diperkecil biar tidak melebar keluar kuadran
+    q_bbox = dict(boxstyle="round,pad=0.08", alpha=0.06, edgecolor="none")
+
+    for x, y, text in quadrant_label_positions(x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), trimmed_like_example):
+        ax.text(
+            x, y, text,
+            ha="center", va="center",
+            fontsize=q_font, fontweight="normal",
+            alpha=0.75, clip_on=True,
+            bbox=q_bbox,
+        )
+
+
+# =========================
+# IPA PLOTS
+# =========================
+def plot_ipa_items(stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
+    fig = Figure(figsize=(6.8, 4.8))
+    ax = fig.subplots()
+    ax.scatter(stats["Performance_mean"], stats["Importance_mean"])
+    for _, r in stats.iterrows():
+        if pd.isna(r["Performance_mean"]) or pd.isna(r["Importance_mean"]):
+            continue
+        ax.text(r["Performance_mean"], r["Importance_mean"], r["Item"], fontsize=8)
+
+    limits = axis_limits(stats)
+    if limits is not None:
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+
+    # garis pembagi kuadran (full vs trimmed)
+    _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
+
+    # diagonal
+    if show_iso_diagonal:
+        _plot_iso_diagonal(ax, x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), with_endpoints=False)
+
+    # ✅ tambah label kuadran
+    _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
+
+    ax.set_title(f"IPA Matrix (Data-centered) — Items{title_suffix}")
+    ax.set_xlabel("Performance (Mean)")
+    ax.set_ylabel("Importance (Mean)")
+    ax.set_aspect("equal", adjustable="box")
+    return fig
+
+
+def plot_ipa_dimensions(dim_stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
+    fig = Figure(figsize=(6.8, 4.8))
+    ax = fig.subplots()
+    ax.scatter(dim_stats["Performance_mean"], dim_stats["Importance_mean"])
+    for _, r in dim_stats.iterrows():
+        if pd.isna(r["Performance_mean"]) or pd.isna(r["Importance_mean"]):
+            continue
+        ax.text(r["Performance_mean"], r["Importance_mean"], r["Dimension"], fontsize=9)
+
+    limits = axis_limits(dim_stats)
+    if limits is not None:
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+
+    # garis pembagi kuadran (full vs trimmed)
+    _plot_quadrant_lines(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
+
+    # diagonal
+    if show_iso_diagonal:
+        _plot_iso_diagonal(ax, x_cut, y_cut, ax.get_xlim(), ax.get_ylim(), with_endpoints=True)
+
+    # ✅ tambah label kuadran
+    _annotate_quadrants(ax, x_cut, y_cut, trimmed_like_example=trimmed_quadrant_lines)
+
+    ax.set_title(f"IPA Matrix (Data-centered) — Dimensions{title_suffix}")
+    ax.set_xlabel("Performance (Mean)")
+    ax.set_ylabel("Importance (Mean)")
+    ax.set_aspect("equal", adjustable="box")
+    return fig
+
+
+# =========================
+# IPA PLOTS (Vega-Lite, dirender di browser)
+# =========================
+VEGA_WIDTH = 560
+
+
+def _segment_layer(segments, x_axis, y_axis, stroke_width):
+    # encoding x/y sama dengan layer titik, supaya skala & judul sumbu dipakai bersama
+    return {
+        "data": {
+            "values": [
+                {"performance": xa, "importance": ya, "performance2": xb, "importance2": yb}
+                for (xa, ya), (xb, yb) in segments
+            ]
+        },
+        "mark": {"type": "rule", "strokeWidth": stroke_width, "clip": True},
+        "encoding": {"x": x_axis, "y": y_axis, "x2": {"field": "performance2"}, "y2": {"field": "importance2"}},
+    }
+
+
+def ipa_vega_spec(
+    stats,
+    label_col,
+    x_cut,
+    y_cut,
+    describe=None,
+    show_iso_diagonal=False,
+    trimmed_quadrant_lines=False,
+    title="",
+    label_font_size=11,
+) -> dict:
+    """
+    Spec Vega-Lite plot IPA: titik (label + tooltip), garis kuadran, diagonal 45°, label Q1..Q4.
+    Geometri sama dengan versi Matplotlib (axis_limits, quadrant_line_segments,
+    iso_diagonal_segment, quadrant_label_positions); yang dikirim ke browser hanya
+    ~35 (item) / 9 (dimensi) titik + beberapa segmen garis.
+    describe: {label: teks lengkap} untuk tooltip (mis. ITEM_TEXT).
+    """
+    describe = describe or {}
+    quadrant_col = "Quadrant_v2" if trimmed_quadrant_lines else "Quadrant_v1"
+    points = []
+    for r in stats.to_dict("records"):
+        x, y = r.get("Performance_mean"), r.get("Importance_mean")
+        if pd.isna(x) or pd.isna(y):
+            continue
+        label = r.get(label_col)
+        points.append(
+            {
+                "label": label,
+                "text": describe.get(label, ""),
+                "performance": float(x),
+                "importance": float(y),
+                "quadrant": r.get(quadrant_col, ""),
+            }
+        )
+
+    x_axis = {"field": "performance", "type": "quantitative", "title": "Performance (Mean)"}
+    y_axis = {"field": "importance", "type": "quantitative", "title": "Importance (Mean)"}
+    width = height = VEGA_WIDTH * 0.7
+    limits = axis_limits(stats)
+    if limits is not None:
+        (x0, x1), (y0, y1) = limits
+        x_axis["scale"] = {"domain": [x0, x1], "zero": False, "nice": False}
+        y_axis["scale"] = {"domain": [y0, y1], "zero": False, "nice": False}
+        # skala sumbu sama (padanan set_aspect("equal")), tinggi dibatasi supaya tetap terbaca
+        width = VEGA_WIDTH
+        height = min(max(VEGA_WIDTH * (y1 - y0) / (x1 - x0), 240), 720)
+
+    layers = [
+        {
+            "data": {"values": points},
+            "mark": {"type": "point", "filled": True, "size": 60},
+            "encoding": {
+                "x": x_axis,
+                "y": y_axis,
+                "tooltip": [
+                    {"field": "label", "type": "nominal", "title": label_col},
+                    {"field": "text", "type": "nominal", "title": "Keterangan"},
+                    {"field": "performance", "type": "quantitative", "title": "Performance", "format": ".2f"},
+                    {"field": "importance", "type": "quantitative", "title": "Importance", "format": ".2f"},
+                    {"field": "quadrant", "type": "nominal", "title": "Kuadran"},
+                ],
+            },
+        },
+        {
+            "data": {"values": points},
+            "mark": {"type": "text", "align": "left", "dx": 4, "dy": -4, "fontSize": label_font_size},
+            "encoding": {"x": x_axis, "y": y_axis, "text": {"field": "label"}},
+        },
+    ]
+
+    if limits is not None and not (pd.isna(x_cut) or pd.isna(y_cut)):
+        width_cut = 2.2 if trimmed_quadrant_lines else 1.5
+        layers.append(
+            _segment_layer(
+                quadrant_line_segments(x_cut, y_cut, *limits, trimmed_quadrant_lines), x_axis, y_axis, width_cut
+            )
+        )
+        if show_iso_diagonal:
+            layers.append(_segment_layer([iso_diagonal_segment(x_cut, y_cut, *limits)], x_axis, y_axis, 2.2))
+        layers.append(
+            {
+                "data": {
+                    "values": [
+                        {"performance": x, "importance": y, "text": text.split("\n")}
+                        for x, y, text in quadrant_label_positions(x_cut, y_cut, *limits, trimmed_quadrant_lines)
+                    ]
+                },
+                "mark": {"type": "text", "fontSize": label_font_size - 2, "opacity": 0.6},
+                "encoding": {"x": x_axis, "y": y_axis, "text": {"field": "text"}},
+            }
+        )
+
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": title,
+        "width": width,
+        "height": height,
+        "layer": layers,
+    }
+
+
+def vega_ipa_items(stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
+    return ipa_vega_spec(
+        stats, "Item", x_cut, y_cut,
+        describe=ITEM_TEXT,
+        show_iso_diagonal=show_iso_diagonal,
+        trimmed_quadrant_lines=trimmed_quadrant_lines,
+        title=f"IPA Matrix (Data-centered) — Items{title_suffix}",
+    )
+
+
+def vega_ipa_dimensions(dim_stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
+    return ipa_vega_spec(
+        dim_stats, "Dimension", x_cut, y_cut,
+        describe=DIM_NAME_BY_ABBR,
+        show_iso_diagonal=show_iso_diagonal,
+        trimmed_quadrant_lines=trimmed_quadrant_lines,
+        title=f"IPA Matrix (Data-centered) — Dimensions{title_suffix}",
+        label_font_size=12,
+    )
+
+
+# =========================
+# PROFIL RESPONDEN
+# =========================
+def profile_barh(counts: pd.DataFrame):
+    """counts: kolom Value + Count (satu baris per kategori)."""
+    fig = Figure(figsize=(6.5, 3.2))
+    ax = fig.subplots()
+    counts_plot = counts.sort_values("Count", ascending=True)
+    ax.barh(counts_plot["Value"], counts_plot["Count"])
+    ax.set_xlabel("Count")
+    ax.set_ylabel("")
+    fig.tight_layout()
+    return fig
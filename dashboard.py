@@ -0,0 +1,134 @@
+"""
+Analisis, tabel, dan plot untuk dashboard admin (pandas / NumPy / Matplotlib).
+
+app.py hanya mengimpor modul ini (dan modul analisis di bawahnya) dari dalam
+fungsi dashboard admin, jadi proses yang hanya melayani halaman utama dan
+kuesioner responden tidak pernah memuat library analisis. Lihat
+benchmarks/bench_import_time.py.
+"""
+import numpy as np
+import pandas as pd
+
+from charts import figure_png, plot_ipa_dimensions, plot_ipa_items, vega_ipa_dimensions, vega_ipa_items
+from figure_cache import figure_key
+from ipa_stats import QUAD_ORDER, classify_ipa, dimension_stats, item_stats, score_array
+from response_frame import flatten_responses
+
+
+def responses_frame(pages, limit=None) -> pd.DataFrame:
+    """
+    Flatten halaman-halaman baris responses (iterable of list) menjadi satu frame,
+    berhenti setelah `limit` baris. Setiap halaman langsung di-flatten, jadi yang
+    tertahan di memori hanya satu halaman baris JSON + frame ringkas hasil flatten.
+    """
+    frames = []
+    n_rows = 0
+    for rows in pages:
+        if limit is not None:
+            rows = rows[: max(limit - n_rows, 0)]
+        if rows:
+            frames.append(flatten_responses(rows))
+            n_rows += len(rows)
+        if limit is not None and n_rows >= limit:
+            break
+
+    if not frames:
+        return flatten_responses([])
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+# =========================
+# STATS + IPA
+# =========================
+def compute_stats_and_ipa(df_flat: pd.DataFrame, values=None):
+    # values = score_array(df_flat) bila sudah dihitung (dipakai bersama item & dimensi)
+    values = score_array(df_flat) if values is None else values
+    return classify_ipa(item_stats(values), "Item")
+
+
+def compute_dimension_stats_and_ipa(df_flat: pd.DataFrame, values=None):
+    if df_flat is None or df_flat.empty:
+        cols = [
+            "Dimension", "Dimension_name", "n_items",
+            "Performance_min", "Performance_max", "Performance_mean",
+            "Importance_min", "Importance_max", "Importance_mean",
+            "Performance_n", "Importance_n",
+            "Gap_mean(P-I)", "Quadrant_v1", "Quadrant_v2",
+        ]
+        empty_stats = pd.DataFrame(columns=cols)
+        return empty_stats, np.nan, np.nan, {q: [] for q in QUAD_ORDER}, {q: [] for q in QUAD_ORDER}
+
+    # skor dimensi dari array item yang sama (satu perkalian matriks); lihat ipa_stats.py
+    values = score_array(df_flat) if values is None else values
+    return classify_ipa(dimension_stats(values), "Dimension")
+
+
+def compute_ipa_from_frame(df_flat: pd.DataFrame):
+    """Hasil IPA item + dimensi dari frame respons (IPA_STATS_SOURCE = "python")."""
+    values = score_array(df_flat)  # satu konversi frame -> array untuk item & dimensi
+    return compute_stats_and_ipa(df_flat, values), compute_dimension_stats_and_ipa(df_flat, values)
+
+
+# =========================
+# PLOT IPA
+# =========================
+def ipa_plot_png(cache, kind: str, stats, x_cut, y_cut, show_iso_diagonal=False, trimmed_quadrant_lines=False, title_suffix=""):
+    """
+    PNG plot IPA ("items" / "dimensions") dari `cache` (FigureCache); Matplotlib hanya
+    dipanggil bila kombinasi data + cut-off + opsi plot ini belum pernah di-render.
+    """
+    plot_fn, label_col = (plot_ipa_items, "Item") if kind == "items" else (plot_ipa_dimensions, "Dimension")
+    options = dict(
+        show_iso_diagonal=show_iso_diagonal,
+        trimmed_quadrant_lines=trimmed_quadrant_lines,
+        title_suffix=title_suffix,
+    )
+    key = figure_key(kind, stats, label_col, x_cut, y_cut, **options)
+    return cache.get_or_render(key, lambda: figure_png(plot_fn(stats, x_cut, y_cut, **options)))
+
+
+def ipa_vega_spec(kind: str, stats, x_cut, y_cut, **options) -> dict:
+    """Spec Vega-Lite plot IPA ("items" / "dimensions")."""
+    spec_fn = vega_ipa_items if kind == "items" else vega_ipa_dimensions
+    return spec_fn(stats, x_cut, y_cut, **options)
+
+
+# =========================
+# TABEL DASHBOARD
+# =========================
+def round_df_numeric(df_in: pd.DataFrame, decimals: int = 2) -> pd.DataFrame:
+    df_out = df_in.copy()
+    num_cols = df_out.select_dtypes(include=["number"]).columns
+    if len(num_cols) > 0:
+        df_out[num_cols] = df_out[num_cols].round(decimals)
+    return df_out
+
+
+def side_by_side_table(left_list, right_list, left_fmt, right_fmt) -> pd.DataFrame:
+    """Dua daftar (Versi 1 / Versi 2) sebagai kolom berdampingan, yang lebih pendek diisi ""."""
+    L = [left_fmt(x) for x in (left_list or [])]
+    R = [right_fmt(x) for x in (right_list or [])]
+    n = max(len(L), len(R), 1)
+    if len(L) < n:
+        L += [""] * (n - len(L))
+    if len(R) < n:
+        R += [""] * (n - len(R))
+    return pd.DataFrame({"Versi 1": L, "Versi 2": R})
+
+
+def duration_seconds(df: pd.DataFrame) -> pd.Series:
+    """Durasi pengisian (detik) per respons; nilai tidak valid -> NaN."""
+    return pd.to_numeric(df.get("meta_duration_sec", pd.Series(dtype="float")), errors="coerce")
+
+
+def value_counts_frame(df: pd.DataFrame, colname: str) -> pd.DataFrame:
+    """Frekuensi nilai kolom profil (kosong dilewati), kolom Value / Count."""
+    s = df.get(colname, pd.Series(dtype="object")).fillna("").astype(str)
+    s = s[s.str.strip() != ""]
+    if s.empty:
+        return pd.DataFrame(columns=["Value", "Count"])
+    out = s.value_counts().reset_index()
+    out.columns = ["Value", "Count"]
+    return out
@@ -0,0 +1,193 @@
+"""
+Koneksi database (SQLAlchemy) untuk TATTFQ.
+
+Modul ini sengaja tidak bergantung pada Streamlit: app.py yang memastikan
+engine hanya dibuat sekali per proses (lewat st.cache_resource), sedangkan
+modul ini cukup menyediakan factory engine + statistik pool.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolCheckoutStats:
+    """Counter checkout pool (thread-safe): waktu tunggu + pemakaian overflow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_sec = 0.0
+        self.max_wait_sec = 0.0
+        self.overflow_connects = 0
+        self.peak_overflow = 0
+
+    def record_wait(self, wait_sec: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.total_wait_sec += wait_sec
+            self.max_wait_sec = max(self.max_wait_sec, wait_sec)
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_connect(self, overflow: int):
+        # koneksi DBAPI baru; overflow > 0 berarti koneksi ini dibuka di atas pool_size
+        with self._lock:
+            if overflow > 0:
+                self.overflow_connects += 1
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            n = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (self.total_wait_sec / n * 1000.0) if n else 0.0,
+                "max_wait_ms": self.max_wait_sec * 1000.0,
+                "overflow_connects": self.overflow_connects,
+                "peak_overflow": self.peak_overflow,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool biasa, ditambah pencatatan berapa lama sebuah checkout menunggu
+    koneksi (termasuk membuka koneksi baru). Jumlah checkout dan koneksi overflow
+    dicatat lewat event pool "checkout"/"connect" (lihat create_db_engine).
+    """
+
+    def __init__(self, creator, **kw):
+        super().__init__(creator, **kw)
+        self.checkout_stats = PoolCheckoutStats()
+
+    def recreate(self):
+        # dipanggil saat engine.dispose(); counter tetap diteruskan ke pool baru
+        new_pool = super().recreate()
+        new_pool.checkout_stats = self.checkout_stats
+        return new_pool
+
+    def connect(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super().connect()
+        except PoolTimeoutError:
+            self.checkout_stats.record_wait(time.perf_counter() - t0, timed_out=True)
+            raise
+        self.checkout_stats.record_wait(time.perf_counter() - t0)
+        return conn
+
+
+def create_db_engine(db_url: str, pool_size: int = 5, max_overflow: int = 5,
+                     pool_timeout: float = 30, pool_recycle: int = 1800,
+                     statement_timeout_ms: int = 0):
+    engine = create_engine(
+        db_url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=pool_recycle,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+
+    # listener di level engine ikut dipasang ke pool baru setelah engine.dispose()
+    @event.listens_for(engine, "checkout")
+    def _count_checkout(_dbapi_conn, _record, _proxy):
+        engine.pool.checkout_stats.record_checkout()
+
+    @event.listens_for(engine, "connect")
+    def _count_connect(_dbapi_conn, _record):
+        # overflow sudah dinaikkan pool sebelum koneksi baru dibuka
+        engine.pool.checkout_stats.record_connect(engine.pool.overflow())
+
+    if statement_timeout_ms:
+        # di-SET per koneksi baru (bukan startup option "options", yang ditolak sebagian pooler)
+        @event.listens_for(engine, "connect")
+        def _set_statement_timeout(dbapi_conn, _record):
+            autocommit = dbapi_conn.autocommit
+            dbapi_conn.autocommit = True  # di luar transaksi: tidak ikut ter-rollback
+            with dbapi_conn.cursor() as cur:
+                cur.execute(f"SET statement_timeout = {int(statement_timeout_ms)}")
+            dbapi_conn.autocommit = autocommit
+
+    return engine
+
+
+# setelah replica gagal dihubungi, baca langsung dari primary selama jeda ini
+REPLICA_RETRY_SEC = 30
+_replica_down_until = {}
+
+
+@contextmanager
+def read_transaction(replica, primary, primary_only: bool = False):
+    """
+    Transaksi baca: pakai engine replica bila ada dan bisa terhubung, selain itu
+    engine primary. Hanya kegagalan koneksi yang di-fallback; error query tetap naik.
+    primary_only=True (mis. sesaat setelah tulisan lokal): replica dilewati, supaya
+    pembacaan melihat tulisan sendiri walau replica masih tertinggal.
+    """
+    conn = None
+    if replica is not None and not primary_only and time.monotonic() >= _replica_down_until.get(id(replica), 0):
+        try:
+            conn = replica.connect()
+        except OperationalError as e:
+            _replica_down_until[id(replica)] = time.monotonic() + REPLICA_RETRY_SEC
+            logger.warning("Read replica tidak bisa dihubungi, baca dari primary: %s", str(e.orig or e).strip())
+    if conn is None:
+        conn = primary.connect()
+    with conn, conn.begin():
+        yield conn
+
+
+def pool_stats(engine) -> dict:
+    """Ringkasan kondisi pool saat ini + counter checkout kumulatif."""
+    pool = engine.pool
+    out = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    stats = getattr(pool, "checkout_stats", None)
+    if stats is not None:
+        out.update(stats.snapshot())
+    return out
+
+
+class DataVersion:
+    """
+    Counter versi data (thread-safe). Dinaikkan setiap kali isi tabel responses
+    berubah, dan dipakai sebagai bagian key cache supaya hasil lama tidak terpakai lagi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+        self._bumped_at = None
+
+    def current(self) -> int:
+        with self._lock:
+            return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            self._bumped_at = time.monotonic()
+            return self._value
+
+    def changed_within(self, seconds: float) -> bool:
+        """True bila versi dinaikkan (tulisan di proses ini) dalam `seconds` detik terakhir."""
+        with self._lock:
+            return self._bumped_at is not None and time.monotonic() - self._bumped_at < seconds
@@ -0,0 +1,269 @@
+"""
+Draft / state responden: autosave progres + lanjutkan dengan token draft.
+
+State responden (tahap, profil, jawaban Performance/Importance, waktu mulai) disimpan
+dengan key token draft acak (bukan kode responden, yang tidak pernah masuk URL) di salah
+satu store; kolom `respondent_code` di tabel draft berisi token ini:
+
+- PostgresDraftStore: tabel response_drafts (dibagi semua proses/replica app);
+- SQLiteDraftStore: file SQLite lokal, pengganti untuk satu node / pengembangan.
+
+Mode sesi (default): penulisan di-coalesce oleh DraftWriter; perubahan dikumpulkan di
+memori dan ditulis thread latar belakang paling banyak sekali per DRAFT_SAVE_INTERVAL_SEC
+(semua draft yang berubah dalam satu transaksi), pindah tahap memicu tulis segera.
+Mode state bersama (RESPONDENT_STATE_BACKEND): setiap rerun langsung menulis ke store, jadi
+replica mana pun bisa melanjutkan sesi dari store. Jawaban Performance/Importance ada di dalam
+st.form dan baru sampai ke server saat tombol tahap diklik; jawaban tahap yang belum dikirim
+tidak tersimpan. Draft dihapus saat submission
+dikirim dan dibersihkan otomatis setelah DRAFT_TTL_DAYS (DraftPurger, di kedua mode).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_DRAFTS = text(
+    """
+    INSERT INTO response_drafts (respondent_code, state, updated_at)
+    SELECT d.respondent_code, d.state, now()
+    FROM jsonb_to_recordset(:rows) AS d(respondent_code text, state jsonb)
+    ON CONFLICT (respondent_code) DO UPDATE
+    SET state = EXCLUDED.state, updated_at = EXCLUDED.updated_at
+    """
+).bindparams(bindparam("rows", type_=JSONB))
+
+
+def save_drafts(conn, drafts: dict):
+    """drafts: {token: state}. Upsert semua dalam transaksi `conn`."""
+    if drafts:
+        rows = [{"respondent_code": token, "state": state} for token, state in drafts.items()]
+        conn.execute(_UPSERT_DRAFTS, {"rows": rows})
+
+
+def delete_drafts(conn, tokens: list):
+    if tokens:
+        conn.execute(text("DELETE FROM response_drafts WHERE respondent_code = ANY(:tokens)"), {"tokens": list(tokens)})
+
+
+def load_draft(conn, token: str, max_age_sec: float):
+    """State draft untuk token ini, atau None bila tidak ada / sudah kedaluwarsa."""
+    return conn.execute(
+        text(
+            """
+            SELECT state FROM response_drafts
+            WHERE respondent_code = :token
+              AND updated_at >= now() - make_interval(secs => :max_age)
+            """
+        ),
+        {"token": token, "max_age": max_age_sec},
+    ).scalar()
+
+
+def purge_drafts(conn, max_age_sec: float) -> int:
+    result = conn.execute(
+        text("DELETE FROM response_drafts WHERE updated_at < now() - make_interval(secs => :max_age)"),
+        {"max_age": max_age_sec},
+    )
+    return result.rowcount
+
+
+class PostgresDraftStore:
+    """Draft di tabel response_drafts. `prepare(engine)` (mis. ensure_schema) dijalankan sebelum tulis/baca pertama."""
+
+    def __init__(self, engine, prepare=None):
+        self.engine = engine
+        self.prepare = prepare
+        self._ready = threading.Event()
+
+    @contextmanager
+    def _begin(self):
+        if self.prepare is not None and not self._ready.is_set():
+            self.prepare(self.engine)
+            self._ready.set()
+        with self.engine.begin() as conn:
+            yield conn
+
+    def write(self, drafts: dict, deleted: list):
+        with self._begin() as conn:
+            save_drafts(conn, drafts)
+            delete_drafts(conn, deleted)
+
+    def load(self, token: str, max_age_sec: float):
+        with self._begin() as conn:
+            return load_draft(conn, token, max_age_sec)
+
+    def purge(self, max_age_sec: float) -> int:
+        with self._begin() as conn:
+            return purge_drafts(conn, max_age_sec)
+
+
+class SQLiteDraftStore:
+    """Draft di file SQLite lokal (WAL). Bisa dipakai beberapa proses di node yang sama."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_drafts (
+                    respondent_code TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def write(self, drafts: dict, deleted: list):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                """
+                INSERT INTO response_drafts (respondent_code, state, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (respondent_code) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                """,
+                [(token, json.dumps(state), now) for token, state in drafts.items()],
+            )
+            conn.executemany("DELETE FROM response_drafts WHERE respondent_code = ?", [(t,) for t in deleted])
+
+    def load(self, token: str, max_age_sec: float):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT state FROM response_drafts WHERE respondent_code = ? AND updated_at >= ?",
+                (token, time.time() - max_age_sec),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def purge(self, max_age_sec: float) -> int:
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute("DELETE FROM response_drafts WHERE updated_at < ?", (time.time() - max_age_sec,))
+            return cur.rowcount
+
+
+class DraftPurger:
+    """
+    Hapus draft yang lebih tua dari `ttl_sec` dari store, paling banyak sekali per
+    `every_sec` per proses. maybe_purge() dipanggil setelah tulis draft: oleh DraftWriter
+    (mode sesi) atau langsung setelah store.write() (mode state bersama).
+    """
+
+    PURGE_EVERY_SEC = 3600
+
+    def __init__(self, store, ttl_sec: float = 30 * 86400, every_sec: float = PURGE_EVERY_SEC):
+        self.store = store
+        self.ttl_sec = ttl_sec
+        self.every_sec = every_sec
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_purge(self) -> int:
+        """Jalankan purge bila jatuh tempo. Return jumlah draft yang dihapus (0 bila dilewati)."""
+        with self._lock:
+            if time.time() - self._last_purge <= self.every_sec:
+                return 0
+            # tandai lebih dulu: pemanggil bersamaan tidak ikut purge, gagal = coba lagi interval berikutnya
+            self._last_purge = time.time()
+        return self.store.purge(self.ttl_sec)
+
+
+class DraftWriter:
+    """
+    Coalescing writer untuk draft. save() hanya menyimpan state terbaru per token di
+    memori; thread latar belakang memanggil `store.write(drafts, deleted)` (satu transaksi)
+    setelah jendela `interval_sec`, atau segera bila save(..., flush=True).
+    Bila tulis gagal, perubahan dikembalikan ke antrian dan dicoba lagi di jendela berikutnya.
+    Draft yang lebih tua dari `ttl_sec` dihapus dari store paling banyak sekali per jam (DraftPurger).
+    """
+
+    def __init__(self, store, interval_sec: float = 5.0, ttl_sec: float = 30 * 86400):
+        self.store = store
+        self.interval_sec = interval_sec
+        self.ttl_sec = ttl_sec
+        self.purger = DraftPurger(store, ttl_sec)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._deleted = set()
+        self._wake = threading.Event()
+        self._urgent = threading.Event()
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name="draft-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def save(self, token: str, state: dict, flush: bool = False):
+        with self._lock:
+            self._pending[token] = state
+            self._deleted.discard(token)
+        if flush:
+            self._urgent.set()
+        self._wake.set()
+
+    def discard(self, token: str):
+        """Hapus draft (mis. setelah submit); perubahan yang belum ditulis dibuang."""
+        with self._lock:
+            self._pending.pop(token, None)
+            self._deleted.add(token)
+        self._urgent.set()
+        self._wake.set()
+
+    def load(self, token: str):
+        """State terbaru: yang belum sempat ditulis (bila ada), selain itu dari store."""
+        with self._lock:
+            if token in self._deleted:
+                return None
+            state = self._pending.get(token)
+        if state is not None:
+            return state
+        return self.store.load(token, self.ttl_sec)
+
+    def flush(self):
+        with self._lock:
+            drafts, self._pending = self._pending, {}
+            deleted, self._deleted = self._deleted, set()
+        if not (drafts or deleted):
+            return
+        try:
+            self.store.write(drafts, sorted(deleted))
+        except Exception:
+            with self._lock:
+                # jangan timpa perubahan yang datang selama tulis berlangsung
+                for code, state in drafts.items():
+                    if code not in self._deleted:
+                        self._pending.setdefault(code, state)
+                self._deleted |= {code for code in deleted if code not in self._pending}
+            raise
+        self.writes += 1
+        self.purger.maybe_purge()
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = len(self._pending) + len(self._deleted)
+        return {"queued": queued, "writes": self.writes, "alive": self._thread.is_alive()}
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # jendela coalescing: perubahan lain selama interval ikut tulis yang sama
+            self._urgent.wait(timeout=self.interval_sec)
+            self._wake.clear()
+            self._urgent.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("Simpan draft gagal, dicoba lagi", exc_info=True)
+                time.sleep(self.interval_sec)
+                self._wake.set()
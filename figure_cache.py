@@ -0,0 +1,65 @@
+"""
+Cache gambar plot IPA yang sudah di-render (bytes PNG), dengan eviction LRU.
+
+Plot IPA hanya bergantung pada label + mean Performance/Importance, cut-off, dan
+opsi plot (diagonal, garis kuadran trimmed, judul). Key cache = hash dari semua
+input itu, jadi rerun admin / sesi lain dengan data yang sama langsung memakai
+PNG yang tersimpan tanpa menyentuh Matplotlib sama sekali.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def figure_key(kind: str, stats, label_col: str, x_cut, y_cut, **options) -> str:
+    """Hash isi plot: label + titik (mean P/I) + cut-off + opsi plot."""
+    h = hashlib.sha1()
+    h.update(repr((kind, label_col, sorted(options.items()))).encode())
+    h.update(repr(stats[label_col].tolist()).encode())
+    points = stats[["Performance_mean", "Importance_mean"]].to_numpy(dtype=float)
+    h.update(np.ascontiguousarray(points).tobytes())
+    h.update(np.array([x_cut, y_cut], dtype=float).tobytes())
+    return h.hexdigest()
+
+
+class FigureCache:
+    """LRU {key: bytes}, aman dipakai bersama oleh beberapa sesi (thread) Streamlit."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: str, render) -> bytes:
+        """Bytes untuk `key`; bila belum ada, panggil render() -> bytes lalu simpan."""
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        # render di luar lock: sesi lain tidak menunggu Matplotlib
+        data = render()
+        if self.max_entries <= 0:
+            return data
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": sum(len(v) for v in self._items.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
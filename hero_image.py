@@ -0,0 +1,89 @@
+"""
+Varian gambar hero halaman utama (ukuran slot 650 px, 1x dan 2x; WebP + PNG fallback).
+
+hero.png asli (~3000 px, ~1.5 MB) jauh lebih besar dari yang dibutuhkan slotnya.
+Varian dibuat sekali ke static/hero/ (dilayani Streamlit di app/static/hero/ bila
+server.enableStaticServing aktif) dan hanya dibuat ulang bila hero.png lebih baru
+dari varian yang ada. Browser memilih sendiri lewat <picture> + srcset.
+
+    python hero_image.py    # buat varian sekarang (mis. sebagai langkah build)
+"""
+import os
+import sys
+
+HERO_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hero.png")
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+HERO_SUBDIR = "hero"
+HERO_WIDTH = 650
+SCALES = (1, 2)
+FORMATS = {
+    # PNG hanya fallback untuk browser tanpa WebP; palet adaptif menjaga ukurannya tetap kecil
+    "webp": dict(format="WEBP", quality=80, method=6),
+    "png": dict(format="PNG", optimize=True),
+}
+
+
+def variant_name(width: int, ext: str) -> str:
+    return f"hero-{width}w.{ext}"
+
+
+def ensure_variants(src: str = HERO_SRC, static_dir: str = STATIC_DIR, width: int = HERO_WIDTH) -> dict:
+    """
+    Buat varian yang belum ada / lebih tua dari `src`. Return {(skala, ext): path relatif ke static_dir}.
+    """
+    out_dir = os.path.join(static_dir, HERO_SUBDIR)
+    os.makedirs(out_dir, exist_ok=True)
+    src_mtime = os.path.getmtime(src)
+
+    variants = {}
+    image = None
+    for scale in SCALES:
+        w = width * scale
+        for ext, save_opts in FORMATS.items():
+            name = variant_name(w, ext)
+            path = os.path.join(out_dir, name)
+            variants[(scale, ext)] = f"{HERO_SUBDIR}/{name}"
+            if os.path.exists(path) and os.path.getmtime(path) >= src_mtime:
+                continue
+            if image is None:
+                # Pillow hanya dimuat bila memang ada varian yang perlu dibuat
+                from PIL import Image
+
+                image = Image.open(src)
+                image.load()
+            resized = image.resize((w, round(image.height * w / image.width)), Image.LANCZOS)
+            if ext == "png":
+                resized = resized.convert("RGB").quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+            # tulis ke file sementara lalu rename: proses lain tidak pernah melihat file setengah jadi
+            tmp = f"{path}.{os.getpid()}.tmp"
+            resized.save(tmp, **save_opts)
+            os.replace(tmp, path)
+    return variants
+
+
+def picture_html(variants: dict, url_prefix: str = "app/static", width: int = HERO_WIDTH, alt: str = "") -> str:
+    """<picture> dengan srcset 1x/2x: WebP untuk browser yang mendukung, PNG sebagai fallback."""
+
+    def srcset(ext):
+        return ", ".join(f"{url_prefix}/{variants[(s, ext)]} {s}x" for s in SCALES)
+
+    return (
+        "<picture>"
+        f'<source type="image/webp" srcset="{srcset("webp")}">'
+        f'<img src="{url_prefix}/{variants[(1, "png")]}" srcset="{srcset("png")}" alt="{alt}" '
+        f'width="{width}" style="max-width:100%;height:auto;" decoding="async">'
+        "</picture>"
+    )
+
+
+def main(argv=None):
+    variants = ensure_variants()
+    for (scale, ext), rel in sorted(variants.items()):
+        path = os.path.join(STATIC_DIR, rel)
+        print(f"{scale}x {ext:<5} {os.path.getsize(path) / 1024:>7.0f} KB  {path}")
+    print(f"asli      {os.path.getsize(HERO_SRC) / 1024:>7.0f} KB  {HERO_SRC}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
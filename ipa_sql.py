@@ -0,0 +1,84 @@
+"""
+Agregasi statistik IPA langsung di Postgres.
+
+Alih-alih mengirim semua baris JSONB ke Python, min/max/mean/count per item (dan
+per dimensi) dihitung lewat jsonb_each_text(performance/importance). Hasilnya
+berbentuk sama dengan statistik versi pandas sebelum klasifikasi kuadran
+(satu baris per item / dimensi), jadi ukuran hasil tidak bergantung jumlah respons.
+"""
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from answers_sql import answers_cte, dim_map_cte
+from survey_items import DIM_ABBR, DIM_CODES, ITEM_CODES
+
+_KINDS = ("Performance", "Importance")
+
+
+def wide_stats(rows, key_col: str, keys: list) -> pd.DataFrame:
+    """Baris (kind, key, min, max, mean, n) -> satu baris per key, kolom {kind}_{stat}."""
+    long = pd.DataFrame(rows, columns=["kind", key_col, "min", "max", "mean", "n"])
+    out = pd.DataFrame({key_col: keys})
+    for kind in _KINDS:
+        part = long[long["kind"] == kind].set_index(key_col)
+        for stat in ("min", "max", "mean"):
+            out[f"{kind}_{stat}"] = pd.to_numeric(out[key_col].map(part[stat]), errors="coerce").astype(float)
+    for kind in _KINDS:
+        part = long[long["kind"] == kind].set_index(key_col)
+        out[f"{kind}_n"] = out[key_col].map(part["n"]).fillna(0).astype(np.int64)
+    return out
+
+
+def item_stats_sql(conn, where: str = "", params: dict = None) -> pd.DataFrame:
+    """
+    Statistik per item untuk respons yang lolos `where` (klausa WHERE pada tabel responses).
+    Kolom: Item, {Performance,Importance}_{min,max,mean}, {Performance,Importance}_n.
+    """
+    rows = conn.execute(
+        text(
+            f"""
+            WITH {answers_cte(where)}
+            SELECT kind, item, MIN(num), MAX(num), AVG(num), COUNT(num)
+            FROM answers
+            GROUP BY kind, item
+            """
+        ),
+        params or {},
+    ).fetchall()
+    return wide_stats(rows, "Item", ITEM_CODES)
+
+
+def dimension_stats_sql(conn, where: str = "", params: dict = None) -> pd.DataFrame:
+    """
+    Statistik per dimensi: skor dimensi per responden = rata-rata item numerik pada
+    dimensi itu (item kosong dilewati), lalu min/max/mean skor antar responden.
+    """
+    rows = conn.execute(
+        text(
+            f"""
+            WITH {answers_cte(where)},
+            {dim_map_cte()},
+            per_respondent AS (
+                SELECT a.kind, m.dim, a.id, AVG(a.num) AS score
+                FROM answers a
+                JOIN dim_map m ON m.item = a.item
+                GROUP BY a.kind, m.dim, a.id
+            )
+            SELECT kind, dim, MIN(score), MAX(score), AVG(score), COUNT(score)
+            FROM per_respondent
+            GROUP BY kind, dim
+            """
+        ),
+        params or {},
+    ).fetchall()
+
+    return dimension_wide_stats(rows)
+
+
+def dimension_wide_stats(rows) -> pd.DataFrame:
+    abbrs = list(DIM_ABBR.values())
+    out = wide_stats(rows, "Dimension", abbrs)
+    out.insert(1, "Dimension_name", [dim for dim in DIM_ABBR])
+    out.insert(2, "n_items", [len(DIM_CODES.get(abbr, [])) for abbr in abbrs])
+    return out
@@ -0,0 +1,168 @@
+"""
+Statistik IPA dari frame respons (jalur IPA_STATS_SOURCE = "python") + klasifikasi kuadran.
+
+Frame hasil flatten_responses diubah SEKALI menjadi array skor berukuran
+(n_respondents, len(ITEM_CODES), 2) — sumbu terakhir: Performance, Importance —
+lalu min/max/mean/n semua item dihitung dengan reduksi NumPy yang mengabaikan NaN.
+Skor dimensi per responden (rata-rata item numerik di dimensi itu, item kosong
+dilewati) dihitung dari array yang sama lewat satu perkalian matriks dengan
+matriks keanggotaan item -> dimensi. Hasilnya identik dengan versi pandas
+sebelumnya (pd.to_numeric + mean skipna per item / per dimensi).
+
+classify_ipa dipakai bersama oleh jalur ini dan jalur agregasi SQL / ringkasan.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from survey_items import DIM_ABBR, DIM_CODES, ITEM_CODES
+
+KINDS = ("Performance", "Importance")
+# jumlah jawaban valid per key: dipakai untuk membandingkan sumber statistik, tidak ditampilkan di dashboard
+COUNT_COLS = tuple(f"{kind}_n" for kind in KINDS)
+
+QUAD_ORDER = [
+    "I - Concentrate Here",
+    "II - Keep Up the Good Work",
+    "III - Low Priority",
+    "IV - Possible Overkill",
+]
+
+SCORE_COLS = [f"{code}_{kind}" for code in ITEM_CODES for kind in KINDS]
+
+DIM_ABBRS = list(DIM_ABBR.values())
+
+
+def _membership_matrix() -> np.ndarray:
+    """(item, dimensi): 1.0 bila item termasuk dimensi (urutan ITEM_CODES x DIM_ABBRS)."""
+    item_index = {code: i for i, code in enumerate(ITEM_CODES)}
+    m = np.zeros((len(ITEM_CODES), len(DIM_ABBRS)))
+    for d, abbr in enumerate(DIM_ABBRS):
+        for code in DIM_CODES.get(abbr, []):
+            if code in item_index:
+                m[item_index[code], d] = 1.0
+    return m
+
+
+DIM_MEMBERSHIP = _membership_matrix()
+
+
+def score_array(df_flat: pd.DataFrame) -> np.ndarray:
+    """
+    Frame lebar ({code}_Performance / {code}_Importance) -> array float (n, item, 2).
+    Nilai non-numerik & kolom yang tidak ada menjadi NaN (padanan pd.to_numeric(errors="coerce")).
+    """
+    n = 0 if df_flat is None else len(df_flat)
+    if n == 0:
+        return np.empty((0, len(ITEM_CODES), len(KINDS)))
+
+    frame = df_flat.reindex(columns=SCORE_COLS)
+    # kolom dari flatten_responses sudah numerik; hanya kolom object/teks yang perlu di-coerce
+    text_cols = [c for c in SCORE_COLS if not is_numeric_dtype(frame[c])]
+    if text_cols:
+        frame[text_cols] = frame[text_cols].apply(pd.to_numeric, errors="coerce")
+    values = frame.to_numpy(dtype=float, na_value=np.nan)
+    return values.reshape(n, len(ITEM_CODES), len(KINDS))
+
+
+def nan_stats(values: np.ndarray):
+    """
+    Reduksi NaN-aware sepanjang sumbu responden (sumbu 0): (min, max, mean, count),
+    masing-masing berbentuk values.shape[1:].
+    """
+    # responden di sumbu terakhir (contiguous): urutan penjumlahan sama dengan Series.mean
+    by_key = np.ascontiguousarray(np.moveaxis(values, 0, -1))
+    missing = np.isnan(by_key)
+    count = by_key.shape[-1] - np.count_nonzero(missing, axis=-1)
+    sums = np.where(missing, 0.0, by_key).sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(count > 0, sums / count, np.nan)
+    if by_key.shape[-1] == 0:
+        return np.full(count.shape, np.nan), np.full(count.shape, np.nan), means, count
+    # fmin/fmax mengabaikan NaN; hasil NaN hanya bila semua NaN (sama dengan Series.min/max)
+    return np.fmin.reduce(by_key, axis=-1), np.fmax.reduce(by_key, axis=-1), means, count
+
+
+def stats_frame(label_col: str, labels: list, values: np.ndarray) -> pd.DataFrame:
+    """values (n, key, 2) -> satu baris per key: {kind}_{min,max,mean}, {kind}_n."""
+    mins, maxs, means, count = nan_stats(values)
+    out = {label_col: labels}
+    for k, kind in enumerate(KINDS):
+        out[f"{kind}_min"] = mins[:, k]
+        out[f"{kind}_max"] = maxs[:, k]
+        out[f"{kind}_mean"] = means[:, k]
+    for k, kind in enumerate(KINDS):
+        out[f"{kind}_n"] = count[:, k].astype(np.int64)
+    return pd.DataFrame(out)
+
+
+def item_stats(values: np.ndarray) -> pd.DataFrame:
+    """values = score_array(df_flat)."""
+    return stats_frame("Item", list(ITEM_CODES), values)
+
+
+def dimension_scores(values: np.ndarray) -> np.ndarray:
+    """
+    (n, item, 2) -> (n, dimensi, 2): rata-rata item yang terisi per dimensi,
+    NaN bila tidak ada item terisi (sama dengan DataFrame.mean(axis=1, skipna=True)).
+    """
+    missing = np.isnan(values)
+    # kind di depan: (2, n, item) @ (item, dimensi) -> (2, n, dimensi)
+    sums = np.moveaxis(np.where(missing, 0.0, values), -1, 0) @ DIM_MEMBERSHIP
+    counts = np.moveaxis(~missing, -1, 0).astype(float) @ DIM_MEMBERSHIP
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(counts > 0, sums / counts, np.nan)
+    return np.moveaxis(scores, 0, -1)
+
+
+def dimension_stats(values: np.ndarray) -> pd.DataFrame:
+    """values = score_array(df_flat). Kolom sama dengan ipa_sql.dimension_stats_sql."""
+    out = stats_frame("Dimension", DIM_ABBRS, dimension_scores(values))
+    out.insert(1, "Dimension_name", list(DIM_ABBR))
+    out.insert(2, "n_items", [len(DIM_CODES.get(abbr, [])) for abbr in DIM_ABBRS])
+    return out
+
+
+def classify_ipa(stats: pd.DataFrame, label_col: str):
+    """
+    Tambah Gap + kuadran (Versi 1 & 2) ke tabel statistik (item atau dimensi).
+    Dipakai bersama oleh jalur pandas dan jalur agregasi SQL.
+    """
+    stats = stats.copy()
+    stats["Gap_mean(P-I)"] = stats["Performance_mean"] - stats["Importance_mean"]
+
+    # cut-off data-centered
+    x_cut = float(stats["Performance_mean"].mean(skipna=True))
+    y_cut = float(stats["Importance_mean"].mean(skipna=True))
+
+    x = stats["Performance_mean"].to_numpy(dtype=float)
+    y = stats["Importance_mean"].to_numpy(dtype=float)
+    na = np.isnan(x) | np.isnan(y)
+    q1, q2, q3, q4 = QUAD_ORDER
+
+    # --- Versi 1 (tanpa diagonal): klasik 4 kuadran (x_cut, y_cut) ---
+    quadrant_v1 = np.select(
+        [na, (y >= y_cut) & (x < x_cut), (y >= y_cut) & (x >= x_cut), (y < y_cut) & (x < x_cut)],
+        ["NA", q1, q2, q3],
+        default=q4,
+    )
+
+    # --- Versi 2 (dengan diagonal): aturan sesuai definisi user ---
+    # Q1: semua titik DI ATAS diagonal (y = x + b, lewat (x_cut, y_cut))
+    # Q2: DI BAWAH diagonal & DI ATAS garis horizontal (y_cut)
+    # Q3: DI BAWAH diagonal & DI KIRI garis vertikal (x_cut)
+    # Q4: DI BAWAH diagonal & DI BAWAH horizontal (y_cut) & DI KANAN vertikal (x_cut)
+    b = y_cut - x_cut
+    quadrant_v2 = np.select(
+        [na, y >= x + b, y >= y_cut, x < x_cut],
+        ["NA", q1, q2, q3],
+        default=q4,
+    )
+
+    stats["Quadrant_v1"] = quadrant_v1.tolist()
+    stats["Quadrant_v2"] = quadrant_v2.tolist()
+
+    quad_lists_v1 = {q: stats.loc[stats["Quadrant_v1"] == q, label_col].tolist() for q in QUAD_ORDER}
+    quad_lists_v2 = {q: stats.loc[stats["Quadrant_v2"] == q, label_col].tolist() for q in QUAD_ORDER}
+
+    return stats, x_cut, y_cut, quad_lists_v1, quad_lists_v2
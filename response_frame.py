@@ -0,0 +1,127 @@
+"""
+Flatten baris tabel responses (meta/performance/importance JSONB) menjadi
+DataFrame lebar yang dipakai dashboard admin.
+
+Semua kolom dibangun secara kolumnar: matriks item dibuat sekali untuk seluruh
+baris, dan setiap kolom waktu di-parse + dikonversi timezone sekali (bukan per baris).
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from survey_items import ITEM_CODES, LOCAL_TZ
+from typed_scores import scores_array
+
+BASE_COLS = ["id", "created_at", "respondent_code"]
+
+
+def local_date_range(start_date, end_date):
+    """
+    Tanggal lokal (inklusif) -> rentang waktu [start, end) tz-aware untuk dipakai
+    sebagai predikat SQL pada kolom submitted_at.
+    """
+    tz = ZoneInfo(LOCAL_TZ)
+    start = datetime.combine(start_date, time.min, tzinfo=tz)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+def _parse_utc(values, iso_strings: bool = False) -> pd.Series:
+    values = pd.Series(values, dtype="object")
+    if iso_strings:
+        # meta.*_at_utc ditulis app via datetime.isoformat() (dengan/tanpa mikrodetik)
+        return pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+    return pd.to_datetime(values, utc=True, errors="coerce")
+
+
+def _item_frame(answers: list, suffix: str) -> pd.DataFrame:
+    items = pd.DataFrame.from_records(answers, columns=ITEM_CODES)
+    return items.add_suffix(f"_{suffix}")
+
+
+def _score_matrix(arrays: list) -> np.ndarray:
+    """
+    Array skor -> matriks float (baris, len(ITEM_CODES)). Array yang lebih pendek (ditulis
+    sebelum item baru ditambahkan di akhir ITEMS) diisi NaN; yang lebih panjang dipotong.
+    """
+    width = len(ITEM_CODES)
+    if all(len(a) == width for a in arrays):
+        return np.array(arrays, dtype=float).reshape(len(arrays), width)
+    values = np.full((len(arrays), width), np.nan)
+    for i, a in enumerate(arrays):
+        a = a[:width]
+        values[i, : len(a)] = np.array(a, dtype=float)
+    return values
+
+
+def _scores_frame(arrays: list, suffix: str) -> pd.DataFrame:
+    """Array skor (urutan ITEM_CODES, None = kosong) -> frame item; kolom tanpa NaN tetap int64."""
+    values = _score_matrix(arrays)
+    items = pd.DataFrame(values, columns=ITEM_CODES)
+    complete = [code for code, has_nan in zip(ITEM_CODES, np.isnan(values).any(axis=0)) if not has_nan]
+    items[complete] = items[complete].astype(np.int64)
+    return items.add_suffix(f"_{suffix}")
+
+
+def flatten_responses(rows) -> pd.DataFrame:
+    """
+    rows: hasil SELECT id, created_at, respondent_code, meta, performance, importance
+    (opsional + perf_scores, imp_scores: bila ada, matriks item dibaca dari array bertipe;
+    baris yang array-nya masih NULL memakai JSONB).
+    Nama kolom output sama dengan versi per-baris sebelumnya
+    (meta_*, {code}_Performance, {code}_Importance, *_utc/_local, effective_time_local).
+    """
+    if not rows:
+        return pd.DataFrame(columns=BASE_COLS)
+
+    typed = hasattr(rows[0], "perf_scores")
+    ids, created, codes, metas, perfs, imps = [], [], [], [], [], []
+    for r in rows:
+        ids.append(r.id)
+        created.append(r.created_at)
+        codes.append(r.respondent_code)
+        metas.append(r.meta or {})
+        if typed:
+            perfs.append(r.perf_scores if r.perf_scores is not None else scores_array(r.performance))
+            imps.append(r.imp_scores if r.imp_scores is not None else scores_array(r.importance))
+        else:
+            perfs.append(r.performance or {})
+            imps.append(r.importance or {})
+
+    meta = pd.DataFrame.from_records(metas, index=pd.RangeIndex(len(metas)))
+
+    def _meta_col(key):
+        return meta[key] if key in meta.columns else [None] * len(meta)
+
+    created_at_utc = _parse_utc(created)
+    started_at_utc = _parse_utc(_meta_col("started_at_utc"), iso_strings=True)
+    submitted_at_utc = _parse_utc(_meta_col("submitted_at_utc"), iso_strings=True)
+
+    created_at_local = created_at_utc.dt.tz_convert(LOCAL_TZ)
+    started_at_local = started_at_utc.dt.tz_convert(LOCAL_TZ)
+    submitted_at_local = submitted_at_utc.dt.tz_convert(LOCAL_TZ)
+
+    base = pd.DataFrame(
+        {
+            "id": ids,
+            "created_at": created_at_utc,
+            "respondent_code": codes,
+            "created_at_utc": created_at_utc,
+            "created_at_local": created_at_local,
+            "meta_started_at_utc_dt": started_at_utc,
+            "meta_submitted_at_utc_dt": submitted_at_utc,
+            "meta_started_at_local": started_at_local,
+            "meta_submitted_at_local": submitted_at_local,
+            "effective_time_local": submitted_at_local.fillna(created_at_local),
+        }
+    )
+
+    item_frame = _scores_frame if typed else _item_frame
+    perf = item_frame(perfs, "Performance")
+    imp = item_frame(imps, "Importance")
+    item_cols = [col for code in ITEM_CODES for col in (f"{code}_Performance", f"{code}_Importance")]
+    items = pd.concat([perf, imp], axis=1)[item_cols]
+
+    return pd.concat([base, meta.add_prefix("meta_"), items], axis=1)
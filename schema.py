@@ -0,0 +1,396 @@
+"""
+Bootstrap + migrasi skema database (tabel responses dan turunannya).
+
+Setiap migrasi punya nomor versi; versi yang sudah diterapkan dicatat di tabel
+schema_migrations, jadi proses baru hanya menjalankan migrasi yang belum ada.
+Statement di dalam migrasi juga idempotent (IF NOT EXISTS), sehingga database
+lama yang sebagian skemanya sudah dibuat (manual / versi app sebelumnya) tetap
+bisa dimigrasi. Setiap migrasi berjalan + dicatat dalam transaksinya sendiri, jadi
+migrasi yang gagal tidak membatalkan (dan tidak memaksa mengulang) migrasi sebelumnya.
+Advisory lock mencegah dua proses menjalankan DDL bersamaan.
+
+    python schema.py status               # versi yang sudah/belum diterapkan
+    python schema.py migrate              # terapkan migrasi yang belum ada
+    python schema.py archive-duplicates   # pindahkan respondent_code ganda (sebelum migrasi 7)
+"""
+import argparse
+import logging
+import os
+import sys
+
+from sqlalchemy import text
+
+import summary
+
+# kunci advisory (bebas, asal konsisten) untuk serialisasi DDL antar proses
+SCHEMA_LOCK_KEY = 7_420_301
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# baris responses dengan respondent_code ganda (selain id terkecil) dipindah ke sini oleh
+# `python schema.py archive-duplicates`
+DUPLICATES_TABLE = "responses_duplicates"
+
+logger = logging.getLogger(__name__)
+
+
+def _rebuild_summary_if_empty(conn):
+    # tabel ringkasan yang baru dibuat masih kosong: isi sekali dari responses
+    if not conn.execute(text("SELECT EXISTS (SELECT 1 FROM responses_daily_summary)")).scalar():
+        summary.rebuild(conn)
+
+
+def _check_unique_respondent_code(conn):
+    dupes = conn.execute(
+        text(
+            """
+            SELECT respondent_code, COUNT(*) AS n
+            FROM responses
+            WHERE respondent_code IS NOT NULL
+            GROUP BY respondent_code
+            HAVING COUNT(*) > 1
+            ORDER BY n DESC, respondent_code
+            LIMIT 10
+            """
+        )
+    ).fetchall()
+    if dupes:
+        listed = ", ".join(f"{code} ({n}x)" for code, n in dupes)
+        raise RuntimeError(
+            "Tidak bisa membuat unique index pada responses.respondent_code: "
+            f"ada respondent_code ganda, mis. {listed}. "
+            "Hapus/perbaiki baris duplikat tersebut, lalu jalankan ulang aplikasi."
+        )
+
+
+def _columns(conn, table: str) -> dict:
+    """{nama kolom: tipe} tabel `table`, urut posisi kolom."""
+    rows = conn.execute(
+        text(
+            """
+            SELECT attname, format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = to_regclass(:table) AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum
+            """
+        ),
+        {"table": table},
+    ).fetchall()
+    return dict(rows)
+
+
+def archive_duplicate_respondent_codes(conn) -> int:
+    """
+    Per respondent_code, pertahankan baris dengan id terkecil (submit pertama) dan
+    pindahkan sisanya ke DUPLICATES_TABLE, supaya migrasi 7 (unique index) bisa jalan.
+    Langkah eksplisit (`python schema.py archive-duplicates`), tidak pernah dijalankan
+    otomatis saat app start. Return jumlah baris yang dipindah.
+    """
+    # LIKE tanpa INCLUDING: kolom generated (platform) jadi kolom biasa, tanpa default/sequence
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DUPLICATES_TABLE} (LIKE responses)"))
+    conn.execute(
+        text(f"ALTER TABLE {DUPLICATES_TABLE} ADD COLUMN IF NOT EXISTS archived_at timestamptz NOT NULL DEFAULT now()")
+    )
+    # kolom yang ditambahkan ke responses setelah arsip dibuat ikut ditambahkan ke arsip;
+    # insert memakai daftar kolom eksplisit, jadi urutan kolom kedua tabel tidak harus sama
+    archived = _columns(conn, DUPLICATES_TABLE)
+    columns = _columns(conn, "responses")
+    for name, type_ in columns.items():
+        if name not in archived:
+            conn.execute(text(f'ALTER TABLE {DUPLICATES_TABLE} ADD COLUMN "{name}" {type_}'))
+    cols = ", ".join(f'"{name}"' for name in columns)
+    moved = conn.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM responses r
+                USING (
+                    SELECT id, row_number() OVER (PARTITION BY respondent_code ORDER BY id) AS rn
+                    FROM responses
+                    WHERE respondent_code IS NOT NULL
+                ) d
+                WHERE r.id = d.id AND d.rn > 1
+                RETURNING r.*
+            )
+            INSERT INTO {DUPLICATES_TABLE} ({cols}, archived_at)
+            SELECT {cols}, now() FROM moved
+            """
+        )
+    ).rowcount
+    logger.warning(
+        "%d baris responses dengan respondent_code ganda dipindah ke %s (yang dipertahankan: id terkecil)",
+        moved, DUPLICATES_TABLE,
+    )
+    if moved:
+        summary.rebuild(conn)
+    return moved
+
+
+# (versi, deskripsi, langkah). Langkah = SQL string atau fungsi(conn).
+# Jangan ubah migrasi yang sudah dirilis; tambahkan versi baru di akhir.
+MIGRATIONS = [
+    (
+        1,
+        "tabel responses",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                id bigserial PRIMARY KEY,
+                created_at timestamptz NOT NULL DEFAULT now(),
+                respondent_code text,
+                meta jsonb,
+                performance jsonb,
+                importance jsonb
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        "kolom + index platform",
+        [
+            # platform ternormalisasi (sama dengan TRIM(COALESCE(meta->>'platform',''))),
+            # disimpan sebagai kolom supaya filter/hapus per platform bisa memakai index
+            """
+            ALTER TABLE responses
+            ADD COLUMN IF NOT EXISTS platform text
+            GENERATED ALWAYS AS (btrim(COALESCE(meta->>'platform', ''))) STORED
+            """,
+            "CREATE INDEX IF NOT EXISTS responses_platform_idx ON responses (platform)",
+        ],
+    ),
+    (
+        3,
+        "kolom + trigger + index submitted_at",
+        [
+            # waktu submit sebagai kolom asli: meta.submitted_at_utc, fallback created_at.
+            # Cast text -> timestamptz tidak IMMUTABLE, jadi diisi trigger (bukan generated column).
+            """
+            CREATE OR REPLACE FUNCTION responses_try_timestamptz(v text) RETURNS timestamptz
+            LANGUAGE plpgsql STABLE AS $$
+            BEGIN
+                RETURN NULLIF(btrim(v), '')::timestamptz;
+            EXCEPTION WHEN others THEN
+                RETURN NULL;
+            END
+            $$
+            """,
+            "ALTER TABLE responses ADD COLUMN IF NOT EXISTS submitted_at timestamptz",
+            """
+            CREATE OR REPLACE FUNCTION responses_set_submitted_at() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF NEW.submitted_at IS NULL THEN
+                    NEW.submitted_at := COALESCE(
+                        responses_try_timestamptz(NEW.meta->>'submitted_at_utc'),
+                        NEW.created_at,
+                        now()
+                    );
+                END IF;
+                RETURN NEW;
+            END
+            $$
+            """,
+            "DROP TRIGGER IF EXISTS responses_set_submitted_at ON responses",
+            """
+            CREATE TRIGGER responses_set_submitted_at
+            BEFORE INSERT ON responses
+            FOR EACH ROW EXECUTE FUNCTION responses_set_submitted_at()
+            """,
+            """
+            UPDATE responses
+            SET submitted_at = COALESCE(responses_try_timestamptz(meta->>'submitted_at_utc'), created_at)
+            WHERE submitted_at IS NULL
+            """,
+            "CREATE INDEX IF NOT EXISTS responses_submitted_at_idx ON responses (submitted_at)",
+        ],
+    ),
+    (
+        4,
+        "index (created_at, id)",
+        [
+            # urutan + keyset pagination load_all_responses: (created_at, id) DESC;
+            # juga melayani filter/urutan pada created_at saja (kolom pertama index)
+            "CREATE INDEX IF NOT EXISTS responses_created_at_id_idx ON responses (created_at DESC, id DESC)",
+        ],
+    ),
+    (
+        5,
+        "tabel ringkasan harian",
+        [
+            # statistik cukup per (platform, hari lokal, item/dimensi, P/I); lihat summary.py
+            """
+            CREATE TABLE IF NOT EXISTS responses_daily_summary (
+                platform text NOT NULL,
+                day date NOT NULL,
+                level text NOT NULL,
+                key text NOT NULL,
+                kind text NOT NULL,
+                n bigint NOT NULL,
+                sum double precision NOT NULL,
+                sumsq double precision NOT NULL,
+                min double precision NOT NULL,
+                max double precision NOT NULL,
+                PRIMARY KEY (level, platform, day, key, kind)
+            )
+            """,
+            _rebuild_summary_if_empty,
+        ],
+    ),
+    (
+        6,
+        "skor bertipe perf_scores / imp_scores",
+        [
+            # urutan ITEM_CODES, diisi dual-write + backfill; lihat typed_scores.py
+            "ALTER TABLE responses ADD COLUMN IF NOT EXISTS perf_scores smallint[]",
+            "ALTER TABLE responses ADD COLUMN IF NOT EXISTS imp_scores smallint[]",
+        ],
+    ),
+    (
+        7,
+        "unique respondent_code + GIN meta",
+        [
+            _check_unique_respondent_code,
+            "CREATE UNIQUE INDEX IF NOT EXISTS responses_respondent_code_key ON responses (respondent_code)",
+            # filter containment pada meta (meta @> '{"platform": ...}')
+            "CREATE INDEX IF NOT EXISTS responses_meta_gin_idx ON responses USING gin (meta jsonb_path_ops)",
+        ],
+    ),
+    (
+        8,
+        "tabel draft responden",
+        [
+            # progres kuesioner yang belum disubmit (autosave + lanjutkan); lihat drafts.py
+            """
+            CREATE TABLE IF NOT EXISTS response_drafts (
+                respondent_code text PRIMARY KEY,
+                state jsonb NOT NULL,
+                updated_at timestamptz NOT NULL DEFAULT now()
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS response_drafts_updated_at_idx ON response_drafts (updated_at)",
+        ],
+    ),
+    (
+        9,
+        "hapus index GIN meta",
+        [
+            # dibuat oleh migrasi 7; tidak ada query meta @> yang memakainya,
+            # jadi hanya menambah biaya setiap insert
+            "DROP INDEX IF EXISTS responses_meta_gin_idx",
+        ],
+    ),
+    (
+        10,
+        "antrian ringkasan harian",
+        [
+            # id respons yang belum dilipat ke responses_daily_summary; lihat summary.apply_pending
+            "CREATE TABLE IF NOT EXISTS responses_summary_pending (id bigint PRIMARY KEY)",
+        ],
+    ),
+    (
+        11,
+        "ringkasan harian dengan aturan Likert",
+        [
+            # jawaban di luar skala 1-6 / bukan bilangan bulat tidak lagi dihitung (typed_scores.likert_sql);
+            # ringkasan lama masih memuatnya
+            summary.rebuild,
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def applied_versions(conn) -> set:
+    exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": MIGRATIONS_TABLE}).scalar()
+    if not exists:
+        return set()
+    return {v for (v,) in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+
+def _apply_migration(conn, version: int, description: str, steps) -> bool:
+    """Satu migrasi dalam transaksi `conn` (di bawah advisory lock). False bila proses lain sudah menerapkannya."""
+    # DDL + backfill bisa lama di tabel besar: jangan terpotong statement_timeout engine
+    conn.execute(text("SET LOCAL statement_timeout = 0"))
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+    if version in applied_versions(conn):  # dibaca ulang setelah lock
+        return False
+    for step in steps:
+        if callable(step):
+            step(conn)
+        else:
+            conn.execute(text(step))
+    conn.execute(
+        text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description) VALUES (:version, :description)"),
+        {"version": version, "description": description},
+    )
+    return True
+
+
+def ensure_schema(engine) -> list:
+    """
+    Terapkan migrasi yang belum ada, masing-masing dalam transaksinya sendiri.
+    Return versi yang baru diterapkan; migrasi yang gagal menghentikan proses (exception)
+    tetapi migrasi sebelumnya tetap tersimpan.
+    """
+    # jalur cepat: semua versi sudah tercatat -> tanpa lock / DDL
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    if LATEST_VERSION in done:
+        return []
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        conn.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                    version integer PRIMARY KEY,
+                    description text NOT NULL,
+                    applied_at timestamptz NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            if _apply_migration(conn, version, description, steps):
+                applied.append(version)
+    return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap / migrasi skema database.")
+    parser.add_argument("command", choices=["status", "migrate", "archive-duplicates"])
+    parser.add_argument("--db-url", default=os.getenv("SUPABASE_DB_URL", ""))
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        parser.error("Set SUPABASE_DB_URL atau gunakan --db-url.")
+
+    from db import create_db_engine
+
+    engine = create_db_engine(args.db_url, pool_size=1, max_overflow=0)
+    if args.command == "archive-duplicates":
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+            moved = archive_duplicate_respondent_codes(conn)
+        print(f"{moved} baris dengan respondent_code ganda dipindah ke {DUPLICATES_TABLE}.")
+        return 0
+    if args.command == "migrate":
+        applied = ensure_schema(engine)
+        print(f"Migrasi diterapkan: {applied or 'tidak ada (skema sudah terbaru)'}.")
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    for version, description, _ in MIGRATIONS:
+        print(f"{'x' if version in done else ' '} {version:>3}  {description}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
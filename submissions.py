@@ -0,0 +1,330 @@
+"""
+Penulisan submission responden ke database.
+
+- insert_submissions: satu atau banyak submission -> satu INSERT multi-baris ke
+  responses + antrian ringkasan harian (summary.queue_inserted), dalam transaksi milik pemanggil. Idempotent
+  per respondent_code (ON CONFLICT DO NOTHING), jadi aman dicoba ulang.
+- SubmissionSpool: antrian tahan-restart di file SQLite lokal. Submission ditulis ke
+  spool dulu (cepat, lokal), baru kemudian ke Postgres.
+- SubmissionWriter: thread latar belakang yang menguras spool ke Postgres. Submission
+  yang datang berdekatan dikumpulkan beberapa milidetik lalu ditulis sebagai satu
+  batch (satu transaksi); bila batch gagal, setiap submission dicoba sendiri-sendiri
+  supaya satu baris bermasalah tidak menggagalkan yang lain. Retry + backoff eksponensial. Submission yang gagal terus setelah SUBMIT_MAX_ATTEMPTS
+  ditandai gagal (tetap di spool) dan dicoba lagi saat proses restart / dipicu admin.
+
+Dengan ini waktu klik "Kirim" tidak bergantung pada latensi / ketersediaan database.
+"""
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from sqlalchemy import bindparam, exc, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+import summary
+from typed_scores import scores_array
+
+logger = logging.getLogger(__name__)
+
+# semua baris dikirim sebagai satu parameter JSONB (array record), jadi teks SQL
+# sama untuk ukuran batch berapa pun
+_INSERT_RESPONSES = text(
+    """
+    INSERT INTO responses (respondent_code, meta, performance, importance, perf_scores, imp_scores)
+    SELECT r.respondent_code, r.meta, r.performance, r.importance, r.perf_scores, r.imp_scores
+    FROM jsonb_to_recordset(:rows) AS r(
+        respondent_code text, meta jsonb, performance jsonb, importance jsonb,
+        perf_scores smallint[], imp_scores smallint[]
+    )
+    ON CONFLICT (respondent_code) DO NOTHING
+    RETURNING id, respondent_code
+    """
+).bindparams(bindparam("rows", type_=JSONB))
+
+# error yang tidak akan hilang dengan mencoba ulang (data ditolak database)
+PERMANENT_ERRORS = (exc.IntegrityError, exc.DataError)
+# error koneksi / server sementara: aman dicoba ulang karena insert idempotent
+TRANSIENT_ERRORS = (exc.OperationalError, exc.InterfaceError)
+
+
+def _response_row(submission: dict) -> dict:
+    perf = submission.get("perf") or {}
+    imp = submission.get("imp") or {}
+    return {
+        "respondent_code": submission.get("respondent_code"),
+        "meta": submission.get("meta") or {},
+        "performance": perf,
+        "importance": imp,
+        "perf_scores": scores_array(perf),
+        "imp_scores": scores_array(imp),
+    }
+
+
+def insert_submissions(conn, submissions: list) -> list:
+    """
+    submissions: [{"respondent_code", "meta", "perf", "imp"}, ...].
+    Tulis ke responses + antrian ringkasan harian (transaksi `conn`); pemanggil
+    menjalankan summary.apply_pending setelah commit.
+    Return respondent_code yang baru ditulis; kode yang sudah ada di tabel dilewati
+    (tidak dihitung dua kali di ringkasan).
+    """
+    if not submissions:
+        return []
+    rows = [_response_row(s) for s in submissions]
+    written = conn.execute(_INSERT_RESPONSES, {"rows": rows}).fetchall()
+    summary.queue_inserted(conn, [r.id for r in written])
+    return [r.respondent_code for r in written]
+
+
+def with_retries(fn, attempts: int = 3, base_sec: float = 0.2, max_sec: float = 2.0):
+    """Panggil fn(); ulangi dengan backoff bila gagal karena TRANSIENT_ERRORS."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except TRANSIENT_ERRORS:
+            if attempt >= attempts:
+                raise
+            logger.warning("Tulis ke DB gagal (percobaan %d/%d), dicoba lagi", attempt, attempts, exc_info=True)
+            time.sleep(min(max_sec, base_sec * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0))
+
+
+class SubmissionSpool:
+    """Antrian submission di SQLite (WAL, synchronous=FULL) yang bertahan saat proses restart."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS submissions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    respondent_code TEXT UNIQUE,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    permanent INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            # spool dari versi lama belum punya kolom permanent (gagal permanen vs. habis percobaan)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+            if "permanent" not in columns:
+                conn.execute("ALTER TABLE submissions ADD COLUMN permanent INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def put(self, submission: dict):
+        # respondent_code yang sama (klik ganda / rerun) hanya diantrikan sekali
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO submissions (respondent_code, payload, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (submission.get("respondent_code"), json.dumps(submission), now, now),
+            )
+
+    def due(self, now: float, limit: int = 100) -> list:
+        """Submission yang siap dicoba: [(id, submission, attempts), ...], urut paling lama."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT id, payload, attempts FROM submissions
+                WHERE failed = 0 AND next_attempt_at <= ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (now, limit),
+            ).fetchall()
+        return [(row_id, json.loads(payload), attempts) for row_id, payload, attempts in rows]
+
+    def next_due_at(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT MIN(next_attempt_at) FROM submissions WHERE failed = 0").fetchone()[0]
+
+    def remove(self, row_ids: list):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM submissions WHERE id = ?", [(i,) for i in row_ids])
+
+    def retry_later(self, row_id: int, attempts: int, next_attempt_at: float, error: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE submissions SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, error, row_id),
+            )
+
+    def mark_failed(self, row_id: int, attempts: int, error: str, permanent: bool = False):
+        # permanent = ditolak database (PERMANENT_ERRORS); selain itu percobaan sementara sudah habis
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE submissions SET failed = 1, permanent = ?, attempts = ?, last_error = ? WHERE id = ?",
+                (int(permanent), attempts, error, row_id),
+            )
+
+    def reset_failed(self, include_permanent: bool = True) -> int:
+        """
+        Jadwalkan ulang submission yang ditandai gagal. Return jumlahnya.
+        include_permanent=False hanya menjadwalkan ulang yang gagal sementara (habis percobaan);
+        yang ditolak database tetap gagal sampai dikirim ulang admin.
+        """
+        sql = "UPDATE submissions SET failed = 0, permanent = 0, attempts = 0, next_attempt_at = ? WHERE failed = 1"
+        if not include_permanent:
+            sql += " AND permanent = 0"
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(sql, (time.time(),)).rowcount
+
+    def counts(self) -> dict:
+        with closing(self._connect()) as conn:
+            pending, failed = conn.execute(
+                "SELECT COUNT(*) FILTER (WHERE failed = 0), COUNT(*) FILTER (WHERE failed = 1) FROM submissions"
+            ).fetchone()
+            last_error = conn.execute(
+                "SELECT last_error FROM submissions WHERE last_error IS NOT NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return {"pending": pending, "failed": failed, "last_error": last_error[0] if last_error else None}
+
+
+class SubmissionWriter:
+    """
+    Thread latar belakang yang menulis isi spool ke database lewat `write_fn(submissions)`
+    (list; satu panggilan = satu transaksi). Setelah dibangunkan, worker menunggu
+    `batch_window_sec` agar submission yang datang bersamaan masuk satu batch
+    (maks. `batch_size`). Gagal sementara -> seluruh batch dicoba lagi dengan backoff eksponensial
+    (+ jitter) sampai `max_attempts`; gagal permanen (PERMANENT_ERRORS) -> batch dipecah per baris
+    dan hanya baris yang ditolak yang langsung ditandai gagal.
+    """
+
+    def __init__(
+        self,
+        spool: SubmissionSpool,
+        write_fn,
+        max_attempts: int = 5,
+        retry_base_sec: float = 1.0,
+        retry_max_sec: float = 60.0,
+        poll_sec: float = 5.0,
+        batch_size: int = 100,
+        batch_window_sec: float = 0.02,
+    ):
+        self.spool = spool
+        self.write_fn = write_fn
+        self.max_attempts = max_attempts
+        self.retry_base_sec = retry_base_sec
+        self.retry_max_sec = retry_max_sec
+        self.poll_sec = poll_sec
+        self.batch_size = batch_size
+        self.batch_window_sec = batch_window_sec
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+
+    def start(self):
+        # sisa antrian dari proses sebelumnya (termasuk yang habis percobaan) dicoba lagi;
+        # yang ditolak database (PERMANENT_ERRORS) akan ditolak lagi -> tunggu retry_failed() admin
+        self.spool.reset_failed(include_permanent=False)
+        self._thread.start()
+        return self
+
+    def submit(self, submission: dict):
+        """Simpan ke spool (durable) lalu bangunkan worker. Tidak menunggu database."""
+        self.spool.put(submission)
+        self._wake.set()
+
+    def retry_failed(self) -> int:
+        """Kirim ulang semua submission yang gagal, termasuk yang ditolak database (aksi admin)."""
+        n = self.spool.reset_failed()
+        self._wake.set()
+        return n
+
+    def stats(self) -> dict:
+        return dict(self.spool.counts(), alive=self._thread.is_alive())
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max_sec, self.retry_base_sec * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _write_one(self, row_id: int, submission: dict, attempts: int):
+        attempts += 1
+        try:
+            self.write_fn([submission])
+        except PERMANENT_ERRORS as e:
+            logger.error("Submission %s ditolak database: %s", submission.get("respondent_code"), e)
+            self.spool.mark_failed(row_id, attempts, repr(e), permanent=True)
+        except Exception as e:
+            if attempts >= self.max_attempts:
+                logger.error("Submission %s gagal %d kali: %s", submission.get("respondent_code"), attempts, e)
+                self.spool.mark_failed(row_id, attempts, repr(e))
+            else:
+                self.spool.retry_later(row_id, attempts, time.time() + self._backoff(attempts), repr(e))
+        else:
+            self.spool.remove([row_id])
+
+    def _reschedule(self, batch: list, error: Exception):
+        """
+        Jadwalkan ulang setiap baris batch (attempts + 1) pada waktu yang sama agar dicoba
+        lagi sebagai satu batch; yang sudah `max_attempts` kali gagal ditandai gagal.
+        """
+        retry_at = None
+        for row_id, submission, attempts in batch:
+            attempts += 1
+            if attempts >= self.max_attempts:
+                logger.error("Submission %s gagal %d kali: %s", submission.get("respondent_code"), attempts, error)
+                self.spool.mark_failed(row_id, attempts, repr(error))
+                continue
+            if retry_at is None:
+                retry_at = time.time() + self._backoff(attempts)
+            self.spool.retry_later(row_id, attempts, retry_at, repr(error))
+
+    def drain(self) -> float:
+        """Tulis semua submission yang jatuh tempo. Return detik tunggu sampai pengecekan berikutnya."""
+        while True:
+            batch = self.spool.due(time.time(), limit=self.batch_size)
+            if not batch:
+                break
+            if len(batch) > 1:
+                try:
+                    self.write_fn([submission for _, submission, _ in batch])
+                except PERMANENT_ERRORS:
+                    # isolasi per baris: batch di-rollback, tiap submission dicoba sendiri
+                    # agar hanya baris yang ditolak database yang ditandai gagal
+                    logger.warning("Batch %d submission ditolak, dicoba per baris", len(batch), exc_info=True)
+                except Exception as e:
+                    # gagal sementara (koneksi putus, failover, timeout): seluruh batch dijadwalkan
+                    # ulang dengan backoff, bukan dihantam lagi per baris ke database yang sama
+                    logger.warning("Batch %d submission gagal, dijadwalkan ulang", len(batch), exc_info=True)
+                    self._reschedule(batch, e)
+                    break
+                else:
+                    self.spool.remove([row_id for row_id, _, _ in batch])
+                    continue
+            for row_id, submission, attempts in batch:
+                self._write_one(row_id, submission, attempts)
+
+        next_due = self.spool.next_due_at()
+        if next_due is None:
+            return self.poll_sec
+        return min(self.poll_sec, max(0.0, next_due - time.time()))
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                delay = self.drain()
+            except Exception:
+                logger.exception("Worker submission error")
+                delay = self.poll_sec
+            if self._wake.wait(timeout=delay) and self.batch_window_sec > 0:
+                # dibangunkan submit(): beri waktu submission lain ikut batch yang sama
+                time.sleep(self.batch_window_sec)
@@ -0,0 +1,268 @@
+"""
+Tabel ringkasan responses_daily_summary.
+
+Menyimpan statistik cukup (n, sum, sumsq, min, max) per (platform, hari lokal,
+item atau dimensi, Performance/Importance), supaya statistik IPA untuk periode &
+platform apa pun bisa dihitung dari O(hari x item) baris, bukan dari seluruh respons.
+
+- level "item": nilai jawaban item (numerik) per responden.
+- level "dimension": skor dimensi per responden (rata-rata item numerik pada
+  dimensi itu), jadi statistik dimensi juga bisa dijawab dari tabel ini.
+
+Tabel dijaga oleh write hook di aplikasi. Transaksi submit hanya mencatat id respons
+baru di responses_summary_pending (satu baris per respons, tanpa rebutan lock);
+apply_pending() melipatnya ke ringkasan dalam transaksi pendek terpisah, segera setelah
+submit dan sebelum ringkasan dibaca. Hapus data langsung memperbarui ringkasan.
+Untuk perubahan dari luar aplikasi, tersedia perintah:
+
+    python summary.py rebuild     # bangun ulang dari tabel responses
+    python summary.py check       # cek konsistensi terhadap tabel responses
+
+Write hook ikut dimuat di jalur submit responden, jadi pandas (dan ipa_sql) hanya
+diimpor di dalam fungsi statistik / check yang dipakai dashboard admin dan CLI.
+"""
+import argparse
+import os
+import sys
+
+from sqlalchemy import text
+
+from answers_sql import answers_cte, dim_map_cte
+from survey_items import ITEM_CODES, LOCAL_TZ
+
+SUMMARY_TABLE = "responses_daily_summary"
+PENDING_TABLE = "responses_summary_pending"
+SUMMARY_KEY = ("level", "platform", "day", "key", "kind")
+SUMMARY_VALUES = ("n", "sum", "sumsq", "min", "max")
+
+
+def _summary_select(where: str) -> str:
+    """SELECT baris ringkasan (kolom = SUMMARY_KEY + SUMMARY_VALUES) dari responses yang lolos `where`."""
+    return f"""
+        WITH {answers_cte(where)},
+        {dim_map_cte()},
+        scored AS (
+            SELECT a.platform,
+                   (a.submitted_at AT TIME ZONE '{LOCAL_TZ}')::date AS day,
+                   'item' AS level, a.item AS key, a.kind, a.num AS value
+            FROM answers a
+            WHERE a.num IS NOT NULL
+              AND a.item IN (SELECT item FROM dim_map)
+            UNION ALL
+            SELECT a.platform,
+                   (a.submitted_at AT TIME ZONE '{LOCAL_TZ}')::date AS day,
+                   'dimension' AS level, m.dim AS key, a.kind, AVG(a.num) AS value
+            FROM answers a
+            JOIN dim_map m ON m.item = a.item
+            GROUP BY a.id, a.platform, a.submitted_at, m.dim, a.kind
+            HAVING COUNT(a.num) > 0
+        )
+        SELECT level, platform, day, key, kind,
+               COUNT(*) AS n, SUM(value) AS sum, SUM(value * value) AS sumsq,
+               MIN(value) AS min, MAX(value) AS max
+        FROM scored
+        GROUP BY level, platform, day, key, kind
+    """
+
+
+_COLS = ", ".join(SUMMARY_KEY + SUMMARY_VALUES)
+
+
+# =========================
+# Write hooks
+# =========================
+def queue_inserted(conn, response_ids):
+    """Catat respons yang baru di-insert (id) untuk dilipat ke ringkasan oleh apply_pending()."""
+    ids = [int(i) for i in response_ids or []]
+    if ids:
+        conn.execute(
+            text(f"INSERT INTO {PENDING_TABLE} (id) SELECT unnest(CAST(:ids AS bigint[])) ON CONFLICT DO NOTHING"),
+            {"ids": ids},
+        )
+
+
+def apply_pending(conn, batch_size: int = 5000) -> int:
+    """
+    Lipat respons yang tercatat di PENDING_TABLE ke ringkasan. Aman dipanggil bersamaan
+    dari beberapa proses (SKIP LOCKED: setiap id diambil satu transaksi saja).
+    Return jumlah respons yang dilipat.
+    """
+    # urutan lock sama dengan rebuild() / apply_all_deleted(): tabel ringkasan dulu, baru
+    # baris pending. ROW EXCLUSIVE = mode yang toh diambil upsert di bawah; menunggu rebuild
+    # yang sedang berjalan, tanpa menahan submit (INSERT ke pending) maupun apply_pending lain
+    conn.execute(text(f"LOCK TABLE {SUMMARY_TABLE} IN ROW EXCLUSIVE MODE"))
+    total = 0
+    while True:
+        ids = conn.execute(
+            text(
+                f"""
+                DELETE FROM {PENDING_TABLE}
+                WHERE id IN (
+                    SELECT id FROM {PENDING_TABLE} ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id
+                """
+            ),
+            {"limit": batch_size},
+        ).scalars().all()
+        apply_inserted(conn, ids)
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+
+def apply_inserted(conn, response_ids):
+    """Tambahkan respons (id) ke ringkasan."""
+    ids = [int(i) for i in response_ids or []]
+    if not ids:
+        return
+    # urutan key tetap: transaksi yang meng-update baris ringkasan yang sama mengunci
+    # dalam urutan yang sama, jadi saling menunggu (bukan deadlock)
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {SUMMARY_TABLE} AS s ({_COLS})
+            SELECT * FROM ({_summary_select("WHERE id = ANY(:ids)")}) rows
+            ORDER BY level, platform, day, key, kind
+            ON CONFLICT (level, platform, day, key, kind) DO UPDATE SET
+                n = s.n + EXCLUDED.n,
+                sum = s.sum + EXCLUDED.sum,
+                sumsq = s.sumsq + EXCLUDED.sumsq,
+                min = LEAST(s.min, EXCLUDED.min),
+                max = GREATEST(s.max, EXCLUDED.max)
+            """
+        ),
+        {"ids": ids},
+    )
+
+
+def apply_platform_deleted(conn, platform: str):
+    conn.execute(text(f"DELETE FROM {SUMMARY_TABLE} WHERE platform = :platform"), {"platform": platform})
+
+
+def apply_all_deleted(conn):
+    conn.execute(text(f"TRUNCATE TABLE {SUMMARY_TABLE}"))
+    conn.execute(text(f"TRUNCATE TABLE {PENDING_TABLE}"))
+
+
+# =========================
+# Rebuild + consistency check
+# =========================
+def rebuild(conn) -> int:
+    """Bangun ulang seluruh ringkasan dari tabel responses. Return jumlah baris ringkasan."""
+    # lock tabel ringkasan sebelum menyentuh PENDING_TABLE (urutan yang sama dengan apply_pending)
+    conn.execute(text(f"LOCK TABLE {SUMMARY_TABLE} IN EXCLUSIVE MODE"))
+    conn.execute(text(f"DELETE FROM {SUMMARY_TABLE}"))
+    insert = f"INSERT INTO {SUMMARY_TABLE} ({_COLS}) SELECT * FROM ({_summary_select('')}) rows"
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": PENDING_TABLE}).scalar():
+        # satu statement = satu snapshot: id pending yang dibuang persis respons yang ikut dihitung ulang
+        insert = f"WITH cleared AS (DELETE FROM {PENDING_TABLE}) {insert}"
+    conn.execute(text(insert))
+    return conn.execute(text(f"SELECT COUNT(*) FROM {SUMMARY_TABLE}")).scalar_one()
+
+
+def check(conn, tolerance: float = 1e-6):
+    """
+    Bandingkan ringkasan dengan hasil hitung ulang dari tabel responses.
+    Return DataFrame baris yang berbeda (kosong = konsisten); kolom expected_* / actual_*.
+    """
+    import pandas as pd
+
+    key_join = " AND ".join(f"e.{k} = a.{k}" for k in SUMMARY_KEY)
+    key_cols = ", ".join(f"COALESCE(e.{k}, a.{k}) AS {k}" for k in SUMMARY_KEY)
+    value_cols = ", ".join(f"e.{v} AS expected_{v}, a.{v} AS actual_{v}" for v in SUMMARY_VALUES)
+    differs = " OR ".join(
+        ["e.n IS DISTINCT FROM a.n"]
+        + [f"abs(e.{v} - a.{v}) > :tol * greatest(1, abs(e.{v}))" for v in SUMMARY_VALUES if v != "n"]
+    )
+    rows = conn.execute(
+        text(
+            f"""
+            WITH expected AS ({_summary_select('')})
+            SELECT {key_cols}, {value_cols}
+            FROM expected e
+            FULL OUTER JOIN {SUMMARY_TABLE} a ON {key_join}
+            WHERE e.level IS NULL OR a.level IS NULL OR {differs}
+            ORDER BY 1, 2, 3, 4, 5
+            """
+        ),
+        {"tol": tolerance},
+    ).fetchall()
+    cols = list(SUMMARY_KEY) + [f"{p}_{v}" for v in SUMMARY_VALUES for p in ("expected", "actual")]
+    return pd.DataFrame(rows, columns=cols)
+
+
+# =========================
+# Statistik IPA dari ringkasan
+# =========================
+def _summary_filters(level: str, platform=None, date_range=None):
+    conds = ["level = :level"]
+    params = {"level": level}
+    if platform:
+        conds.append("platform = :platform")
+        params["platform"] = platform
+    if date_range:
+        conds.append("day BETWEEN :start_day AND :end_day")
+        params["start_day"], params["end_day"] = date_range
+    return "WHERE " + " AND ".join(conds), params
+
+
+def _stats_rows(conn, level: str, platform, date_range):
+    where, params = _summary_filters(level, platform, date_range)
+    return conn.execute(
+        text(
+            f"""
+            SELECT kind, key, MIN(min), MAX(max), SUM(sum) / NULLIF(SUM(n), 0), SUM(n)
+            FROM {SUMMARY_TABLE}
+            {where}
+            GROUP BY kind, key
+            """
+        ),
+        params,
+    ).fetchall()
+
+
+def item_stats_summary(conn, platform=None, date_range=None):
+    """Sama bentuknya dengan ipa_sql.item_stats_sql, tetapi dibaca dari ringkasan harian."""
+    from ipa_sql import wide_stats
+
+    return wide_stats(_stats_rows(conn, "item", platform, date_range), "Item", ITEM_CODES)
+
+
+def dimension_stats_summary(conn, platform=None, date_range=None):
+    """Sama bentuknya dengan ipa_sql.dimension_stats_sql, tetapi dibaca dari ringkasan harian."""
+    from ipa_sql import dimension_wide_stats
+
+    return dimension_wide_stats(_stats_rows(conn, "dimension", platform, date_range))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola tabel responses_daily_summary.")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--db-url", default=os.getenv("SUPABASE_DB_URL", ""))
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        parser.error("Set SUPABASE_DB_URL atau gunakan --db-url.")
+
+    from db import create_db_engine
+    from schema import ensure_schema
+
+    engine = create_db_engine(args.db_url, pool_size=1, max_overflow=0)
+    ensure_schema(engine)
+    with engine.begin() as conn:
+        apply_pending(conn)
+    with engine.begin() as conn:
+        if args.command == "rebuild":
+            print(f"Ringkasan dibangun ulang: {rebuild(conn)} baris.")
+            return 0
+        diff = check(conn)
+    if diff.empty:
+        print("Ringkasan konsisten dengan tabel responses.")
+        return 0
+    print(f"Ringkasan TIDAK konsisten: {len(diff)} baris berbeda.")
+    print(diff.head(50).to_string(index=False))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Definisi item kuesioner TATTFQ (kode, dimensi, pernyataan) + mapping dimensi.
+Dipakai bersama oleh app.py dan modul analisis.
+"""
+
+# =========================
+# ITEMS (kode + pernyataan)
+# =========================
+ITEMS = [
+    # Data & Services Integration
+    ("Data & Services Integration", "DSI1",
+     "Aplikasi telemedicine memungkinkan informasi terkait telekonsultasi klinis (hasil anamnesis, diagnosis, pemeriksaan fisik, penelaahan hasil pemeriksaan penunjang, anjuran, edukasi, pengobatan, dan/atau rujukan yang diberikan) dapat tercatat secara tepat dalam rekam medis pasien sesuai dengan ketentuan peraturan perundang-undangan"),
+    ("Data & Services Integration", "DSI2",
+     "Aplikasi telemedicine dapat terhubung dengan sistem informasi atau platform lain, untuk mengirim dan/atau menerima rekam medis pasien"),
+    ("Data & Services Integration", "DSI3",
+     "Aplikasi telemedicine terhubung dengan fasilitas pelayanan kefarmasian dan/atau fasilitas pelayanan kesehatan sehingga dapat memfasilitasi layanan yang terintegrasi"),
+    ("Data & Services Integration", "DSI4",
+     "Aplikasi telemedicine dapat terhubung dengan alat medis untuk mengirimkan data tanda vital pasien secara real-time"),
+    ("Data & Services Integration", "DSI5",
+     "Aplikasi telemedicine menyediakan data penting yang saya perlukan dalam memberikan layanan kesehatan jarak jauh"),
+
+    # Clinical Decision Support
+    ("Clinical Decision Support", "CDS1",
+     "Aplikasi telemedicine dapat secara otomatis memberikan rekomendasi diagnosis, anjuran, edukasi, dan/atau penatalaksanaan pasien (termasuk pengobatan) kepada dokter berdasarkan data dan hasil pemeriksaan pasien"),
+    ("Clinical Decision Support", "CDS2",
+     "Aplikasi telemedicine dapat secara otomatis mencegah penulisan resep untuk obat-obat yang dikecualikan dalam peraturan pemerintah; memiliki potensi interaksi dengan obat lainnya; dan/atau tidak sesuai dengan kondisi khusus pasien, seperti alergi, hamil, menyusui, atau kondisi lainnya, sehingga hanya obat yang aman dan sesuai yang dapat diresepkan"),
+
+    # Clinical Communication
+    ("Clinical Communication", "CCM1",
+     "Aplikasi telemedicine dapat memfasilitasi pertukaran informasi antar dokter, seperti informasi mengenai kondisi kesehatan dan/atau hasil pemeriksaan pasien yang dirujuk"),
+    ("Clinical Communication", "CCM2",
+     "Aplikasi telemedicine dapat memfasilitasi komunikasi antar dokter, misalnya untuk mendiskusikan kondisi, diagnosis, dan/atau rencana pengobatan pasien"),
+    ("Clinical Communication", "CCM3",
+     "Aplikasi telemedicine memungkinkan saya untuk bertukar informasi dengan pasien, seperti bertukar informasi mengenai kondisi kesehatan dan/atau hasil pemeriksaan pasien"),
+    ("Clinical Communication", "CCM4",
+     "Aplikasi telemedicine memungkinkan saya untuk berkomunikasi secara langsung dengan pasien melalui pesan teks, panggilan audio, dan/atau panggilan video"),
+    ("Clinical Communication", "CCM5",
+     "Aplikasi telemedicine memungkinkan pasien untuk memberikan penilaian terhadap layanan dan/atau persetujuan/penolakan terhadap rekomendasi medis yang saya berikan"),
+
+    # Clinical Task Support
+    ("Clinical Task Support", "CTS1",
+     "Aplikasi telemedicine memungkinkan saya, sebagai dokter yang berwenang, untuk mengakses, meninjau, dan/atau memperbarui data rekam medis pasien"),
+    ("Clinical Task Support", "CTS2",
+     "Aplikasi telemedicine memungkinkan saya untuk melakukan anamnesis"),
+    ("Clinical Task Support", "CTS3",
+     "Aplikasi telemedicine memungkinkan saya untuk melakukan pemeriksaan secara memadai melalui media audio dan/atau visual"),
+    ("Clinical Task Support", "CTS4",
+     "Aplikasi telemedicine memungkinkan saya untuk melakukan penelaahan hasil pemeriksaan penunjang"),
+    ("Clinical Task Support", "CTS5",
+     "Aplikasi telemedicine memungkinkan saya untuk memberikan anjuran dan/atau edukasi kepada pasien"),
+    ("Clinical Task Support", "CTS6",
+     "Aplikasi telemedicine memungkinkan saya untuk melakukan penegakan diagnosis kerja"),
+    ("Clinical Task Support", "CTS7",
+     "Aplikasi telemedicine memungkinkan saya untuk melakukan penatalaksanaan pasien, termasuk pemberian pengobatan"),
+    ("Clinical Task Support", "CTS8",
+     "Aplikasi telemedicine memungkinkan saya memberikan rujukan kepada pasien untuk melakukan pemeriksaan kesehatan lanjutan ke fasilitas pelayanan kesehatan"),
+    ("Clinical Task Support", "CTS9",
+     "Aplikasi telemedicine memungkinkan saya untuk memantau perkembangan kondisi pasien setelah pengobatan diberikan"),
+
+    # Scheduling & Notification
+    ("Scheduling & Notification", "SCN1",
+     "Aplikasi telemedicine memungkinkan saya untuk mengatur jadwal konsultasi dan/atau follow-up dengan pasien"),
+    ("Scheduling & Notification", "SCN2",
+     "Aplikasi telemedicine menyediakan notifikasi yang saya butuhkan dalam memberikan layanan kesehatan jarak jauh kepada pasien"),
+
+    # System Reliability
+    ("System Reliability", "SRB1",
+     "Aplikasi telemedicine yang saya gunakan dapat diandalkan untuk selalu aktif dan/atau tersedia saat saya membutuhkannya"),
+    ("System Reliability", "SRB2",
+     "Aplikasi telemedicine yang saya gunakan tidak sering mengalami masalah dan/atau kerusakan sistem yang tidak terduga yang dapat mengganggu saya dalam memberikan layanan kesehatan jarak jauh kepada pasien"),
+    ("System Reliability", "SRB3",
+     "Jika aplikasi telemedicine sedang mengalami kerusakan dan/atau perawatan sistem, terdapat jaminan bahwa aplikasi dapat digunakan kembali dalam waktu tertentu (misalnya 24 jam)"),
+
+    # Ease of Use & Support
+    ("Ease of Use & Support", "EUS1",
+     "Aplikasi telemedicine mudah untuk dipelajari dan/atau digunakan"),
+    ("Ease of Use & Support", "EUS2",
+     "Aplikasi telemedicine menyediakan bantuan bagi pengguna yang mengalami kesulitan dalam dalam menggunakan aplikasi"),
+
+    # Privacy & Security
+    ("Privacy & Security", "PSC1",
+     "Aplikasi telemedicine menyediakan mekanisme verifikasi dan/atau validasi keabsahan pengguna untuk memastikan bahwa hanya individu yang berwenang yang dapat mengakses data"),
+    ("Privacy & Security", "PSC2",
+     "Aplikasi telemedicine memiliki fitur keamanan yang baik untuk melindungi data dari akses yang tidak sah dan/atau kebocoran data"),
+
+    # Data Quality & Accessibility
+    ("Data Quality & Accessibility", "DQA1",
+     "Aplikasi telemedicine menyediakan data yang berkualitas (akurat, mutakhir, dan/atau memiliki tingkat detail yang sesuai) untuk tugas saya memberikan layanan kesehatan jarak jauh kepada pasien"),
+    ("Data Quality & Accessibility", "DQA2",
+     "Aplikasi telemedicine menyediakan error handling untuk menjaga keakuratan input data"),
+    ("Data Quality & Accessibility", "DQA3",
+     "Aplikasi telemedicine memungkinkan saya untuk mengakses data yang saya butuhkan dengan mudah"),
+    ("Data Quality & Accessibility", "DQA4",
+     "Aplikasi telemedicine memungkinkan saya untuk menemukan data tertentu dengan mudah"),
+    ("Data Quality & Accessibility", "DQA5",
+     "Aplikasi telemedicine menyajikan data dengan makna yang jelas dan/atau mudah untuk diketahui"),
+    ("Data Quality & Accessibility", "DQA6",
+     "Aplikasi telemedicine menampilkan data yang saya perlukan dalam bentuk yang mudah dibaca dan/atau dimengerti"),
+]
+
+# Urutan ITEM_CODES juga urutan elemen kolom responses.perf_scores / imp_scores
+# (lihat typed_scores.py): item baru ditambahkan di akhir ITEMS, jangan diurutkan ulang.
+ITEM_CODES = [code for _, code, _ in ITEMS]
+ITEM_TEXT = {code: text_ for _, code, text_ in ITEMS}
+
+
+def group_by_dim(items):
+    grouped = {}
+    for dim, code, text_ in items:
+        grouped.setdefault(dim, []).append((code, text_))
+    return grouped
+
+
+DIMS = group_by_dim(ITEMS)
+
+# =========================
+# DIMENSION MAPPING (9 dimensi)
+# =========================
+DIM_ABBR = {
+    "Data & Services Integration": "DSI",
+    "Clinical Decision Support": "CDS",
+    "Clinical Communication": "CCM",
+    "Clinical Task Support": "CTS",
+    "Scheduling & Notification": "SCN",
+    "System Reliability": "SRB",
+    "Ease of Use & Support": "EUS",
+    "Privacy & Security": "PSC",
+    "Data Quality & Accessibility": "DQA",
+}
+DIM_CODES = {DIM_ABBR[dim]: [code for code, _ in items] for dim, items in DIMS.items()}
+DIM_NAME_BY_ABBR = {abbr: full for full, abbr in DIM_ABBR.items()}
+
+# =========================
+# ZONA WAKTU SURVEI
+# =========================
+# "hari" / periode di ringkasan harian, filter periode, dan tampilan waktu dashboard
+LOCAL_TZ = "Asia/Jakarta"
@@ -0,0 +1,34 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+# modul app ada di root repo (bukan package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def pg_engine():
+    """
+    Engine ke schema Postgres sementara (dihapus setelah test). Butuh TEST_DATABASE_URL;
+    tanpa itu test yang memakainya di-skip.
+    """
+    url = os.getenv("TEST_DATABASE_URL", "")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL tidak di-set")
+
+    from sqlalchemy import create_engine, text
+
+    schema_name = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema_name}"))
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema_name}"})
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema_name} CASCADE"))
+        admin.dispose()
@@ -0,0 +1,55 @@
+"""Statistik pool dari create_db_engine: checkout, koneksi overflow, timeout, dispose."""
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from db import create_db_engine, pool_stats
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.sqlite3'}", pool_size=1, max_overflow=1, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_overflow_counted_per_new_connection_not_per_checkout(engine):
+    held = engine.connect()
+    for _ in range(3):
+        with engine.connect():
+            pass
+    stats = pool_stats(engine)
+    held.close()
+
+    # satu koneksi overflow dibuka lalu dipakai ulang: tiga checkout, satu koneksi overflow
+    assert stats["checkouts"] == 4
+    assert stats["overflow_connects"] == 1
+    assert stats["peak_overflow"] == 1
+
+    # antrian pool hanya menampung pool_size koneksi: kelebihannya ditutup saat dikembalikan
+    with engine.connect():
+        pass
+    assert pool_stats(engine)["overflow_connects"] == 1
+    with engine.connect(), engine.connect():
+        pass
+    stats = pool_stats(engine)
+    assert stats["checkouts"] == 7
+    assert stats["overflow_connects"] == 2
+
+
+def test_timeout_counted(engine):
+    with engine.connect(), engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    stats = pool_stats(engine)
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["max_wait_ms"] >= 40
+
+
+def test_counters_survive_dispose(engine):
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert pool_stats(engine)["checkouts"] == 2
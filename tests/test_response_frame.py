@@ -0,0 +1,38 @@
+from collections import namedtuple
+
+import numpy as np
+
+from response_frame import flatten_responses
+from survey_items import ITEM_CODES
+
+Row = namedtuple("Row", "id created_at respondent_code meta performance importance perf_scores imp_scores")
+
+
+def _row(i, perf_scores, imp_scores):
+    return Row(i, "2026-03-01T08:00:00+00:00", f"T-{i}", {}, {}, {}, perf_scores, imp_scores)
+
+
+def test_score_arrays_shorter_or_longer_than_item_codes():
+    n = len(ITEM_CODES)
+    rows = [
+        _row(1, [5] * n, [4] * n),
+        _row(2, [3] * (n - 2), [2] * (n - 2)),  # ditulis sebelum 2 item terakhir ada
+        _row(3, [6] * n + [1, 1], [1] * n + [6]),  # elemen lebih dari ITEM_CODES dipotong
+        _row(4, [None] * n, [2, None] + [2] * (n - 2)),
+    ]
+    df = flatten_responses(rows)
+
+    first, last = ITEM_CODES[0], ITEM_CODES[-1]
+    assert df[f"{first}_Performance"].tolist()[:3] == [5, 3, 6]
+    assert np.isnan(df.loc[1, f"{last}_Performance"])
+    assert df.loc[2, f"{last}_Performance"] == 6 and df.loc[2, f"{last}_Importance"] == 1
+    assert np.isnan(df.loc[3, f"{first}_Performance"]) and np.isnan(df.loc[3, f"{ITEM_CODES[1]}_Importance"])
+
+
+def test_score_arrays_fall_back_to_json_answers():
+    rows = [
+        Row(1, "2026-03-01T08:00:00+00:00", "T-1", {}, {ITEM_CODES[0]: 4, ITEM_CODES[1]: 9}, {}, None, None),
+    ]
+    df = flatten_responses(rows)
+    assert df.loc[0, f"{ITEM_CODES[0]}_Performance"] == 4
+    assert np.isnan(df.loc[0, f"{ITEM_CODES[1]}_Performance"])
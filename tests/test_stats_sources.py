@@ -0,0 +1,75 @@
+"""IPA_STATS_SOURCE python / sql / summary harus memberi statistik yang sama untuk data yang sama."""
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+import summary
+from dashboard import responses_frame
+from ipa_sql import dimension_stats_sql, item_stats_sql
+from ipa_stats import dimension_stats, item_stats, score_array
+from schema import ensure_schema
+from submissions import insert_submissions
+from survey_items import ITEM_CODES
+
+# valid: bilangan bulat 1-6 (angka JSON atau string satu digit); sisanya harus jadi kosong
+VALID = [1, 2, 3, 4, 5, 6, "5", " 2 ", 4.0]
+INVALID = [0, 7, 3.5, 1e1, -2, 100000, True, "4.0", "abc", "", None, [3]]
+
+
+def _answers(seed: int) -> dict:
+    rnd = np.random.default_rng(seed)
+    pool = VALID + INVALID
+    return {code: pool[rnd.integers(len(pool))] for code in ITEM_CODES}
+
+
+def _submissions(n: int) -> list:
+    return [
+        {
+            "respondent_code": f"T-{i}",
+            "meta": {"platform": "Halodoc" if i % 2 else "Alodokter", "submitted_at_utc": f"2026-03-{i % 27 + 1:02d}T08:00:00+00:00"},
+            "perf": _answers(2 * i),
+            "imp": _answers(2 * i + 1),
+        }
+        for i in range(n)
+    ]
+
+
+def _python_stats(conn):
+    rows = conn.execute(
+        text(
+            "SELECT id, created_at, respondent_code, meta, performance, importance, perf_scores, imp_scores "
+            "FROM responses ORDER BY id"
+        )
+    ).fetchall()
+    values = score_array(responses_frame([rows]))
+    return item_stats(values), dimension_stats(values)
+
+
+def _assert_same(left: pd.DataFrame, right: pd.DataFrame, key: str):
+    left = left.set_index(key).sort_index()
+    right = right.set_index(key).sort_index()[left.columns]
+    pd.testing.assert_frame_equal(left, right, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+def test_sources_agree_on_mixed_validity_answers(pg_engine):
+    ensure_schema(pg_engine)
+    with pg_engine.begin() as conn:
+        insert_submissions(conn, _submissions(40))
+        # baris lama tanpa perf_scores/imp_scores: jalur python memakai JSONB
+        conn.execute(text("UPDATE responses SET perf_scores = NULL, imp_scores = NULL WHERE id % 3 = 0"))
+    with pg_engine.begin() as conn:
+        summary.apply_pending(conn)
+
+    with pg_engine.connect() as conn:
+        py_items, py_dims = _python_stats(conn)
+        sql_items, sql_dims = item_stats_sql(conn), dimension_stats_sql(conn)
+        sum_items, sum_dims = summary.item_stats_summary(conn), summary.dimension_stats_summary(conn)
+
+    # data uji memang memuat jawaban tidak valid di setiap item, jadi n < jumlah respons
+    assert (py_items["Performance_n"] < 40).any()
+    assert py_items["Performance_max"].max() <= 6 and py_items["Performance_min"].min() >= 1
+
+    _assert_same(py_items, sql_items, "Item")
+    _assert_same(py_items, sum_items, "Item")
+    _assert_same(py_dims, sql_dims, "Dimension")
+    _assert_same(py_dims, sum_dims, "Dimension")
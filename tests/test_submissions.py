@@ -0,0 +1,176 @@
+"""SubmissionSpool + SubmissionWriter: retry/backoff, gagal permanen vs sementara, restart."""
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError
+
+from submissions import SubmissionSpool, SubmissionWriter
+
+
+def _error(cls):
+    return cls("INSERT INTO responses ...", {}, Exception(cls.__name__))
+
+
+class FakeDB:
+    """write_fn palsu: `fail` = {respondent_code: kelas error}; kode "*" = gagal untuk setiap batch."""
+
+    def __init__(self, fail=None):
+        self.fail = dict(fail or {})
+        self.calls = []
+        self.written = []
+
+    def __call__(self, submissions):
+        codes = [s["respondent_code"] for s in submissions]
+        self.calls.append(codes)
+        if "*" in self.fail:
+            raise _error(self.fail["*"])
+        for code in codes:
+            if code in self.fail:
+                raise _error(self.fail[code])
+        self.written.extend(codes)
+
+
+def _spool(tmp_path, codes=()):
+    spool = SubmissionSpool(str(tmp_path / "spool.sqlite3"))
+    for code in codes:
+        spool.put({"respondent_code": code, "meta": {}, "perf": {}, "imp": {}})
+    return spool
+
+
+def _writer(spool, db, **kwargs):
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("retry_base_sec", 0.01)
+    kwargs.setdefault("retry_max_sec", 0.01)
+    return SubmissionWriter(spool, db, **kwargs)
+
+
+def _rows(spool):
+    with sqlite3.connect(spool.path) as conn:
+        return {
+            code: (failed, permanent, attempts)
+            for code, failed, permanent, attempts in conn.execute(
+                "SELECT respondent_code, failed, permanent, attempts FROM submissions"
+            )
+        }
+
+
+def _drain_until_settled(writer, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        writer.drain()
+        if writer.stats()["pending"] == 0:
+            return
+        time.sleep(0.01)
+    raise AssertionError("spool tidak kosong")
+
+
+def test_batch_written_in_one_call(tmp_path):
+    spool = _spool(tmp_path, ["A", "B", "C"])
+    db = FakeDB()
+    _writer(spool, db).drain()
+    assert db.calls == [["A", "B", "C"]]
+    assert spool.counts()["pending"] == 0 and spool.counts()["failed"] == 0
+
+
+def test_transient_error_reschedules_whole_batch_with_backoff(tmp_path):
+    spool = _spool(tmp_path, ["A", "B", "C"])
+    db = FakeDB({"*": OperationalError})
+    writer = _writer(spool, db, retry_base_sec=60, retry_max_sec=60)
+    writer.drain()
+
+    # tidak dipecah per baris: satu panggilan, semua baris dijadwalkan ulang bersama
+    assert db.calls == [["A", "B", "C"]]
+    assert _rows(spool) == {"A": (0, 0, 1), "B": (0, 0, 1), "C": (0, 0, 1)}
+    assert spool.due(time.time()) == []
+    assert spool.next_due_at() > time.time() + 25  # backoff 60 s x jitter [0.5, 1]
+
+
+def test_transient_error_retried_until_success(tmp_path):
+    spool = _spool(tmp_path, ["A", "B"])
+    db = FakeDB({"*": OperationalError})
+    writer = _writer(spool, db)
+    writer.drain()
+    del db.fail["*"]
+    _drain_until_settled(writer)
+    assert sorted(db.written) == ["A", "B"]
+    assert spool.counts()["failed"] == 0
+
+
+def test_transient_error_marks_failed_after_max_attempts(tmp_path):
+    spool = _spool(tmp_path, ["A", "B"])
+    db = FakeDB({"*": OperationalError})
+    _drain_until_settled(_writer(spool, db, max_attempts=3))
+    assert len(db.calls) == 3
+    assert _rows(spool) == {"A": (1, 0, 3), "B": (1, 0, 3)}
+
+
+@pytest.mark.parametrize("error", [IntegrityError, DataError])
+def test_permanent_error_isolates_bad_row(tmp_path, error):
+    spool = _spool(tmp_path, ["A", "BAD", "C"])
+    db = FakeDB({"BAD": error})
+    _writer(spool, db).drain()
+
+    # batch ditolak -> dicoba per baris; hanya baris yang ditolak yang gagal, tanpa retry
+    assert db.calls == [["A", "BAD", "C"], ["A"], ["BAD"], ["C"]]
+    assert db.written == ["A", "C"]
+    assert _rows(spool) == {"BAD": (1, 1, 1)}
+
+
+@pytest.mark.parametrize("error", [IntegrityError, DataError])
+def test_permanent_error_single_row_not_retried(tmp_path, error):
+    spool = _spool(tmp_path, ["BAD"])
+    db = FakeDB({"BAD": error})
+    writer = _writer(spool, db)
+    writer.drain()
+    writer.drain()
+    assert db.calls == [["BAD"]]
+    assert _rows(spool) == {"BAD": (1, 1, 1)}
+
+
+def test_restart_retries_only_transient_failures(tmp_path):
+    spool = _spool(tmp_path, ["BAD", "SLOW"])
+    db = FakeDB({"BAD": IntegrityError, "SLOW": OperationalError})
+    _drain_until_settled(_writer(spool, db, max_attempts=2))
+    assert _rows(spool) == {"BAD": (1, 1, 1), "SLOW": (1, 0, 2)}
+
+    # proses baru: spool dibuka ulang dari file yang sama, database sudah pulih
+    reopened = SubmissionSpool(spool.path)
+    db = FakeDB({"BAD": IntegrityError})
+    writer = _writer(reopened, db).start()
+    deadline = time.time() + 5
+    while "SLOW" not in db.written and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert db.written == ["SLOW"]
+    assert ["BAD"] not in db.calls  # ditolak database: tidak dicoba ulang otomatis
+    assert _rows(reopened) == {"BAD": (1, 1, 1)}
+
+    # admin mengirim ulang secara eksplisit
+    assert writer.retry_failed() == 1
+    deadline = time.time() + 5
+    while ["BAD"] not in db.calls and time.time() < deadline:
+        time.sleep(0.01)
+    assert ["BAD"] in db.calls
+
+
+def test_spool_without_permanent_column_is_upgraded(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE submissions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, respondent_code TEXT UNIQUE,
+                payload TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL, failed INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT, created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO submissions (respondent_code, payload, next_attempt_at, failed, created_at) "
+            "VALUES ('OLD', '{}', 0, 1, 0)"
+        )
+    spool = SubmissionSpool(path)
+    # baris gagal dari versi lama dianggap gagal sementara: dicoba lagi saat start
+    assert spool.reset_failed(include_permanent=False) == 1
@@ -0,0 +1,225 @@
+"""
+Kolom skor bertipe di tabel responses: perf_scores / imp_scores (smallint[]).
+
+Setiap array berisi jawaban Performance / Importance dengan urutan ITEM_CODES
+(NULL = item tidak dijawab). Loader dashboard membaca array ini langsung sebagai
+matriks angka, tanpa parse JSONB + pd.to_numeric per item. Kolom JSONB
+performance/importance tetap ditulis (dual-write) sebagai sumber asli.
+
+Baris lama (sebelum kolom ini ada) diisi lewat backfill; `check` memastikan
+dual-write (scores_array) dan backfill (_array_from_jsonb) memberi array yang sama:
+
+    python typed_scores.py backfill [--batch-size 1000] [--recompute]
+    python typed_scores.py check
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from sqlalchemy import text
+
+from survey_items import ITEM_CODES
+
+# Satu aturan untuk dual-write (scores_array), backfill (_array_from_jsonb) dan statistik
+# SQL / ringkasan (answers_sql.answers_cte, lewat likert_sql):
+# jawaban valid = bilangan bulat dalam skala Likert, sebagai angka JSON (4 / 4.0) atau
+# string berisi satu digit ("4", " 4 "). Selain itu (boolean, pecahan, di luar skala,
+# teks lain) disimpan sebagai NULL, jadi nilai tidak pernah melampaui smallint.
+LIKERT_MIN, LIKERT_MAX = 1, 6
+# Python (re.ASCII) dan Postgres sama-sama memakai \s = [ \t\n\v\f\r]; skala satu digit
+_LIKERT_TEXT = rf"^\s*[{LIKERT_MIN}-{LIKERT_MAX}]\s*$"
+_LIKERT_TEXT_RE = re.compile(_LIKERT_TEXT, re.ASCII)
+
+
+def likert_value(v):
+    """Nilai jawaban -> int dalam skala Likert, atau None bila kosong/tidak valid."""
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        # NaN / inf gagal di perbandingan pertama, jadi int() hanya dipanggil untuk nilai terbatas
+        return int(v) if LIKERT_MIN <= v <= LIKERT_MAX and v == int(v) else None
+    if isinstance(v, str) and _LIKERT_TEXT_RE.match(v):
+        return int(v)
+    return None
+
+
+def scores_array(answers: dict) -> list:
+    """Dict jawaban {kode: nilai} -> list dengan urutan ITEM_CODES (None bila kosong/tidak valid)."""
+    answers = answers or {}
+    return [likert_value(answers.get(code)) for code in ITEM_CODES]
+
+
+def likert_sql(value: str) -> str:
+    """
+    Ekspresi SQL likert_value() untuk ekspresi jsonb `value` -> smallint (NULL bila tidak
+    valid). Dipakai backfill dan agregasi SQL / ringkasan (answers_sql.answers_cte).
+    """
+    text_ = f"({value} #>> '{{}}')"
+    return (
+        f"CASE jsonb_typeof({value})"
+        f" WHEN 'number' THEN CASE WHEN {text_}::numeric BETWEEN {LIKERT_MIN} AND {LIKERT_MAX}"
+        f" AND {text_}::numeric % 1 = 0 THEN {text_}::numeric::smallint END"
+        f" WHEN 'string' THEN CASE WHEN {text_} ~ '{_LIKERT_TEXT}' THEN {text_}::smallint END"
+        " END"
+    )
+
+
+def _array_from_jsonb(col: str) -> str:
+    """Ekspresi SQL: kolom JSONB jawaban -> smallint[] dengan urutan ITEM_CODES."""
+    # kode item berasal dari survey_items (konstanta), bukan input user
+    elems = ",\n".join(likert_sql(f"{col}->'{code}'") for code in ITEM_CODES)
+    return f"ARRAY[{elems}]::smallint[]"
+
+
+def backfill_batch(conn, batch_size: int = 1000) -> int:
+    """Isi perf_scores/imp_scores untuk maksimal `batch_size` baris yang belum terisi."""
+    result = conn.execute(
+        text(
+            f"""
+            UPDATE responses r
+            SET perf_scores = {_array_from_jsonb("r.performance")},
+                imp_scores = {_array_from_jsonb("r.importance")}
+            WHERE r.id IN (
+                SELECT id FROM responses
+                WHERE perf_scores IS NULL OR imp_scores IS NULL
+                ORDER BY id
+                LIMIT :batch_size
+            )
+            """
+        ),
+        {"batch_size": batch_size},
+    )
+    return result.rowcount
+
+
+def recompute_batch(conn, after_id: int = 0, batch_size: int = 1000) -> tuple:
+    """
+    Hitung ulang perf_scores/imp_scores untuk `batch_size` baris berikutnya (id > after_id)
+    yang array-nya berbeda dari hasil aturan saat ini. Return (baris diperbarui, id terakhir
+    batch; None bila sudah habis).
+    """
+    row = conn.execute(
+        text(
+            f"""
+            WITH batch AS (
+                SELECT id FROM responses WHERE id > :after_id ORDER BY id LIMIT :batch_size
+            ),
+            updated AS (
+                UPDATE responses r
+                SET perf_scores = {_array_from_jsonb("r.performance")},
+                    imp_scores = {_array_from_jsonb("r.importance")}
+                FROM batch b
+                WHERE r.id = b.id
+                  AND (r.perf_scores IS DISTINCT FROM {_array_from_jsonb("r.performance")}
+                       OR r.imp_scores IS DISTINCT FROM {_array_from_jsonb("r.importance")})
+                RETURNING r.id
+            )
+            SELECT (SELECT COUNT(*) FROM updated), (SELECT MAX(id) FROM batch)
+            """
+        ),
+        {"after_id": after_id, "batch_size": batch_size},
+    ).one()
+    return row[0], row[1]
+
+
+# Contoh nilai jawaban (literal JSON) untuk check(): batas skala, pecahan, overflow
+# smallint, boolean, string angka / bukan angka, dan tipe JSON lain.
+CHECK_SAMPLES = [
+    "1", "6", "0", "7", "-1", "4.0", "4.00", "4.5", "4e0", "100000", "1e400", "-0",
+    "true", "false", "null", '"4"', '" 5 "', '"4\\n"', '"4.0"', '"+4"', '"04"', '"-1"',
+    '"7"', '"100000"', '"true"', '""', '"abc"', "[4]", '{"v": 4}',
+]
+
+
+def check(conn) -> dict:
+    """
+    Pastikan dual-write dan backfill menghasilkan array yang sama untuk JSON yang sama.
+
+    - samples: CHECK_SAMPLES yang hasil scores_array(json.loads(...)) berbeda dengan
+      ekspresi SQL backfill: [(literal JSON, Python, SQL), ...]
+    - stored_mismatch: jumlah baris responses yang perf_scores/imp_scores tersimpannya
+      berbeda dari aturan saat ini (mis. ditulis sebelum aturan diseragamkan)
+    """
+    samples = []
+    for start in range(0, len(CHECK_SAMPLES), len(ITEM_CODES)):
+        chunk = CHECK_SAMPLES[start:start + len(ITEM_CODES)]
+        doc = "{" + ", ".join(f'"{code}": {lit}' for code, lit in zip(ITEM_CODES, chunk)) + "}"
+        from_sql = conn.execute(
+            text(f"SELECT {_array_from_jsonb('d.doc')} FROM (SELECT CAST(:doc AS jsonb) AS doc) d"),
+            {"doc": doc},
+        ).scalar_one()
+        from_python = scores_array(json.loads(doc))
+        for lit, py, sql in zip(chunk, from_python, from_sql):
+            if py != sql:
+                samples.append((lit, py, sql))
+
+    stored_mismatch = conn.execute(
+        text(
+            f"""
+            SELECT COUNT(*) FROM responses r
+            WHERE (r.perf_scores IS NOT NULL
+                   AND r.perf_scores IS DISTINCT FROM {_array_from_jsonb("r.performance")})
+               OR (r.imp_scores IS NOT NULL
+                   AND r.imp_scores IS DISTINCT FROM {_array_from_jsonb("r.importance")})
+            """
+        )
+    ).scalar_one()
+    return {"samples": samples, "stored_mismatch": stored_mismatch}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill / cek kolom perf_scores/imp_scores dari JSONB.")
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--recompute", action="store_true",
+        help="backfill: hitung ulang juga baris yang array-nya sudah terisi tetapi berbeda dari aturan saat ini",
+    )
+    parser.add_argument("--db-url", default=os.getenv("SUPABASE_DB_URL", ""))
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        parser.error("Set SUPABASE_DB_URL atau gunakan --db-url.")
+
+    from db import create_db_engine
+    from schema import ensure_schema
+
+    engine = create_db_engine(args.db_url, pool_size=1, max_overflow=0)
+    ensure_schema(engine)
+
+    if args.command == "check":
+        with engine.connect() as conn:
+            result = check(conn)
+        for lit, py, sql in result["samples"]:
+            print(f"BEDA  {lit:<12} dual-write={py!r:<6} backfill={sql!r}")
+        if result["stored_mismatch"]:
+            print(
+                f"{result['stored_mismatch']} baris menyimpan array yang berbeda dari aturan saat ini; "
+                "jalankan `backfill --recompute`."
+            )
+        if result["samples"] or result["stored_mismatch"]:
+            return 1
+        print(f"Dual-write dan backfill konsisten ({len(CHECK_SAMPLES)} contoh nilai, semua baris tersimpan).")
+        return 0
+
+    # satu transaksi per batch, supaya lock baris tidak ditahan terlalu lama
+    total = 0
+    if args.recompute:
+        after_id = 0
+        while after_id is not None:
+            with engine.begin() as conn:
+                n, after_id = recompute_batch(conn, after_id, args.batch_size)
+            total += n
+    while True:
+        with engine.begin() as conn:
+            n = backfill_batch(conn, args.batch_size)
+        total += n
+        if n < args.batch_size:
+            break
+    print(f"Backfill selesai: {total} baris diperbarui.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())